@@ -0,0 +1,231 @@
+"""Calibración de dificultad por Monte Carlo.
+
+Simula muchos vuelos por nivel con los pilotos de referencia de pilotos.py,
+repartidos en bloques entre todos los núcleos, y resume la tasa de aterrizaje,
+el combustible restante y la puntuación frente a FUEL_POR_NIVEL,
+VIENTO_POR_NIVEL y el rango de desplazamiento de la base. Las tablas se pueden
+sustituir desde la línea de comandos para probar una tabla de niveles nueva:
+
+    python calibracion.py --vuelos 5000 --fuel 3=200 --viento 3=0.04
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+from simulacion import (
+    ANCHO, BASE_MARGEN, FUEL_POR_NIVEL, VIENTO_POR_NIVEL,
+    DESPLAZAMIENTO_BASE_POR_NIVEL, simular_vuelo
+)
+from pilotos import PILOTOS
+
+BINS_FUEL = 20  # Histograma de fracción de combustible restante (0-1)
+ANCHO_BIN_PUNTUACION = 100
+BINS_PUNTUACION = 40  # 0-4000 puntos
+TRAMOS_DESPLAZAMIENTO = 5  # |desplazamiento| / desplazamiento máximo
+
+
+def semilla_escenario(semilla, nivel, indice):
+    """Semilla del escenario i de un nivel; la misma para todos los pilotos"""
+    return f"{semilla}:{nivel}:{indice}"
+
+
+class ResumenCalibracion:
+    """Resultados acumulados de un (piloto, nivel); se pueden fusionar"""
+
+    def __init__(self):
+        self.vuelos = 0
+        self.aterrizajes = 0
+        self.pasos = 0
+        self.razones = Counter()
+        self.hist_fuel = [0] * BINS_FUEL
+        self.hist_puntuacion = [0] * BINS_PUNTUACION
+        self.vuelos_por_tramo = [0] * TRAMOS_DESPLAZAMIENTO
+        self.aterrizajes_por_tramo = [0] * TRAMOS_DESPLAZAMIENTO
+
+    def agregar(self, nave, fraccion_desplazamiento):
+        self.vuelos += 1
+        self.pasos += nave.pasos
+        tramo = min(TRAMOS_DESPLAZAMIENTO - 1, int(fraccion_desplazamiento * TRAMOS_DESPLAZAMIENTO))
+        self.vuelos_por_tramo[tramo] += 1
+        if nave.aterrizado:
+            self.aterrizajes += 1
+            self.aterrizajes_por_tramo[tramo] += 1
+            fraccion_fuel = nave.fuel / nave.fuel_inicial
+            self.hist_fuel[min(BINS_FUEL - 1, int(fraccion_fuel * BINS_FUEL))] += 1
+            self.hist_puntuacion[min(BINS_PUNTUACION - 1, nave.puntuacion // ANCHO_BIN_PUNTUACION)] += 1
+        else:
+            # Agrupar los accidentes por velocidad sin los valores concretos
+            self.razones[nave.razon_accidente.split(" V:")[0] or "Sin terminar"] += 1
+
+    def fusionar(self, otro):
+        self.vuelos += otro.vuelos
+        self.aterrizajes += otro.aterrizajes
+        self.pasos += otro.pasos
+        self.razones.update(otro.razones)
+        for propio, ajeno in ((self.hist_fuel, otro.hist_fuel),
+                              (self.hist_puntuacion, otro.hist_puntuacion),
+                              (self.vuelos_por_tramo, otro.vuelos_por_tramo),
+                              (self.aterrizajes_por_tramo, otro.aterrizajes_por_tramo)):
+            for i, valor in enumerate(ajeno):
+                propio[i] += valor
+        return self
+
+    @property
+    def tasa_aterrizaje(self):
+        return self.aterrizajes / self.vuelos if self.vuelos else 0.0
+
+    def a_dict(self):
+        return {
+            'vuelos': self.vuelos,
+            'aterrizajes': self.aterrizajes,
+            'tasa_aterrizaje': self.tasa_aterrizaje,
+            'razones': dict(self.razones),
+            'fuel_p10_p50_p90': [percentil(self.hist_fuel, q, 1 / BINS_FUEL) for q in (0.1, 0.5, 0.9)],
+            'puntuacion_p10_p50_p90': [percentil(self.hist_puntuacion, q, ANCHO_BIN_PUNTUACION)
+                                       for q in (0.1, 0.5, 0.9)],
+            'tasa_por_tramo_desplazamiento': [a / v if v else None for a, v in
+                                              zip(self.aterrizajes_por_tramo, self.vuelos_por_tramo)],
+        }
+
+
+def percentil(histograma, q, ancho_bin):
+    """Percentil aproximado (centro del bin) a partir de un histograma"""
+    total = sum(histograma)
+    if total == 0:
+        return None
+    acumulado = 0
+    for i, cuenta in enumerate(histograma):
+        acumulado += cuenta
+        if acumulado >= q * total:
+            return (i + 0.5) * ancho_bin
+    return (len(histograma) - 0.5) * ancho_bin
+
+
+def _simular_bloque(tarea):
+    """Trabajo de un proceso: un bloque de escenarios de un piloto y nivel"""
+    nombre_piloto, nivel, semilla, inicio, cantidad, tablas = tarea
+    fuel = tablas['fuel'].get(nivel)
+    viento_max = tablas['viento'].get(nivel)
+    fraccion = tablas['desplazamiento'].get(nivel, 0.7)
+    desplazamiento_max = (ANCHO - 2 * BASE_MARGEN) * fraccion
+
+    piloto = PILOTOS[nombre_piloto]()
+    resumen = ResumenCalibracion()
+    for indice in range(inicio, inicio + cantidad):
+        escenario = semilla_escenario(semilla, nivel, indice)
+        piloto.reiniciar(random.Random(escenario + ":piloto"))
+        nave = simular_vuelo(piloto, nivel, random.Random(escenario),
+                             fraccion_base=fraccion, fuel=fuel, viento_max=viento_max)
+        desplazamiento = abs(nave.base_x - ANCHO // 2)
+        resumen.agregar(nave, desplazamiento / desplazamiento_max if desplazamiento_max else 0.0)
+    return nombre_piloto, nivel, resumen
+
+
+def calibrar(pilotos, niveles, vuelos, tablas, semilla=0, procesos=None, bloque=250):
+    """Ejecuta el barrido y devuelve {(piloto, nivel): ResumenCalibracion}"""
+    tareas = [(piloto, nivel, semilla, inicio, min(bloque, vuelos - inicio), tablas)
+              for piloto in pilotos
+              for nivel in niveles
+              for inicio in range(0, vuelos, bloque)]
+    resultados = {(piloto, nivel): ResumenCalibracion() for piloto in pilotos for nivel in niveles}
+
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1:
+        parciales = map(_simular_bloque, tareas)
+        for piloto, nivel, resumen in parciales:
+            resultados[(piloto, nivel)].fusionar(resumen)
+    else:
+        with multiprocessing.Pool(procesos) as pool:
+            for piloto, nivel, resumen in pool.imap_unordered(_simular_bloque, tareas):
+                resultados[(piloto, nivel)].fusionar(resumen)
+    return resultados
+
+
+def _parsear_tabla(texto, tipo):
+    """'1=500,3=200' -> {1: 500, 3: 200}"""
+    tabla = {}
+    if texto:
+        for par in texto.split(","):
+            nivel, valor = par.split("=")
+            tabla[int(nivel)] = tipo(valor)
+    return tabla
+
+
+def _formatear(valor, formato):
+    return "   -" if valor is None else format(valor, formato)
+
+
+def imprimir_informe(resultados, pilotos, niveles, tablas):
+    for nivel in niveles:
+        fraccion = tablas['desplazamiento'].get(nivel, 0.7)
+        print(f"\nNivel {nivel}: fuel {tablas['fuel'].get(nivel)} | "
+              f"viento máx {tablas['viento'].get(nivel)} | "
+              f"base ±{fraccion:.0%} (±{(ANCHO - 2 * BASE_MARGEN) * fraccion:.0f} px)")
+        print(f"  {'piloto':<22}{'vuelos':>7}{'aterriza':>10}"
+              f"{'fuel p10/p50/p90':>20}{'puntos p10/p50/p90':>22}   aterriza por desplazamiento")
+        for piloto in pilotos:
+            resumen = resultados[(piloto, nivel)]
+            datos = resumen.a_dict()
+            fuel = "/".join(_formatear(v, ".2f") for v in datos['fuel_p10_p50_p90'])
+            puntos = "/".join(_formatear(v, ".0f") for v in datos['puntuacion_p10_p50_p90'])
+            tramos = " ".join(_formatear(v, ".0%").rjust(4) for v in datos['tasa_por_tramo_desplazamiento'])
+            print(f"  {piloto:<22}{resumen.vuelos:>7}{resumen.tasa_aterrizaje:>10.1%}"
+                  f"{fuel:>20}{puntos:>22}   {tramos}")
+            for razon, cuenta in resumen.razones.most_common():
+                print(f"  {'':<22}{cuenta:>7}  {razon}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibra la dificultad de los niveles por Monte Carlo")
+    parser.add_argument("--vuelos", type=int, default=2000, help="Vuelos por piloto y nivel")
+    parser.add_argument("--pilotos", default=",".join(PILOTOS),
+                        help=f"Pilotos separados por comas ({', '.join(PILOTOS)})")
+    parser.add_argument("--niveles", default="1,2,3")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--procesos", type=int, default=None, help="Por defecto, todos los núcleos")
+    parser.add_argument("--bloque", type=int, default=250, help="Vuelos por tarea enviada a un proceso")
+    parser.add_argument("--fuel", help="Sustituye FUEL_POR_NIVEL, p. ej. 1=500,3=200")
+    parser.add_argument("--viento", help="Sustituye VIENTO_POR_NIVEL, p. ej. 3=0.04")
+    parser.add_argument("--desplazamiento", help="Sustituye el rango de la base, p. ej. 3=0.6")
+    parser.add_argument("--json", metavar="ARCHIVO", help="Guardar los resultados en JSON")
+    args = parser.parse_args()
+
+    pilotos = args.pilotos.split(",")
+    for piloto in pilotos:
+        if piloto not in PILOTOS:
+            parser.error(f"Piloto desconocido: {piloto}")
+    niveles = [int(n) for n in args.niveles.split(",")]
+    tablas = {
+        'fuel': {**FUEL_POR_NIVEL, **_parsear_tabla(args.fuel, float)},
+        'viento': {**VIENTO_POR_NIVEL, **_parsear_tabla(args.viento, float)},
+        'desplazamiento': {**DESPLAZAMIENTO_BASE_POR_NIVEL, **_parsear_tabla(args.desplazamiento, float)},
+    }
+
+    inicio = time.perf_counter()
+    resultados = calibrar(pilotos, niveles, args.vuelos, tablas, args.semilla, args.procesos, args.bloque)
+    duracion = time.perf_counter() - inicio
+
+    imprimir_informe(resultados, pilotos, niveles, tablas)
+    total = sum(r.vuelos for r in resultados.values())
+    pasos = sum(r.pasos for r in resultados.values())
+    print(f"\n{total} vuelos ({pasos} pasos) en {duracion:.1f} s "
+          f"({total / duracion:.0f} vuelos/s)")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'tablas': tablas,
+                'semilla': args.semilla,
+                'resultados': [{'piloto': p, 'nivel': n, **resultados[(p, n)].a_dict()}
+                               for p in pilotos for n in niveles],
+            }, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""Calidad visual adaptativa para mantener la tasa de frames.
+
+GobernadorCalidad recibe el tiempo de actualización y dibujo de cada frame y
+baja un nivel de calidad cuando el presupuesto se supera de forma sostenida;
+lo vuelve a subir cuando hay margen durante un rato. Las dos condiciones son
+distintas (histéresis) y tras cada cambio hay un tiempo de espera, así que no
+oscila entre niveles.
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+# De mejor a peor. 'particulas' multiplica las cantidades de cada efecto y
+# 'estela' la duración de la estela de la trayectoria.
+NIVELES_CALIDAD = [
+    {'nombre': 'alta', 'particulas': 1.0, 'destello': True, 'estrellas': 100,
+     'estela': 1.0, 'pilares_degradado': True},
+    {'nombre': 'media', 'particulas': 0.5, 'destello': True, 'estrellas': 60,
+     'estela': 0.6, 'pilares_degradado': True},
+    {'nombre': 'baja', 'particulas': 0.25, 'destello': False, 'estrellas': 30,
+     'estela': 0.3, 'pilares_degradado': False},
+    {'nombre': 'minima', 'particulas': 0.1, 'destello': False, 'estrellas': 0,
+     'estela': 0.0, 'pilares_degradado': False},
+]
+
+SUAVIZADO = 0.1  # Peso del último frame en la media móvil exponencial
+FRAMES_BAJADA = 10  # Frames seguidos por encima del presupuesto para bajar
+FRAMES_SUBIDA = 120  # Frames seguidos con margen para subir (2 s a 60 FPS)
+MARGEN_SUBIDA = 0.6  # Hay margen si la media es menor que esta fracción del presupuesto
+ESPERA_CAMBIO = 60  # Frames sin cambiar de nivel tras un cambio
+
+
+def nivel_por_nombre(nombre):
+    for indice, nivel in enumerate(NIVELES_CALIDAD):
+        if nivel['nombre'] == nombre:
+            return indice
+    raise ValueError(f"Nivel de calidad desconocido: {nombre}")
+
+
+class GobernadorCalidad:
+    def __init__(self, presupuesto_ms, indice=0, adaptativo=True):
+        self.presupuesto_ms = presupuesto_ms
+        self.indice = indice
+        self.adaptativo = adaptativo
+        self.media_ms = 0.0
+        self.frames_lento = 0
+        self.frames_holgado = 0
+        self.espera = 0
+
+    @property
+    def nivel(self):
+        return NIVELES_CALIDAD[self.indice]
+
+    def registrar(self, ms):
+        """Tiempo de un frame; devuelve True si ha cambiado el nivel"""
+        self.media_ms += (ms - self.media_ms) * SUAVIZADO
+        if not self.adaptativo:
+            return False
+        if self.espera > 0:
+            self.espera -= 1
+            return False
+
+        if self.media_ms > self.presupuesto_ms:
+            self.frames_lento += 1
+            self.frames_holgado = 0
+        elif self.media_ms < self.presupuesto_ms * MARGEN_SUBIDA:
+            self.frames_holgado += 1
+            self.frames_lento = 0
+        else:
+            self.frames_lento = 0
+            self.frames_holgado = 0
+
+        if self.frames_lento >= FRAMES_BAJADA and self.indice < len(NIVELES_CALIDAD) - 1:
+            return self._cambiar(self.indice + 1)
+        if self.frames_holgado >= FRAMES_SUBIDA and self.indice > 0:
+            return self._cambiar(self.indice - 1)
+        return False
+
+    def _cambiar(self, indice):
+        logger.info("Calidad %s -> %s (%.1f ms/frame, presupuesto %.1f ms)",
+                    self.nivel['nombre'], NIVELES_CALIDAD[indice]['nombre'],
+                    self.media_ms, self.presupuesto_ms)
+        self.indice = indice
+        self.frames_lento = 0
+        self.frames_holgado = 0
+        self.espera = ESPERA_CAMBIO
+        return True
@@ -0,0 +1,146 @@
+"""Entorno de aprendizaje por refuerzo sobre la física del juego.
+
+EntornoAterrizaje sigue el esquema reset()/step() con una sola nave;
+EntornoAterrizajeVectorizado avanza muchas naves por llamada con arrays de
+NumPy (simulacion_lote) y reinicia automáticamente las que terminan. Ninguno
+de los dos importa pygame: solo renderizar() lo hace, y dibuja con
+Nave.dibujar y Base.dibujar del juego sobre una superficie fuera de pantalla.
+
+Acciones: entero 0-7 con los bits de grabacion (1 propulsor, 2 izquierda,
+4 derecha). Observación: x, y, velocidad_x, velocidad_y, fuel, viento y
+desplazamiento de la base respecto a la nave. La recompensa se da al terminar
+y es calcular_puntuacion / ESCALA_RECOMPENSA (0 si la nave se estrella).
+"""
+import random
+
+import numpy as np
+
+from grabacion import decodificar_entrada, BIT_PROPULSOR, BIT_IZQUIERDA, BIT_DERECHA
+from simulacion import FPS, ANCHO, ALTO, EstadoNave, posicion_base
+from simulacion_lote import SimulacionLote, ATERRIZADO, EN_VUELO
+
+N_ACCIONES = 8
+N_OBSERVACION = 7
+ESCALA_RECOMPENSA = 1000.0
+MAX_PASOS = FPS * 60
+
+
+def _observacion(nave):
+    return np.array([nave.x, nave.y, nave.velocidad_x, nave.velocidad_y,
+                     nave.fuel, nave.viento, nave.base_x - nave.x], dtype=np.float32)
+
+
+def _dibujar_estado(nave, superficie):
+    """Dibuja un EstadoNave con las rutinas del juego (importa pygame aquí)"""
+    import pygame
+    import game
+
+    if superficie is None:
+        superficie = pygame.Surface((ANCHO, ALTO))
+    superficie.fill((0, 0, 0))
+    game.dibujar_suelo(superficie)
+    game.Base(nave.nivel, x=nave.base_x).dibujar(superficie, nave.viento)
+    game.Nave.dibujar(nave, superficie)
+    return superficie
+
+
+class EntornoAterrizaje:
+    """Una nave: reset() -> observación, step(acción) -> (obs, recompensa, terminado, info)"""
+
+    def __init__(self, nivel=1, max_pasos=MAX_PASOS, penalizacion_accidente=0.0):
+        self.nivel = nivel
+        self.max_pasos = max_pasos
+        self.penalizacion_accidente = penalizacion_accidente
+        self.rng = random.Random()
+        self.nave = None
+
+    def reset(self, semilla=None):
+        if semilla is not None:
+            self.rng = random.Random(semilla)
+        self.nave = EstadoNave(self.nivel, base_x=posicion_base(self.nivel, self.rng))
+        return _observacion(self.nave)
+
+    def step(self, accion):
+        nave = self.nave
+        nave.avanzar(decodificar_entrada(int(accion)), self.rng)
+        truncado = not nave.terminado and nave.pasos >= self.max_pasos
+        recompensa = 0.0
+        info = {}
+        if nave.terminado:
+            nave.calcular_puntuacion()
+            recompensa = nave.puntuacion / ESCALA_RECOMPENSA
+            if nave.estrellado:
+                recompensa -= self.penalizacion_accidente
+            info = {'puntuacion': nave.puntuacion, 'aterrizado': nave.aterrizado,
+                    'razon_accidente': nave.razon_accidente}
+        info['truncado'] = truncado
+        return _observacion(nave), recompensa, nave.terminado or truncado, info
+
+    def renderizar(self, superficie=None):
+        """Dibuja el estado actual; devuelve la superficie de pygame"""
+        return _dibujar_estado(self.nave, superficie)
+
+
+class EntornoAterrizajeVectorizado:
+    """N naves por llamada; las que terminan se reinician solas.
+
+    step() devuelve arrays de tamaño N. Para las naves que acaban de terminar,
+    info['observacion_final'] y info['puntuacion'] guardan el estado final
+    antes del reinicio.
+    """
+
+    def __init__(self, n, niveles=(1,), semilla=None, max_pasos=MAX_PASOS,
+                 penalizacion_accidente=0.0):
+        self.n = n
+        self.max_pasos = max_pasos
+        self.penalizacion_accidente = penalizacion_accidente
+        self.rng = np.random.default_rng(semilla)
+        # Niveles repartidos entre las naves en orden cíclico
+        self.niveles = np.resize(np.asarray(niveles), n)
+        self.lote = None
+
+    def reset(self):
+        self.lote = SimulacionLote(self.niveles, rng=self.rng)
+        return self._observaciones()
+
+    def _observaciones(self):
+        lote = self.lote
+        return np.stack([lote.x, lote.y, lote.velocidad_x, lote.velocidad_y,
+                         lote.fuel, lote.viento, lote.base_x - lote.x], axis=1).astype(np.float32)
+
+    def step(self, acciones):
+        lote = self.lote
+        acciones = np.asarray(acciones)
+        lote.avanzar((acciones & BIT_PROPULSOR) != 0,
+                     (acciones & BIT_IZQUIERDA) != 0,
+                     (acciones & BIT_DERECHA) != 0)
+
+        terminado = lote.resultado != EN_VUELO
+        truncado = ~terminado & (lote.pasos >= self.max_pasos)
+        fin = terminado | truncado
+
+        recompensas = np.zeros(self.n, dtype=np.float32)
+        info = {'truncado': truncado}
+        if fin.any():
+            puntuacion = lote.calcular_puntuacion()['puntuacion']
+            recompensas[terminado] = puntuacion[terminado] / ESCALA_RECOMPENSA
+            estrellado = terminado & (lote.resultado != ATERRIZADO)
+            recompensas[estrellado] -= self.penalizacion_accidente
+            info['observacion_final'] = self._observaciones()
+            info['puntuacion'] = np.where(terminado, puntuacion, 0)
+            info['aterrizado'] = lote.resultado == ATERRIZADO
+            lote.reiniciar(fin)
+        return self._observaciones(), recompensas, fin, info
+
+    def estado(self, i):
+        """EstadoNave con los valores actuales de la nave i"""
+        lote = self.lote
+        nave = EstadoNave(int(lote.nivel[i]), base_x=float(lote.base_x[i]))
+        nave.x, nave.y = float(lote.x[i]), float(lote.y[i])
+        nave.velocidad_x, nave.velocidad_y = float(lote.velocidad_x[i]), float(lote.velocidad_y[i])
+        nave.fuel, nave.viento = float(lote.fuel[i]), float(lote.viento[i])
+        return nave
+
+    def renderizar(self, i=0, superficie=None):
+        """Dibuja la nave i; devuelve la superficie de pygame"""
+        return _dibujar_estado(self.estado(i), superficie)
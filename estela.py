@@ -0,0 +1,103 @@
+"""Estela de la trayectoria de la nave.
+
+EstelaTrayectoria guarda las últimas posiciones muestreadas en un anillo de
+tamaño fijo: añadir una muestra es O(1) y no reserva memoria. CapaEstela la
+dibuja sobre una capa SRCALPHA persistente. En cada frame se atenúa la capa con
+un único fill en modo BLEND_RGBA_SUB y solo se trazan los segmentos nuevos, así
+que el coste por frame no depende de lo larga que sea la estela.
+"""
+import math
+from collections import deque
+
+import numpy as np
+import pygame
+
+COLOR_ESTELA = (100, 100, 255)
+LARGO_ESTELA = 20  # Muestras que guarda el anillo (y que tarda en borrarse un segmento)
+INTERVALO_ESTELA = 6  # Pasos de simulación entre muestras (100 ms)
+
+
+class EstelaTrayectoria:
+    """Anillo con las últimas posiciones muestreadas de la nave"""
+
+    def __init__(self, capacidad=LARGO_ESTELA, intervalo=INTERVALO_ESTELA):
+        if capacidad < 0 or intervalo <= 0:
+            raise ValueError(f"Estela no válida: capacidad {capacidad}, intervalo {intervalo}")
+        self.capacidad = capacidad  # 0 = sin estela
+        self.intervalo = intervalo
+        self.puntos = np.zeros((capacidad, 2))
+        self.total = 0  # Muestras añadidas desde el principio
+
+    def __len__(self):
+        return min(self.total, self.capacidad)
+
+    def muestrear(self, paso, x, y):
+        """Añade (x, y) si en este paso toca tomar muestra"""
+        if self.capacidad and paso % self.intervalo == 0:
+            self.agregar(x, y)
+
+    def agregar(self, x, y):
+        self.puntos[self.total % self.capacidad] = (x, y)
+        self.total += 1
+
+    def punto(self, indice):
+        """Muestra número indice (contando desde la primera); debe seguir en el anillo"""
+        return tuple(self.puntos[indice % self.capacidad])
+
+    def ultimas(self, n=None):
+        """Las n últimas muestras (todas si n es None), de la más antigua a la más nueva"""
+        n = len(self) if n is None else min(n, len(self))
+        return self.puntos[np.arange(self.total - n, self.total) % self.capacidad]
+
+
+class CapaEstela:
+    """Capa translúcida persistente donde se acumula la estela"""
+
+    def __init__(self, tamaño, color=COLOR_ESTELA):
+        self.capa = pygame.Surface(tamaño, pygame.SRCALPHA)
+        self.color = color
+        self.reiniciar()
+
+    def reiniciar(self):
+        self.capa.fill((0, 0, 0, 0))
+        self.dibujadas = 0  # Muestras de la estela ya trazadas en la capa
+        self.pendiente = 0.0  # Alfa por restar (negativo si ya se restó de más al redondear)
+        self.zonas = deque()  # [pasos que le quedan, rect] de cada segmento visible
+
+    def dibujar(self, pantalla, estela, pasos, vida):
+        """Atenúa la capa por los pasos simulados, traza lo nuevo y la compone.
+
+        vida es el número de pasos que tarda un segmento en desaparecer (0 =
+        sin estela). Devuelve el rectángulo compuesto, o None.
+        """
+        if vida <= 0:
+            if self.zonas:
+                self.reiniciar()
+            self.dibujadas = estela.total
+            return None
+
+        # Atenuar: un solo fill que resta alfa (y nada de color) en la zona ocupada.
+        # Se redondea hacia arriba para que a los vida pasos el alfa sea 0 seguro
+        self.pendiente += 255 * pasos / vida
+        resta = min(255, max(0, math.ceil(self.pendiente)))
+        self.pendiente -= resta
+        if resta and self.zonas:
+            zona = self.zonas[0][1].unionall([z for _, z in self.zonas])
+            self.capa.fill((0, 0, 0, resta), zona, special_flags=pygame.BLEND_RGBA_SUB)
+        for segmento in self.zonas:
+            segmento[0] -= pasos
+        while self.zonas and self.zonas[0][0] <= 0:
+            self.zonas.popleft()
+
+        # Segmentos nuevos desde el último frame, con alfa completo
+        primera = max(self.dibujadas, estela.total - len(estela) + 1, 1)
+        for i in range(primera, estela.total):
+            rect = pygame.draw.line(self.capa, (*self.color, 255),
+                                    estela.punto(i - 1), estela.punto(i), 1)
+            self.zonas.append([vida, rect])
+        self.dibujadas = estela.total
+
+        if not self.zonas:
+            return None
+        zona = self.zonas[0][1].unionall([z for _, z in self.zonas])
+        return pantalla.blit(self.capa, zona, zona)
@@ -0,0 +1,181 @@
+"""Evaluación de pilotos automáticos y clasificación reproducible.
+
+Puntúa cada piloto (ver pilotos.crear_piloto) sobre miles de escenarios con
+semilla (posición de la base y viento) usando el mismo cálculo de puntuación
+que el juego. Los vuelos se reparten en un pool de procesos; cada proceso crea
+sus pilotos una sola vez al arrancar. Los resultados se guardan en caché por
+huella del piloto y semilla del escenario, así que un piloto sin cambios no se
+vuelve a simular:
+
+    python evaluacion.py perfil frenado_final perfil:pendiente=0.02
+"""
+import argparse
+import hashlib
+import inspect
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+import simulacion
+from calibracion import semilla_escenario
+from pilotos import crear_piloto
+
+ARCHIVO_CACHE = ".evaluacion_cache.json"
+
+# Pilotos ya creados en cada proceso del pool, por huella
+_pilotos_trabajador = {}
+
+
+def version_simulacion():
+    """Hash de las reglas de simulación: si cambian, la caché deja de valer"""
+    return hashlib.sha1(inspect.getsource(simulacion).encode()).hexdigest()[:16]
+
+
+class CacheEvaluacion:
+    """Resultados por (huella del piloto, semilla del escenario) en un JSON"""
+
+    def __init__(self, archivo=ARCHIVO_CACHE):
+        self.archivo = archivo
+        self.version = version_simulacion()
+        self.resultados = {}
+        try:
+            if os.path.exists(self.archivo):
+                with open(self.archivo, 'r') as f:
+                    datos = json.load(f)
+                if datos.get('version') == self.version:
+                    self.resultados = datos['resultados']
+        except (OSError, ValueError, KeyError):
+            self.resultados = {}
+
+    def obtener(self, huella, semilla):
+        return self.resultados.get(huella, {}).get(semilla)
+
+    def agregar(self, huella, semilla, resultado):
+        self.resultados.setdefault(huella, {})[semilla] = resultado
+
+    def guardar(self):
+        with open(self.archivo, 'w') as f:
+            json.dump({'version': self.version, 'resultados': self.resultados}, f)
+
+
+def _inicializar_trabajador(especificaciones):
+    """Estado caliente del proceso: los pilotos se crean una sola vez"""
+    for especificacion in especificaciones:
+        piloto = crear_piloto(especificacion)
+        _pilotos_trabajador[piloto.huella()] = piloto
+
+
+def _evaluar_bloque(tarea):
+    huella, escenarios = tarea
+    piloto = _pilotos_trabajador[huella]
+    resultados = []
+    for nivel, semilla in escenarios:
+        piloto.reiniciar(random.Random(semilla + ":piloto"))
+        nave = simulacion.simular_vuelo(piloto, nivel, random.Random(semilla))
+        resultados.append((semilla, [nivel, int(nave.aterrizado), nave.puntuacion, nave.pasos]))
+    return huella, resultados
+
+
+def evaluar(especificaciones, niveles=(1, 2, 3), escenarios_por_nivel=1000, semilla=0,
+            procesos=None, bloque=200, cache=None):
+    """Evalúa los pilotos y devuelve (clasificación, estadísticas)"""
+    pilotos = {especificacion: crear_piloto(especificacion) for especificacion in especificaciones}
+    escenarios = [(nivel, semilla_escenario(semilla, nivel, indice))
+                  for nivel in niveles for indice in range(escenarios_por_nivel)]
+    cache = cache if cache is not None else CacheEvaluacion()
+
+    # Solo se simulan los escenarios que no están en la caché
+    tareas = []
+    en_cache = 0
+    for huella in sorted({piloto.huella() for piloto in pilotos.values()}):
+        pendientes = [e for e in escenarios if cache.obtener(huella, e[1]) is None]
+        en_cache += len(escenarios) - len(pendientes)
+        tareas.extend((huella, pendientes[i:i + bloque]) for i in range(0, len(pendientes), bloque))
+
+    simulados = sum(len(escenarios_tarea) for _, escenarios_tarea in tareas)
+    inicio = time.perf_counter()
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1 or not tareas:
+        _inicializar_trabajador(especificaciones)
+        parciales = map(_evaluar_bloque, tareas)
+        for huella, resultados in parciales:
+            for semilla_esc, resultado in resultados:
+                cache.agregar(huella, semilla_esc, resultado)
+    else:
+        with multiprocessing.Pool(procesos, initializer=_inicializar_trabajador,
+                                  initargs=(list(especificaciones),)) as pool:
+            for huella, resultados in pool.imap_unordered(_evaluar_bloque, tareas):
+                for semilla_esc, resultado in resultados:
+                    cache.agregar(huella, semilla_esc, resultado)
+    duracion = time.perf_counter() - inicio
+    if simulados:
+        cache.guardar()
+
+    clasificacion = []
+    for especificacion, piloto in pilotos.items():
+        huella = piloto.huella()
+        resultados = [cache.obtener(huella, s) for _, s in escenarios]
+        por_nivel = {}
+        for nivel in niveles:
+            puntos = [r[2] for r in resultados if r[0] == nivel]
+            por_nivel[nivel] = sum(puntos) / len(puntos) if puntos else 0.0
+        clasificacion.append({
+            'piloto': especificacion,
+            'huella': huella,
+            'escenarios': len(resultados),
+            'puntuacion_media': sum(r[2] for r in resultados) / len(resultados) if resultados else 0.0,
+            'tasa_aterrizaje': sum(r[1] for r in resultados) / len(resultados) if resultados else 0.0,
+            'puntuacion_por_nivel': por_nivel,
+        })
+    # Orden estable: puntuación, aterrizajes y nombre para desempatar
+    clasificacion.sort(key=lambda c: (-c['puntuacion_media'], -c['tasa_aterrizaje'], c['piloto']))
+
+    estadisticas = {
+        'simulados': simulados,
+        'en_cache': en_cache,
+        'segundos': duracion,
+        'escenarios_por_segundo': simulados / duracion if duracion > 0 else 0.0,
+    }
+    return clasificacion, estadisticas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Clasificación de pilotos automáticos")
+    parser.add_argument("pilotos", nargs="+", help="nombre o nombre:clave=valor,...")
+    parser.add_argument("--escenarios", type=int, default=1000, help="Escenarios por nivel")
+    parser.add_argument("--niveles", default="1,2,3")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--procesos", type=int, default=None, help="Por defecto, todos los núcleos")
+    parser.add_argument("--bloque", type=int, default=200, help="Escenarios por tarea")
+    parser.add_argument("--cache", default=ARCHIVO_CACHE, help="Archivo de caché de resultados")
+    parser.add_argument("--json", metavar="ARCHIVO", help="Guardar la clasificación en JSON")
+    args = parser.parse_args()
+
+    niveles = [int(n) for n in args.niveles.split(",")]
+    try:
+        clasificacion, estadisticas = evaluar(args.pilotos, niveles, args.escenarios, args.semilla,
+                                              args.procesos, args.bloque, CacheEvaluacion(args.cache))
+    except ValueError as e:
+        parser.error(str(e))
+
+    print(f"{'#':>3}  {'piloto':<32}{'huella':<18}{'media':>8}{'aterriza':>10}"
+          + "".join(f"{'nivel ' + str(n):>10}" for n in niveles))
+    for posicion, fila in enumerate(clasificacion, 1):
+        print(f"{posicion:>3}  {fila['piloto']:<32}{fila['huella']:<18}"
+              f"{fila['puntuacion_media']:>8.0f}{fila['tasa_aterrizaje']:>10.1%}"
+              + "".join(f"{fila['puntuacion_por_nivel'][n]:>10.0f}" for n in niveles))
+    print(f"\n{estadisticas['simulados']} escenarios simulados, {estadisticas['en_cache']} desde caché, "
+          f"{estadisticas['escenarios_por_segundo']:.0f} escenarios/s")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'semilla': args.semilla, 'clasificacion': clasificacion,
+                       'estadisticas': estadisticas}, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""Nave fantasma: el mejor vuelo de cada nivel, paso a paso.
+
+El archivo tiene una cabecera y un registro de ancho fijo por paso de
+simulación (x e y en float32 y los bits de los propulsores de grabacion). Al
+ser de ancho fijo, el registro del paso n está en una posición conocida: el
+archivo se abre con mmap y se lee registro a registro mientras se juega, sin
+cargarlo ni decodificarlo entero.
+"""
+import mmap
+import os
+import struct
+
+MAGIA = b"ALFT"
+VERSION_FORMATO = 1
+CABECERA = struct.Struct("<4sBBI")  # magia, versión, nivel, puntuación
+REGISTRO = struct.Struct("<ffB")  # x, y, bits de los propulsores
+
+
+def archivo_fantasma(nivel):
+    return f"fantasma_nivel{nivel}.bin"
+
+
+class GrabadorFantasma:
+    """Acumula los registros de la ronda en curso"""
+
+    def __init__(self, nivel):
+        self.nivel = nivel
+        self.datos = bytearray()
+
+    def agregar(self, x, y, bits=0):
+        self.datos += REGISTRO.pack(x, y, bits)
+
+    def __len__(self):
+        return len(self.datos) // REGISTRO.size
+
+    def guardar(self, puntuacion, archivo=None):
+        archivo = archivo or archivo_fantasma(self.nivel)
+        # Escribir aparte y reemplazar, para no dejar nunca un archivo a medias
+        temporal = archivo + ".tmp"
+        with open(temporal, 'wb') as f:
+            f.write(CABECERA.pack(MAGIA, VERSION_FORMATO, self.nivel, puntuacion))
+            f.write(self.datos)
+        os.replace(temporal, archivo)
+
+
+class Fantasma:
+    """Lector de un archivo de fantasma proyectado en memoria"""
+
+    def __init__(self, archivo):
+        with open(archivo, 'rb') as f:
+            self.mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magia, version, self.nivel, self.puntuacion = CABECERA.unpack_from(self.mapa, 0)
+            if magia != MAGIA:
+                raise ValueError("No es un archivo de fantasma")
+            if version != VERSION_FORMATO:
+                raise ValueError(f"Versión de fantasma no soportada: {version}")
+        except (ValueError, struct.error):
+            self.mapa.close()
+            raise
+        self.pasos = (len(self.mapa) - CABECERA.size) // REGISTRO.size
+        if self.pasos == 0:
+            self.mapa.close()
+            raise ValueError("Fantasma sin registros")
+
+    @classmethod
+    def abrir(cls, nivel):
+        """Fantasma del nivel, o None si no hay uno válido"""
+        try:
+            return cls(archivo_fantasma(nivel))
+        except (OSError, ValueError, struct.error):
+            return None
+
+    def registro(self, paso):
+        """(x, y, bits) del paso; después del último se queda en el último"""
+        paso = max(0, min(paso, self.pasos - 1))
+        return REGISTRO.unpack_from(self.mapa, CABECERA.size + paso * REGISTRO.size)
+
+    def cerrar(self):
+        self.mapa.close()
@@ -1,35 +1,42 @@
 import pygame
 import sys
+import argparse
+import logging
+import time
 from math import cos, sin, radians
 import random
-from scores import TableroRecords
+from scores import TableroRecords, DIRECTORIO_REPETICIONES
 import datetime
 import math
+import os
+import numpy as np
 from sonidos import Sonidos
-import subprocess
+from grabacion import Grabacion, PilotoRepeticion, crear_rng, codificar_entrada, decodificar_entrada
+from fantasma import Fantasma, GrabadorFantasma
+from particulas import SistemaParticulas, EmisorEscape, GRAVEDAD_PARTICULAS
+from calidad import GobernadorCalidad, NIVELES_CALIDAD, nivel_por_nombre
+from pantallas import CPU_PANTALLAS, ejecutar_pantalla
+from estela import CapaEstela, EstelaTrayectoria, LARGO_ESTELA, INTERVALO_ESTELA
+from ventana import Ventana, ESCALADOS
+from perfilador import PERFILADOR
+from textos import AtlasGlifos, GLIFOS, cargar_fuentes, fuente, texto
+from pilotos import Piloto, crear_piloto
+from simulacion import (
+    ANCHO, ALTO, FPS, EMPUJE, EMPUJE_LATERAL, VIENTO_MAX, BASE_ANCHO,
+    VELOCIDAD_MAXIMA_ATERRIZAJE, BASE_ALTURA_SOBRE_SUELO, SUELO_ALTURA, FUEL_POR_NIVEL,
+    VIENTO_POR_NIVEL, ESPERA_PUNTUACION, ANGULO_MAXIMO, EstadoNave, posicion_base,
+    predecir_contacto
+)
 
 # Inicialización de Pygame
 pygame.init()
 
 # Constantes
-ANCHO = 800
-ALTO = 600
-FPS = 60
-GRAVEDAD = 0.03
-EMPUJE = 0.1
-EMPUJE_LATERAL = 0.08
-VIENTO_MAX = 0.025     # Reducido de 0.03 a 0.02
-CAMBIO_VIENTO = 0.02   # Reducido de 0.2 a 0.02 (10 veces menos frecuente)
-VIENTO_INCREMENTO = 0.001  # Nueva constante para cambio gradual
-FUEL_INICIAL = 400
 COLOR_BLANCO = (255, 255, 255)
 COLOR_ROJO = (255, 0, 0)
 COLOR_VERDE = (0, 255, 0)
 COLOR_AMARILLO = (255, 255, 0)
 COLOR_AZUL = (0, 191, 255)
-BASE_ANCHO = 60  # Ancho de la base de aterrizaje
-BASE_X = ANCHO // 2  # Posición X de la base (centro)
-VELOCIDAD_MAXIMA_ATERRIZAJE = 3.0  # Nueva constante para velocidad máxima de aterrizaje
 ESTRELLAS_CANTIDAD = 100
 COLOR_FUEGO = [(255, 165, 0), (255, 69, 0), (255, 0, 0)]  # Degradado de fuego
 COLOR_GRIS = (128, 128, 128)
@@ -38,56 +45,51 @@ PARTICULAS_EXPLOSION = 80  # Aumentado de 50 a 80
 PARTICULAS_EXITO = 30
 COLOR_FUEGO_EXPLOSION = [(255, 200, 0), (255, 100, 0), (255, 0, 0)]
 COLOR_EXITO = [(255, 215, 0), (0, 255, 0), (255, 255, 255)]
-BASE_ALTURA_SOBRE_SUELO = 30  # Altura de la base sobre la superficie lunar
-SUELO_ALTURA = 50  # Altura del suelo lunar (ya existente como valor fijo, ahora como constante)
 PARTICULAS_EXPLOSION_SECUNDARIAS = 40  # Para la segunda fase de la explosión
 COLOR_HUMO_EXPLOSION = [(150, 150, 150), (100, 100, 100), (80, 80, 80)]  # Colores para el humo
 COLOR_DESTELLO = [(255, 255, 200), (255, 255, 255)]  # Para el destello inicial
+COLOR_DESTELLO_PANTALLA = (255, 255, 200)
+COLOR_ONDA = (255, 200, 50)
+RADIO_ONDA_INICIAL = 5
+CRECIMIENTO_ONDA = 8  # Píxeles de radio por paso
+VIDA_ONDA_EXPLOSION = 20  # Pasos
+VIDA_ONDA_EXITO = 30
+GRAVEDAD_HUMO = 0.13  # El humo cae poco y lo frena el aire
+ARRASTRE_HUMO = 0.98
+MAX_PARTICULAS_ESCAPE = 256  # Tope del anillo de escape de los propulsores
+PARTICULAS_POR_EMPUJE = 30  # Partículas por paso y unidad de empuje (3 el principal, 2.4 un lateral)
+GRAVEDAD_ESCAPE = 0.02
+ARRASTRE_ESCAPE = 0.95
 
 # Nuevas constantes para mejorar la jugabilidad
 INDICADOR_ATERRIZAJE = True  # Mostrar indicador de zona segura
-GRAVEDAD = 0.03  # Gravedad lunar constante para todos los niveles
-
-FUEL_POR_NIVEL = {  # Combustible según el nivel
-    1: 500,    # Nivel fácil: mucho combustible
-    2: 300,    # Nivel medio: combustible moderado
-    3: 150     # Nivel difícil: poco combustible
-}
-
-VIENTO_POR_NIVEL = {  # Intensidad del viento según el nivel
-    1: 0.01,   # Nivel fácil: viento muy suave
-    2: 0.03,   # Nivel medio: viento moderado
-    3: 0.05    # Nivel difícil: viento fuerte
-}
-
-# Configuración de la pantalla
-pantalla = pygame.display.set_mode((ANCHO, ALTO))
-pygame.display.set_caption("Aterrizaje Lunar")
+INDICADOR_PREDICCION = True  # Mostrar dónde y cómo tocará la nave la altura de la base
+ALFA_FANTASMA = 90  # Transparencia de la nave fantasma (0-255)
+MARGEN_DIBUJO_NAVE = 32  # Nave, patas y fuego lateral caben en 2*MARGEN_DIBUJO_NAVE de ancho
+UMBRAL_RECTANGULOS_SUCIOS = 0.5  # Fracción de pantalla sucia a partir de la cual se hace flip
+TAMAÑO_HUD = 36
+PASO_ANGULAR = 5  # Grados entre los sprites pre-rotados de la nave
+RADIO_SPRITE_NAVE = 56  # Distancia máxima del centro de la nave a su dibujo (con patas y fuego)
+ATLAS_HUD = AtlasGlifos(TAMAÑO_HUD, GLIFOS + "sV: ")  # Números del HUD y etiqueta de la predicción
+
+# Configuración de la pantalla (se crea al arrancar el juego, no al importar)
+pantalla = None
+ventana = None
 reloj = pygame.time.Clock()
 
+# Paso fijo de simulación: la física avanza a FPS pasos por segundo
+# independientemente de cuántos frames se dibujen
+PASO_SIMULACION = 1000 / FPS  # ms por paso
+MAX_PASOS_POR_FRAME = 5  # Evita la espiral de retraso en máquinas lentas
+FPS_RENDER = 60  # Límite de frames dibujados (0 = sin límite)
+
 class Base:
-    def __init__(self, nivel=1):
+    def __init__(self, nivel=1, rng=random, x=None):
         self.ancho = BASE_ANCHO
         self.alto = 20
         
-        # Determinar rango de posición según nivel
-        margen = 100  # Margen mínimo desde los bordes
-        if nivel == 1:
-            # Nivel fácil: Base cerca del centro (±20% del espacio disponible)
-            desplazamiento_max = (ANCHO - 2*margen) * 0.2
-        elif nivel == 2:
-            # Nivel medio: Base más alejada (±40% del espacio disponible)
-            desplazamiento_max = (ANCHO - 2*margen) * 0.4
-        else:
-            # Nivel difícil: Base puede estar casi en cualquier lugar (±70% del espacio disponible)
-            desplazamiento_max = (ANCHO - 2*margen) * 0.7
-        
-        # Posición aleatoria dentro del rango permitido
-        desplazamiento = random.uniform(-desplazamiento_max, desplazamiento_max)
-        self.x = ANCHO//2 + desplazamiento
-        
-        # Asegurar que la base no quede muy cerca de los bordes
-        self.x = max(margen + self.ancho//2, min(ANCHO - margen - self.ancho//2, self.x))
+        # Posición aleatoria según el nivel (misma regla que la simulación)
+        self.x = posicion_base(nivel, rng) if x is None else x
         
         self.y = ALTO - SUELO_ALTURA - BASE_ALTURA_SOBRE_SUELO
         
@@ -95,13 +97,24 @@ class Base:
         self.manga_x = self.x - self.ancho//2 - 40
         self.manga_y = self.y - 80
 
-    def dibujar(self, viento):
+    def dibujar(self, pantalla, viento, degradado=True):
+        self.dibujar_estructura(pantalla, degradado)
+        self.dibujar_manga(pantalla, viento)
+
+    def dibujar_estructura(self, pantalla, degradado=True):
+        """Todo lo que no cambia durante la ronda (plataforma, pilares, mástil)"""
         # Dibujar pilares de soporte desde el suelo
         altura_pilares = BASE_ALTURA_SOBRE_SUELO + self.alto
         ancho_pilar = 8
         
         # Pilares principales
         for x_pilar in [self.x - self.ancho//3, self.x + self.ancho//3]:
+            if not degradado:
+                # Calidad reducida: un solo rectángulo del tono medio
+                pygame.draw.rect(pantalla, (125, 125, 125),
+                               (x_pilar - ancho_pilar//2, self.y + self.alto,
+                                ancho_pilar, altura_pilares))
+                continue
             # Pilar con degradado
             for i in range(altura_pilares):
                 oscuridad = max(100, 150 - i//2)  # Más oscuro abajo, más claro arriba
@@ -173,6 +186,10 @@ class Base:
         for y in range(self.manga_y + 10, self.manga_y + mastil_alto, 20):
             pygame.draw.rect(pantalla, COLOR_BLANCO,
                            (self.manga_x - 1, y, mastil_ancho + 2, 2))
+
+    def dibujar_manga(self, pantalla, viento):
+        """La manga de viento, lo único de la base que cambia en cada frame"""
+        mastil_ancho = 6
         
         # Manga con mejor diseño
         manga_longitud = 50
@@ -190,7 +207,7 @@ class Base:
         # Efecto de volumen en la manga
         pygame.draw.polygon(pantalla, COLOR_ROJO, puntos_manga)
         pygame.draw.polygon(pantalla, (200, 0, 0), puntos_manga, 0)  # Sombreado
-        pygame.draw.polygon(pantalla, COLOR_BLANCO, puntos_manga, 2)  # Borde
+        rect = pygame.draw.polygon(pantalla, COLOR_BLANCO, puntos_manga, 2)  # Borde
         
         # Líneas de detalle en la manga
         for i in range(1, 3):
@@ -199,514 +216,572 @@ class Base:
                            (self.manga_x + mastil_ancho, self.manga_y + 10 + y_offset),
                            (self.manga_x + mastil_ancho + manga_deflexion * 0.8,
                             self.manga_y + 10 + y_offset), 1)
+        return rect
 
 class Estrellas:
-    def __init__(self):
-        self.estrellas = [(random.randint(0, ANCHO), 
-                          random.randint(0, ALTO - 50),
-                          random.random() * 2 + 1) for _ in range(ESTRELLAS_CANTIDAD)]
+    def __init__(self, rng=random):
+        self.estrellas = [(rng.randint(0, ANCHO), 
+                          rng.randint(0, ALTO - 50),
+                          rng.random() * 2 + 1) for _ in range(ESTRELLAS_CANTIDAD)]
     
-    def dibujar(self):
-        for x, y, tamaño in self.estrellas:
+    def dibujar(self, pantalla, cantidad=None):
+        for x, y, tamaño in self.estrellas[:cantidad]:
             pygame.draw.circle(pantalla, COLOR_BLANCO, (int(x), int(y)), int(tamaño))
 
-class Particula:
-    def __init__(self, x, y, color, velocidad_x, velocidad_y, vida, tamaño):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.velocidad_x = velocidad_x
-        self.velocidad_y = velocidad_y
-        self.vida = vida
-        self.vida_inicial = vida
-        self.tamaño = tamaño
+class CapaFondo:
+    """Estrellas, suelo y estructura de la base pre-dibujados para toda la ronda.
 
-    def actualizar(self):
-        self.x += self.velocidad_x
-        self.y += self.velocidad_y
-        self.vida -= 1
-        self.velocidad_y += 0.1  # Gravedad
-        return self.vida > 0
+    Se dibuja con un solo blit; solo se vuelve a construir si cambia el tamaño
+    de la pantalla o el nivel de calidad (estrellas, degradado de los pilares).
+    """
 
-    def dibujar(self, pantalla):
-        alpha = int(255 * (self.vida / self.vida_inicial))
-        color = list(self.color)
-        # Crear una superficie temporal para el efecto de transparencia
-        surf = pygame.Surface((self.tamaño * 2, self.tamaño * 2), pygame.SRCALPHA)
-        pygame.draw.circle(surf, (*color, alpha), (self.tamaño, self.tamaño), self.tamaño)
-        pantalla.blit(surf, (int(self.x - self.tamaño), int(self.y - self.tamaño)))
+    def __init__(self, estrellas, base):
+        self.estrellas = estrellas
+        self.base = base
+        self.superficie = None
+        self.clave = None
+
+    def preparar(self, pantalla, nivel_calidad):
+        """Construye la capa si hace falta; devuelve True si se ha reconstruido"""
+        clave = (pantalla.get_size(), nivel_calidad['estrellas'], nivel_calidad['pilares_degradado'])
+        if clave == self.clave:
+            return False
+        self.superficie = pygame.Surface(pantalla.get_size(), 0, pantalla)
+        self.superficie.fill((0, 0, 0))
+        self.estrellas.dibujar(self.superficie, nivel_calidad['estrellas'])  # Estrellas antes que todo
+        dibujar_suelo(self.superficie)
+        self.base.dibujar_estructura(self.superficie, nivel_calidad['pilares_degradado'])
+        self.clave = clave
+        return True
+
+    def dibujar(self, pantalla, viento, nivel_calidad):
+        """Fondo completo y manga; devuelve el rectángulo de la manga"""
+        self.preparar(pantalla, nivel_calidad)
+        pantalla.blit(self.superficie, (0, 0))
+        return self.base.dibujar_manga(pantalla, viento)
+
+    def restaurar(self, pantalla, rects):
+        """Copia el fondo solo en los rectángulos dados"""
+        for rect in rects:
+            pantalla.blit(self.superficie, rect, rect)
+
+class RectangulosSucios:
+    """Modo de dibujo que solo actualiza en pantalla lo que ha cambiado.
+
+    Cada frame borra con la capa de fondo los rectángulos dibujados en el
+    frame anterior, se vuelve a dibujar todo lo dinámico y se envían a la
+    pantalla solo los rectángulos viejos y nuevos. Si el área
+    sucia pasa de umbral (p. ej. el destello de pantalla completa) se hace un
+    flip normal.
+    """
+
+    def __init__(self, umbral=UMBRAL_RECTANGULOS_SUCIOS):
+        self.umbral = umbral
+        self.anteriores = []
+        self.completo = True  # El próximo frame dibuja el fondo entero
+        self.frames_parciales = 0
+        self.frames_completos = 0
+
+    def invalidar(self):
+        self.completo = True
+
+    def dibujar_fondo(self, pantalla, fondo, viento, nivel_calidad):
+        if fondo.preparar(pantalla, nivel_calidad):
+            self.completo = True
+        if self.completo:
+            return fondo.dibujar(pantalla, viento, nivel_calidad)
+        fondo.restaurar(pantalla, self.anteriores)
+        return fondo.base.dibujar_manga(pantalla, viento)
+
+    def presentar(self, pantalla, rects):
+        limites = pantalla.get_rect()
+        rects = [limites.clip(rect) for rect in rects if rect]
+        sucios = self.anteriores + rects
+        area = sum(rect.w * rect.h for rect in sucios)
+        if self.completo or area > self.umbral * limites.w * limites.h:
+            ventana.presentar()
+            self.frames_completos += 1
+        else:
+            ventana.presentar(sucios)
+            self.frames_parciales += 1
+        self.anteriores = rects
+        self.completo = False
+
+def presentar_frame(pantalla, sucios, rects):
+    """Flip normal o, en modo de rectángulos sucios, solo las zonas cambiadas"""
+    if sucios is None:
+        ventana.presentar()
+    else:
+        sucios.presentar(pantalla, rects)
+
+class CompositorOverlays:
+    """Superficies de pantalla completa y anillos de onda creados una sola vez.
+
+    Se reutilizan cambiando su alfa de superficie (set_alpha) en vez de crear
+    una superficie SRCALPHA nueva en cada frame.
+    """
 
-class EfectosVisuales:
     def __init__(self):
-        self.particulas = []
-        self.particulas_secundarias = []  # Para humo y residuos
+        self.velos = {}  # color -> superficie opaca de pantalla completa
+        self.anillos = {}  # radio -> anillo con colorkey
+
+    def velo(self, color, alpha):
+        """Capa de pantalla completa de un color con la transparencia dada"""
+        capa = self.velos.get(color)
+        if capa is None:
+            capa = pygame.Surface((ANCHO, ALTO))
+            capa.fill(color)
+            self.velos[color] = capa
+        capa.set_alpha(alpha)
+        return capa
+
+    def anillo(self, radio, alpha):
+        superficie = self.anillos.get(radio)
+        if superficie is None:
+            superficie = pygame.Surface((radio * 2, radio * 2))
+            superficie.fill(COLOR_NEGRO)
+            pygame.draw.circle(superficie, COLOR_ONDA, (radio, radio), radio, 3)  # Grosor de la línea
+            # RLE: el anillo es casi todo transparente y se copia muy rápido
+            superficie.set_colorkey(COLOR_NEGRO, pygame.RLEACCEL)
+            self.anillos[radio] = superficie
+        superficie.set_alpha(alpha)
+        return superficie
+
+    def preparar(self):
+        """Pre-dibuja todos los anillos de las ondas de 20 y 30 pasos"""
+        for paso in range(max(VIDA_ONDA_EXPLOSION, VIDA_ONDA_EXITO)):
+            self.anillo(RADIO_ONDA_INICIAL + CRECIMIENTO_ONDA * paso, 255)
+
+# Compartido por todos los efectos y la pantalla de resultados
+compositor = CompositorOverlays()
+
+class EfectosVisuales:
+    def __init__(self, rng=random):
+        self.rng = rng  # Solo efectos visuales, no afecta a la física
+        # Generador de NumPy derivado del rng para emitir partículas en bloque
+        self.rng_np = np.random.default_rng(rng.getrandbits(64))
+        self.particulas = SistemaParticulas()
+        self.calidad = NIVELES_CALIDAD[0]
         self.activo = False
         self.tiempo_explosion = 0
         self.onda_expansion = None  # Para la onda expansiva
 
+    def ajustar_calidad(self, calidad):
+        """Cambia el nivel de calidad; si baja, recorta también las partículas vivas"""
+        factor = calidad['particulas'] / self.calidad['particulas']
+        if factor < 1:
+            self.particulas.recortar(int(len(self.particulas) * factor))
+        self.calidad = calidad
+
+    def _cantidad(self, cantidad):
+        return max(1, int(cantidad * self.calidad['particulas']))
+
+    def _emitir_en_circulo(self, x, y, cantidad, angulos, velocidades, colores, tamaños, vidas,
+                           subida=0.0, gravedad=GRAVEDAD_PARTICULAS, arrastre=1.0):
+        """Emite de una vez partículas con dirección y valores aleatorios en los rangos dados"""
+        rng = self.rng_np
+        angulo = rng.uniform(*angulos, cantidad)
+        velocidad = rng.uniform(*velocidades, cantidad)
+        indices = [self.particulas.indice_color(color) for color in colores]
+        self.particulas.emitir(
+            x, y,
+            np.cos(angulo) * velocidad,
+            np.sin(angulo) * velocidad - subida,
+            rng.integers(vidas[0], vidas[1], size=cantidad, endpoint=True),
+            rng.integers(tamaños[0], tamaños[1], size=cantidad, endpoint=True),
+            rng.choice(indices, cantidad),
+            gravedad, arrastre
+        )
+
     def crear_explosion(self, x, y):
-        self.particulas = []
-        self.particulas_secundarias = []
+        self.particulas.vaciar()
         self.tiempo_explosion = 30  # Duración del destello inicial
         
         # Efecto de destello inicial (partículas grandes y brillantes)
-        for _ in range(15):
-            angulo = random.uniform(0, 2 * math.pi)
-            velocidad = random.uniform(1, 4)
-            velocidad_x = math.cos(angulo) * velocidad
-            velocidad_y = math.sin(angulo) * velocidad
-            color = random.choice(COLOR_DESTELLO)
-            tamaño = random.randint(10, 20)
-            vida = random.randint(10, 20)
-            self.particulas.append(Particula(x, y, color, velocidad_x, velocidad_y, vida, tamaño))
+        self._emitir_en_circulo(x, y, self._cantidad(15), (0, 2 * math.pi), (1, 4),
+                                COLOR_DESTELLO, (10, 20), (10, 20))
         
         # Partículas principales de fuego (más numerosas y variadas)
-        for _ in range(PARTICULAS_EXPLOSION):
-            angulo = random.uniform(0, 2 * math.pi)
-            velocidad = random.uniform(2, 10)  # Más variación en velocidad
-            velocidad_x = math.cos(angulo) * velocidad
-            velocidad_y = math.sin(angulo) * velocidad
-            color = random.choice(COLOR_FUEGO_EXPLOSION)
-            tamaño = random.randint(3, 8)  # Más variación en tamaño
-            vida = random.randint(20, 50)  # Más variación en vida
-            self.particulas.append(Particula(x, y, color, velocidad_x, velocidad_y, vida, tamaño))
+        self._emitir_en_circulo(x, y, self._cantidad(PARTICULAS_EXPLOSION), (0, 2 * math.pi), (2, 10),
+                                COLOR_FUEGO_EXPLOSION, (3, 8), (20, 50))
         
-        # Partículas de humo (más lentas y duraderas)
-        for _ in range(PARTICULAS_EXPLOSION_SECUNDARIAS):
-            angulo = random.uniform(0, 2 * math.pi)
-            velocidad = random.uniform(1, 3)
-            velocidad_x = math.cos(angulo) * velocidad
-            velocidad_y = math.sin(angulo) * velocidad - 0.5  # Tendencia a subir
-            color = random.choice(COLOR_HUMO_EXPLOSION)
-            tamaño = random.randint(4, 10)
-            vida = random.randint(60, 120)  # Más duradero
-            self.particulas_secundarias.append(Particula(x, y, color, velocidad_x, velocidad_y, vida, tamaño))
+        # Partículas de humo (más lentas, duraderas y frenadas por el aire)
+        self._emitir_en_circulo(x, y, self._cantidad(PARTICULAS_EXPLOSION_SECUNDARIAS), (0, 2 * math.pi),
+                                (1, 3), COLOR_HUMO_EXPLOSION, (4, 10), (60, 120), subida=0.5,
+                                gravedad=GRAVEDAD_HUMO, arrastre=ARRASTRE_HUMO)
         
         # Crear onda expansiva
         self.onda_expansion = {
             'x': x,
             'y': y,
-            'radio': 5,
+            'radio': RADIO_ONDA_INICIAL,
             'max_radio': 50,
-            'vida': 20
+            'vida': VIDA_ONDA_EXPLOSION
         }
         
         self.activo = True
 
-    def actualizar_y_dibujar(self, pantalla):
+    def actualizar(self):
+        """Avanza un paso de simulación de los efectos"""
         if not self.activo:
             return
-            
-        # Actualizar y dibujar onda expansiva
+        
+        # Actualizar onda expansiva
         if self.onda_expansion is not None:
-            self.onda_expansion['radio'] += 8
+            self.onda_expansion['radio'] += CRECIMIENTO_ONDA
             self.onda_expansion['vida'] -= 1
-            
-            if self.onda_expansion['vida'] > 0:
-                # Asegurarnos que alpha está en el rango correcto (0-255)
-                alpha = max(0, min(255, int(255 * (self.onda_expansion['vida'] / 20))))
-                # Crear color con alpha como cuarto componente
-                color_onda = (255, 200, 50, alpha)
-                
-                # Crear superficie transparente y dibujar círculo
-                surf = pygame.Surface((self.onda_expansion['radio'] * 2, self.onda_expansion['radio'] * 2), pygame.SRCALPHA)
-                pygame.draw.circle(
-                    surf, 
-                    color_onda,
-                    (self.onda_expansion['radio'], self.onda_expansion['radio']), 
-                    self.onda_expansion['radio'],
-                    3  # Grosor de la línea
-                )
-                
-                pantalla.blit(
-                    surf, 
-                    (int(self.onda_expansion['x'] - self.onda_expansion['radio']), 
-                     int(self.onda_expansion['y'] - self.onda_expansion['radio']))
-                )
-            else:
+            if self.onda_expansion['vida'] <= 0:
                 self.onda_expansion = None
         
         # Actualizar tiempo destello
         if self.tiempo_explosion > 0:
-            # Crear efecto de destello
-            surf = pygame.Surface((ANCHO, ALTO), pygame.SRCALPHA)
-            alpha = int(100 * (self.tiempo_explosion / 30))
-            surf.fill((255, 255, 200, alpha))
-            pantalla.blit(surf, (0, 0))
             self.tiempo_explosion -= 1
         
-        # Actualizar partículas primarias (fuego)
-        particulas_activas = []
-        for particula in self.particulas:
-            if particula.actualizar():
-                particulas_activas.append(particula)
-                particula.dibujar(pantalla)
-        self.particulas = particulas_activas
-        
-        # Actualizar partículas secundarias (humo)
-        particulas_secundarias_activas = []
-        for particula in self.particulas_secundarias:
-            # El humo se mueve más lento y es afectado menos por gravedad
-            particula.velocidad_y += 0.03  # Menos gravedad que las partículas de fuego
-            particula.velocidad_x *= 0.98  # Fricción del aire
-            particula.velocidad_y *= 0.98
-            
-            if particula.actualizar():
-                particulas_secundarias_activas.append(particula)
-                particula.dibujar(pantalla)
-        self.particulas_secundarias = particulas_secundarias_activas
+        # Todas las partículas (fuego, humo, brillos) en un solo paso vectorial
+        self.particulas.actualizar()
         
         # Verificar si todavía hay efectos activos
         self.activo = (
             len(self.particulas) > 0 or 
-            len(self.particulas_secundarias) > 0 or 
             self.tiempo_explosion > 0 or 
             self.onda_expansion is not None
         )
 
+    def dibujar(self, pantalla):
+        """Dibuja los efectos y devuelve los rectángulos modificados"""
+        if not self.activo:
+            return []
+        rects = []
+            
+        # Dibujar onda expansiva
+        if self.onda_expansion is not None:
+            onda = self.onda_expansion
+            # Asegurarnos que alpha está en el rango correcto (0-255)
+            alpha = max(0, min(255, int(255 * (onda['vida'] / 20))))
+            rects.append(pantalla.blit(compositor.anillo(onda['radio'], alpha),
+                                       (int(onda['x'] - onda['radio']), int(onda['y'] - onda['radio']))))
+        
+        # Efecto de destello
+        if self.tiempo_explosion > 0 and self.calidad['destello']:
+            alpha = int(100 * (self.tiempo_explosion / 30))
+            rects.append(pantalla.blit(compositor.velo(COLOR_DESTELLO_PANTALLA, alpha), (0, 0)))
+        
+        # Dibujar partículas
+        rects.append(self.particulas.dibujar(pantalla))
+        return rects
+
     def crear_efecto_exito(self, x, y):
-        self.particulas = []
-        self.particulas_secundarias = []
+        self.particulas.vaciar()
         self.tiempo_explosion = 20  # Destello más corto que la explosión
         
-        # Partículas de celebración (como fuegos artificiales)
-        for _ in range(PARTICULAS_EXITO):
-            angulo = random.uniform(-math.pi, 0)  # Solo hacia arriba
-            velocidad = random.uniform(3, 8)
-            velocidad_x = math.cos(angulo) * velocidad
-            velocidad_y = math.sin(angulo) * velocidad
-            color = random.choice(COLOR_EXITO)
-            tamaño = random.randint(2, 6)
-            vida = random.randint(40, 80)
-            self.particulas.append(Particula(x, y, color, velocidad_x, velocidad_y, vida, tamaño))
+        # Partículas de celebración (como fuegos artificiales, solo hacia arriba)
+        self._emitir_en_circulo(x, y, self._cantidad(PARTICULAS_EXITO), (-math.pi, 0), (3, 8),
+                                COLOR_EXITO, (2, 6), (40, 80))
         
-        # Partículas secundarias (brillos más pequeños)
-        for _ in range(PARTICULAS_EXITO // 2):
-            angulo = random.uniform(-math.pi, math.pi)  # En todas direcciones
-            velocidad = random.uniform(1, 3)
-            velocidad_x = math.cos(angulo) * velocidad
-            velocidad_y = math.sin(angulo) * velocidad
-            # Usar colores más brillantes para el efecto de éxito
-            color = (255, 255, 150) if random.random() > 0.5 else (150, 255, 150)
-            tamaño = random.randint(1, 3)
-            vida = random.randint(30, 60)
-            self.particulas_secundarias.append(Particula(x, y, color, velocidad_x, velocidad_y, vida, tamaño))
+        # Partículas secundarias (brillos más pequeños en todas direcciones)
+        self._emitir_en_circulo(x, y, self._cantidad(PARTICULAS_EXITO // 2), (-math.pi, math.pi), (1, 3),
+                                [(255, 255, 150), (150, 255, 150)], (1, 3), (30, 60))
         
         # Crear onda de celebración (círculos concéntricos)
         self.onda_expansion = {
             'x': x,
             'y': y,
-            'radio': 5,
+            'radio': RADIO_ONDA_INICIAL,
             'max_radio': 40,
-            'vida': 30
+            'vida': VIDA_ONDA_EXITO
         }
         
         self.activo = True
 
-class Nave:
-    def __init__(self, nivel=1):
-        # Atributos existentes
-        self.x = ANCHO // 2
-        self.y = 100
-        self.ancho = 40
-        self.alto = 60
-        self.velocidad_x = 0
-        self.velocidad_y = 0
-        self.angulo = 0
-        
-        # Ajustar valores según el nivel
-        self.nivel = nivel
-        self.fuel = FUEL_POR_NIVEL.get(nivel, 400)
-        self.gravedad = GRAVEDAD  # Usar la gravedad constante
-        self.viento_max = VIENTO_POR_NIVEL.get(nivel, 0.02)
+def dibujar_casco(pantalla, x, y, ancho, alto):
+    """Cuerpo, ventana y patas de la nave con la punta en (x, y)"""
+    puntos_nave = [
+        (x - ancho//2, y + alto),  # Base izquierda
+        (x + ancho//2, y + alto),  # Base derecha
+        (x + ancho//3, y + alto//3),  # Lateral derecho
+        (x, y),  # Punta
+        (x - ancho//3, y + alto//3),  # Lateral izquierdo
+    ]
+    pygame.draw.polygon(pantalla, COLOR_BLANCO, puntos_nave)
+    pygame.draw.polygon(pantalla, COLOR_GRIS, puntos_nave, 2)  # Borde
+    
+    # Dibujar ventana de la nave
+    centro_ventana = (x, y + alto//3)
+    radio_ventana = ancho//4
+    pygame.draw.circle(pantalla, COLOR_AZUL, centro_ventana, radio_ventana)
+    pygame.draw.circle(pantalla, COLOR_BLANCO, centro_ventana, radio_ventana, 1)
+    
+    # Dibujar patas de aterrizaje
+    pata_izq = [(x - ancho//2, y + alto),
+                (x - ancho//2 - 5, y + alto + 10)]
+    pata_der = [(x + ancho//2, y + alto),
+                (x + ancho//2 + 5, y + alto + 10)]
+    pygame.draw.lines(pantalla, COLOR_BLANCO, False, pata_izq, 2)
+    pygame.draw.lines(pantalla, COLOR_BLANCO, False, pata_der, 2)
+
+def dibujar_llamas(pantalla, x, y, ancho, alto, bits):
+    """Fuego de los propulsores encendidos en bits (ver grabacion)"""
+    propulsor, izquierda, derecha = decodificar_entrada(bits)
+    # Dibujar propulsor principal con efecto de fuego
+    if propulsor:
+        for i, color in enumerate(COLOR_FUEGO):
+            tamaño = 10 - i * 2
+            offset = i * 3
+            puntos_fuego = [
+                (x - tamaño//2, y + alto + offset),
+                (x + tamaño//2, y + alto + offset),
+                (x, y + alto + tamaño + offset)
+            ]
+            pygame.draw.polygon(pantalla, color, puntos_fuego)
+    
+    # Dibujar propulsores laterales con efecto de fuego
+    if izquierda:
+        for i, color in enumerate(COLOR_FUEGO):
+            tamaño = 8 - i * 2
+            offset = i * 2
+            puntos_fuego = [
+                (x + ancho//2 + offset, y + alto//3),
+                (x + ancho//2 + offset, y + alto//3 + tamaño),
+                (x + ancho//2 + tamaño + offset, y + alto//3 + tamaño//2)
+            ]
+            pygame.draw.polygon(pantalla, color, puntos_fuego)
+    
+    if derecha:
+        for i, color in enumerate(COLOR_FUEGO):
+            tamaño = 8 - i * 2
+            offset = i * 2
+            puntos_fuego = [
+                (x - ancho//2 - offset, y + alto//3),
+                (x - ancho//2 - offset, y + alto//3 + tamaño),
+                (x - ancho//2 - tamaño - offset, y + alto//3 + tamaño//2)
+            ]
+            pygame.draw.polygon(pantalla, color, puntos_fuego)
+
+class SpritesNave:
+    """Casco y llamas de la nave pre-rotados, cuantizados a paso_angular grados.
+
+    Cada capa se dibuja una vez con primitivas, centrada en el centro de la
+    nave, se rota con pygame.transform.rotate y se recorta a su contenido. La
+    capa 0 es el casco y las demás, una por combinación de bits de los
+    propulsores, las llamas: dibujar la nave son uno o dos blits a cualquier
+    ángulo.
+    """
+
+    def __init__(self, paso_angular=PASO_ANGULAR, ancho=40, alto=60):
+        self.ancho = ancho
+        self.alto = alto
+        self.configurar(paso_angular)
+
+    def configurar(self, paso_angular):
+        self.n_angulos = max(1, round(360 / paso_angular))
+        self.paso_angular = 360 / self.n_angulos
+        self.capas = {}  # (índice de ángulo, bits) -> (superficie, desplazamiento desde el centro)
+
+    def indice(self, angulo):
+        return round(angulo / self.paso_angular) % self.n_angulos
+
+    def capa(self, indice, bits):
+        clave = (indice, bits)
+        if clave not in self.capas:
+            lado = 2 * RADIO_SPRITE_NAVE
+            superficie = pygame.Surface((lado, lado))
+            # La punta queda alto/2 por encima del centro de giro
+            x, y = RADIO_SPRITE_NAVE, RADIO_SPRITE_NAVE - self.alto // 2
+            if bits:
+                dibujar_llamas(superficie, x, y, self.ancho, self.alto, bits)
+            else:
+                dibujar_casco(superficie, x, y, self.ancho, self.alto)
+            if indice:
+                superficie = pygame.transform.rotate(superficie, indice * self.paso_angular)
+            superficie.set_colorkey(COLOR_NEGRO)
+            caja = superficie.get_bounding_rect()
+            recorte = superficie.subsurface(caja).copy()
+            recorte.set_colorkey(COLOR_NEGRO, pygame.RLEACCEL)
+            desplazamiento = (caja.x - superficie.get_width() // 2,
+                              caja.y - superficie.get_height() // 2)
+            self.capas[clave] = (recorte, desplazamiento)
+        return self.capas[clave]
+
+    def preparar(self, angulo_maximo=ANGULO_MAXIMO):
+        """Construye todas las capas de los ángulos entre -angulo_maximo y angulo_maximo"""
+        pasos = min(int(angulo_maximo / self.paso_angular), self.n_angulos // 2)
+        for i in range(-pasos, pasos + 1):
+            for bits in range(8):
+                self.capa(i % self.n_angulos, bits)
+
+    def dibujar(self, pantalla, x, y, angulo, bits):
+        """Nave con la punta (sin girar) en (x, y); devuelve la zona dibujada"""
+        indice = self.indice(angulo)
+        centro_x, centro_y = int(x), int(y) + self.alto // 2
+        casco, (dx, dy) = self.capa(indice, 0)
+        rect = pantalla.blit(casco, (centro_x + dx, centro_y + dy))
+        if bits:
+            llamas, (dx, dy) = self.capa(indice, bits)
+            rect.union_ip(pantalla.blit(llamas, (centro_x + dx, centro_y + dy)))
+        return rect
+
+# Compartido por la nave del jugador, el fantasma y los entornos
+sprites_nave = SpritesNave()
+
+class Nave(EstadoNave):
+    def __init__(self, nivel=1, rng=random, rng_efectos=random, inclinacion=False):
+        super().__init__(nivel, inclinacion=inclinacion)
+        self.rng = rng  # Viento: debe ser el mismo rng que colocó la base
+        self.rng_efectos = rng_efectos
         
         # Nuevas propiedades
         self.sonidos = None
-        self.propulsor_activo = False
-        self.propulsor_izquierda = False
-        self.propulsor_derecha = False
-        
-        self.viento = 0
-        self.direccion_viento = 1
         self.tiempo_cambio_viento = 0
         
-        self.efectos = EfectosVisuales()
-        self.particulas_propulsor = []
+        self.efectos = EfectosVisuales(rng_efectos)
+        # Escape de los propulsores: anillo de tamaño fijo
+        self.escape = EmisorEscape(MAX_PARTICULAS_ESCAPE)
+        self.rng_escape = np.random.default_rng(rng_efectos.getrandbits(64))
+        self.colores_escape = [self.escape.indice_color(color) for color in COLOR_FUEGO]
+        self.escape_principal = 0.0  # Fracción de partícula pendiente de emitir
+        self.escape_lateral = 0.0
         
-        self.aterrizado = False
-        self.estrellado = False
-        self.tiempo_inicio = pygame.time.get_ticks()
-        self.puntuacion = 0
-        self.velocidad_final = 0
-        self.razon_accidente = ""
-        self.desglose = {}
+        # Posición del paso anterior para interpolar el dibujo
+        self.x_anterior = self.x
+        self.y_anterior = self.y
+        self.angulo_anterior = self.angulo
         
-        # Historial para radar de trayectoria
-        self.historial_posiciones = []
-        self.ultimo_registro = 0
+        # Estela de la trayectoria (anillo de posiciones muestreadas)
+        self.estela = EstelaTrayectoria()
         self.base = None  # Añadir referencia a la base
 
     def actualizar(self):
+        self.x_anterior = self.x
+        self.y_anterior = self.y
+        self.angulo_anterior = self.angulo
+        # El escape sigue disipándose aunque la nave ya haya terminado
+        self.escape.actualizar()
         if self.aterrizado or self.estrellado:
             return
         
-        if not self.aterrizado and not self.estrellado:
-            # Registrar posición cada 10 frames para el radar
-            if pygame.time.get_ticks() - self.ultimo_registro > 100:
-                if len(self.historial_posiciones) > 20:
-                    self.historial_posiciones.pop(0)
-                self.historial_posiciones.append((self.x, self.y))
-                self.ultimo_registro = pygame.time.get_ticks()
-            
-            # Actualizar viento
-            if random.random() < CAMBIO_VIENTO:
-                if abs(self.viento) >= self.viento_max:
-                    self.direccion_viento *= -1
-                self.viento += VIENTO_INCREMENTO * self.direccion_viento
-            
-            # Limitar el viento
-            self.viento = max(-self.viento_max, min(self.viento_max, self.viento))
-            
-            # Aplicar gravedad
-            self.velocidad_y += self.gravedad
-            
-            # Aplicar viento a la velocidad horizontal
-            self.velocidad_x += self.viento
-            
-            # Controles de la nave
-            if self.propulsor_activo and self.fuel > 0:
-                self.velocidad_y -= EMPUJE
-                self.fuel = max(0, self.fuel - 1)
-                
-                # Crear partículas del propulsor
-                for _ in range(2):
-                    particula = Particula(
-                        self.x + self.ancho//2,
-                        self.y + self.alto,
-                        random.choice(COLOR_FUEGO),
-                        random.uniform(-0.5, 0.5),
-                        random.uniform(2, 4),
-                        random.randint(20, 30),
-                        random.randint(2, 4)
-                    )
-                    self.particulas_propulsor.append(particula)
-                if self.sonidos:
-                    self.sonidos.reproducir_propulsor()
-            
-            # Propulsores laterales
-            if self.propulsor_izquierda and self.fuel > 0:
-                self.velocidad_x -= EMPUJE_LATERAL
-                self.fuel = max(0, self.fuel - 0.5)
-                if self.sonidos:
-                    self.sonidos.reproducir_propulsor_lateral()
-            elif self.propulsor_derecha and self.fuel > 0:
-                self.velocidad_x += EMPUJE_LATERAL
-                self.fuel = max(0, self.fuel - 0.5)
-                if self.sonidos:
-                    self.sonidos.reproducir_propulsor_lateral()
-            
-            # Actualizar posición
-            self.x += self.velocidad_x
-            self.y += self.velocidad_y
-            
-            # Mantener la nave dentro de los límites horizontales
-            if self.x < self.ancho / 2:
-                self.x = self.ancho / 2
-                self.velocidad_x = 0
-            elif self.x > ANCHO - self.ancho / 2:
-                self.x = ANCHO - self.ancho / 2
-                self.velocidad_x = 0
-            
-            # Verificar aterrizaje
-            altura_patas = 10
-            altura_base = ALTO - SUELO_ALTURA - BASE_ALTURA_SOBRE_SUELO
-
-            # Verificar si está sobre la base usando la posición actual de la base
-            sobre_base = (self.x + self.ancho > self.base.x - self.base.ancho//2 and 
-                         self.x < self.base.x + self.base.ancho//2)
-
-            if self.y + self.alto + altura_patas >= altura_base:
-                velocidad_vertical = abs(self.velocidad_y)
-                velocidad_horizontal = abs(self.velocidad_x)
-                
-                if sobre_base:
-                    # Ajustar la posición de la nave para que las patas toquen la base
-                    self.y = altura_base - self.alto - altura_patas
-                    
-                    if velocidad_vertical <= VELOCIDAD_MAXIMA_ATERRIZAJE and velocidad_horizontal <= VELOCIDAD_MAXIMA_ATERRIZAJE / 2:
-                        if not self.aterrizado:
-                            self.aterrizado = True
-                            self.efectos.crear_efecto_exito(self.x, self.y + self.alto)
-                            if self.sonidos:
-                                self.sonidos.reproducir_exito()
-                            self.tiempo_espera_puntuacion = pygame.time.get_ticks() + 1500
-                            self.velocidad_x = 0
-                            self.velocidad_y = 0
-                        else:
-                            self.estrellado = True
-                            self.razon_accidente = "¡Fuera de la zona de aterrizaje!"
-                            if self.sonidos:
-                                self.sonidos.reproducir_explosion()  # Reproducir sonido de explosión
-                    else:
-                        if not self.estrellado:  # Solo reproducir el sonido una vez
-                            self.estrellado = True
-                            if self.sonidos:
-                                self.sonidos.reproducir_explosion()
-                            self.razon_accidente = f"¡Velocidad excesiva! V: {velocidad_vertical:.1f} H: {velocidad_horizontal:.1f}"
-                else:
-                    self.estrellado = True
-                    self.razon_accidente = "¡Fuera de la zona de aterrizaje!"
-                    if self.sonidos:
-                        self.sonidos.reproducir_explosion()  # Reproducir sonido de explosión
-            
-            # Luego verificar colisión con el suelo
-            elif self.y + self.alto + altura_patas >= ALTO - 50:  # Verificar con la parte inferior de la nave
-                self.estrellado = True
-                self.velocidad_final = (self.velocidad_x ** 2 + self.velocidad_y ** 2) ** 0.5
-                
-                # Asignar una distancia_centro predeterminada para evitar errores
-                self.distancia_centro = ANCHO  # Un valor grande (fuera de la base)
-                
-                # Razón del accidente
-                self.razon_accidente = "¡Aterrizaje fuera de la base!"
-                
-                self.velocidad_x = 0
-                self.velocidad_y = 0
-            
-            # Actualizar partículas del propulsor
-            particulas_activas = []
-            for particula in self.particulas_propulsor:
-                if particula.actualizar():
-                    particulas_activas.append(particula)
-            self.particulas_propulsor = particulas_activas
-        else:
-            pass
-
-    def calcular_puntuacion(self):
-        if self.estrellado:
-            self.puntuacion = 0
-            self.desglose = {
-                'base': 0,
-                'velocidad': 0,
-                'fuel': 0,
-                'tiempo': 0,
-                'precisión': 0  # Añadir esto para evitar KeyError
-            }
-            return  # Importante: retornar aquí para evitar ejecutar el resto
+        # Muestra de la posición para la estela (cada estela.intervalo pasos)
+        self.estela.muestrear(self.pasos, self.x, self.y)
         
-        # Si llegamos aquí, la nave aterrizó con éxito
-        tiempo_transcurrido = (pygame.time.get_ticks() - self.tiempo_inicio) / 1000
+        # Física compartida con la simulación sin pantalla
+        self.base_x = self.base.x
+        self.avanzar(rng=self.rng)
         
-        # Puntuación base
-        puntos_base = 500
-        
-        # Bonus por velocidad
-        if self.velocidad_final < 0.5:
-            bonus_velocidad = 1000
-        elif self.velocidad_final < 1.0:
-            bonus_velocidad = 800
-        elif self.velocidad_final < 1.5:
-            bonus_velocidad = 500
-        else:
-            bonus_velocidad = 200
+        self.emitir_escape()
+        if self.empuje_principal and self.sonidos:
+            self.sonidos.reproducir_propulsor()
         
-        # Bonus por combustible
-        porcentaje_fuel = (self.fuel / FUEL_POR_NIVEL.get(self.nivel, 400))
-        bonus_fuel = int(1000 * (porcentaje_fuel ** 2))
+        if self.empuje_lateral and self.sonidos:
+            self.sonidos.reproducir_propulsor_lateral()
         
-        # Bonus por tiempo
-        if tiempo_transcurrido < 20:
-            bonus_tiempo = 500
-        elif tiempo_transcurrido < 30:
-            bonus_tiempo = 300
-        elif tiempo_transcurrido < 40:
-            bonus_tiempo = 100
-        else:
-            bonus_tiempo = max(0, int(500 - (tiempo_transcurrido - 20) * 10))
-        
-        # Bonus por precisión (con verificación adicional)
-        try:
-            if hasattr(self, 'distancia_centro'):
-                precision = 1 - min(1.0, (self.distancia_centro / (BASE_ANCHO//2)))
-                bonus_precision = int(1000 * (precision ** 2))
-            else:
-                # Si no tenemos información de distancia, asumimos precisión media
-                bonus_precision = 500
-        except:
-            # En caso de cualquier error, asignar un valor seguro
-            bonus_precision = 500
-        
-        self.puntuacion = puntos_base + bonus_velocidad + bonus_fuel + bonus_tiempo + bonus_precision
-        
-        self.desglose = {
-            'base': puntos_base,
-            'velocidad': bonus_velocidad,
-            'fuel': bonus_fuel,
-            'tiempo': bonus_tiempo,
-            'precisión': bonus_precision
-        }
+        if self.aterrizado:
+            self.efectos.crear_efecto_exito(self.x, self.y + self.alto)
+            if self.sonidos:
+                self.sonidos.reproducir_exito()
+            self.tiempo_espera_puntuacion = pygame.time.get_ticks() + ESPERA_PUNTUACION
+        elif self.estrellado and self.sonidos:
+            self.sonidos.reproducir_explosion()
 
-    def dibujar(self):
-        # Dibujar cuerpo principal de la nave
-        puntos_nave = [
-            (self.x - self.ancho//2, self.y + self.alto),  # Base izquierda
-            (self.x + self.ancho//2, self.y + self.alto),  # Base derecha
-            (self.x + self.ancho//3, self.y + self.alto//3),  # Lateral derecho
-            (self.x, self.y),  # Punta
-            (self.x - self.ancho//3, self.y + self.alto//3),  # Lateral izquierdo
-        ]
-        pygame.draw.polygon(pantalla, COLOR_BLANCO, puntos_nave)
-        pygame.draw.polygon(pantalla, COLOR_GRIS, puntos_nave, 2)  # Borde
+    def emitir_escape(self):
+        """Partículas de escape proporcionales al empuje y con la velocidad de la nave"""
+        rng = self.rng_escape
+        factor = PARTICULAS_POR_EMPUJE * self.efectos.calidad['particulas']
         
-        # Dibujar ventana de la nave
-        centro_ventana = (self.x, self.y + self.alto//3)
-        radio_ventana = self.ancho//4
-        pygame.draw.circle(pantalla, COLOR_AZUL, centro_ventana, radio_ventana)
-        pygame.draw.circle(pantalla, COLOR_BLANCO, centro_ventana, radio_ventana, 1)
+        # Las toberas se colocan respecto al centro de la nave y giran con ella
+        centro_y = self.y + self.alto / 2
         
-        # Dibujar patas de aterrizaje
-        pata_izq = [(self.x - self.ancho//2, self.y + self.alto),
-                    (self.x - self.ancho//2 - 5, self.y + self.alto + 10)]
-        pata_der = [(self.x + self.ancho//2, self.y + self.alto),
-                    (self.x + self.ancho//2 + 5, self.y + self.alto + 10)]
-        pygame.draw.lines(pantalla, COLOR_BLANCO, False, pata_izq, 2)
-        pygame.draw.lines(pantalla, COLOR_BLANCO, False, pata_der, 2)
+        if self.empuje_principal:
+            self.escape_principal += EMPUJE * factor
+            cantidad = int(self.escape_principal)
+            self.escape_principal -= cantidad
+            if cantidad:
+                dx, dy = self._girar(rng.uniform(-3, 3, cantidad), self.alto / 2 + 5)
+                vx, vy = self._girar(rng.uniform(-0.5, 0.5, cantidad), rng.uniform(2, 4, cantidad))
+                self.escape.emitir(
+                    self.x + dx,
+                    centro_y + dy,
+                    self.velocidad_x + vx,
+                    self.velocidad_y + vy,
+                    rng.integers(20, 30, cantidad, endpoint=True),
+                    rng.integers(2, 4, cantidad, endpoint=True),
+                    rng.choice(self.colores_escape, cantidad),
+                    GRAVEDAD_ESCAPE, ARRASTRE_ESCAPE
+                )
         
+        if self.empuje_lateral:
+            # El gas sale por el lado contrario al empuje (la izquierda tiene prioridad)
+            lado = 1 if self.propulsor_izquierda else -1
+            self.escape_lateral += EMPUJE_LATERAL * factor
+            cantidad = int(self.escape_lateral)
+            self.escape_lateral -= cantidad
+            if cantidad:
+                dx, dy = self._girar(lado * (self.ancho//2 + 4),
+                                     self.alto//3 + 4 - self.alto / 2 + rng.uniform(-2, 2, cantidad))
+                vx, vy = self._girar(lado * rng.uniform(2, 3, cantidad), rng.uniform(-0.3, 0.3, cantidad))
+                self.escape.emitir(
+                    self.x + dx,
+                    centro_y + dy,
+                    self.velocidad_x + vx,
+                    self.velocidad_y + vy,
+                    rng.integers(10, 15, cantidad, endpoint=True),
+                    rng.integers(1, 3, cantidad, endpoint=True),
+                    rng.choice(self.colores_escape, cantidad),
+                    GRAVEDAD_ESCAPE, ARRASTRE_ESCAPE
+                )
+
+    def _girar(self, dx, dy):
+        """Vector del sistema de la nave sin girar al de la pantalla"""
+        if not self.angulo:
+            return dx, dy
+        c, s = cos(radians(self.angulo)), sin(radians(self.angulo))
+        return dx * c + dy * s, dy * c - dx * s
+
+    def posicion_interpolada(self, alfa):
+        """Posición entre el paso anterior y el actual (alfa en [0, 1])"""
+        return (self.x_anterior + (self.x - self.x_anterior) * alfa,
+                self.y_anterior + (self.y - self.y_anterior) * alfa)
+
+    def dibujar(self, pantalla, alfa=None):
+        # Sin alfa se dibuja en la posición actual, sin interpolar
+        if alfa is None:
+            x, y, angulo = self.x, self.y, self.angulo
+        else:
+            x, y = self.posicion_interpolada(alfa)
+            angulo = self.angulo_anterior + (self.angulo - self.angulo_anterior) * alfa
+        bits = 0
         if self.fuel > 0:
-            # Dibujar propulsor principal con efecto de fuego
-            if self.propulsor_activo:
-                for i, color in enumerate(COLOR_FUEGO):
-                    tamaño = 10 - i * 2
-                    offset = i * 3
-                    puntos_fuego = [
-                        (self.x - tamaño//2, self.y + self.alto + offset),
-                        (self.x + tamaño//2, self.y + self.alto + offset),
-                        (self.x, self.y + self.alto + tamaño + offset)
-                    ]
-                    pygame.draw.polygon(pantalla, color, puntos_fuego)
-            
-            # Dibujar propulsores laterales con efecto de fuego
-            if self.propulsor_izquierda:
-                for i, color in enumerate(COLOR_FUEGO):
-                    tamaño = 8 - i * 2
-                    offset = i * 2
-                    puntos_fuego = [
-                        (self.x + self.ancho//2 + offset, self.y + self.alto//3),
-                        (self.x + self.ancho//2 + offset, self.y + self.alto//3 + tamaño),
-                        (self.x + self.ancho//2 + tamaño + offset, self.y + self.alto//3 + tamaño//2)
-                    ]
-                    pygame.draw.polygon(pantalla, color, puntos_fuego)
-            
-            if self.propulsor_derecha:
-                for i, color in enumerate(COLOR_FUEGO):
-                    tamaño = 8 - i * 2
-                    offset = i * 2
-                    puntos_fuego = [
-                        (self.x - self.ancho//2 - offset, self.y + self.alto//3),
-                        (self.x - self.ancho//2 - offset, self.y + self.alto//3 + tamaño),
-                        (self.x - self.ancho//2 - tamaño - offset, self.y + self.alto//3 + tamaño//2)
-                    ]
-                    pygame.draw.polygon(pantalla, color, puntos_fuego)
+            bits = codificar_entrada(self.propulsor_activo, self.propulsor_izquierda,
+                                     self.propulsor_derecha)
+        return sprites_nave.dibujar(pantalla, x, y, angulo, bits)
+
+class SpriteFantasma:
+    """Copias translúcidas de Nave.dibujar, una por combinación de propulsores"""
+    MARGEN_X = MARGEN_DIBUJO_NAVE
+    MARGEN_Y = 2
+
+    def __init__(self):
+        self.sprites = {}
+
+    def sprite(self, bits):
+        if bits not in self.sprites:
+            modelo = EstadoNave()
+            modelo.x, modelo.y = self.MARGEN_X, self.MARGEN_Y
+            modelo.fuel = 1
+            (modelo.propulsor_activo, modelo.propulsor_izquierda,
+             modelo.propulsor_derecha) = decodificar_entrada(bits)
+            superficie = pygame.Surface((2 * self.MARGEN_X, modelo.alto + 16))
+            superficie.set_colorkey(COLOR_NEGRO)
+            Nave.dibujar(modelo, superficie)
+            superficie.set_alpha(ALFA_FANTASMA)
+            self.sprites[bits] = superficie
+        return self.sprites[bits]
+
+    def dibujar(self, pantalla, fantasma, paso, alfa=1.0):
+        """Un solo blit: el fantasma interpolado entre los pasos paso-1 y paso"""
+        x_anterior, y_anterior, _ = fantasma.registro(paso - 1)
+        x, y, bits = fantasma.registro(paso)
+        x = x_anterior + (x - x_anterior) * alfa
+        y = y_anterior + (y - y_anterior) * alfa
+        return pantalla.blit(self.sprite(bits), (x - self.MARGEN_X, y - self.MARGEN_Y))
 
 class SistemaPuntuacion:
     def __init__(self):
@@ -722,19 +797,24 @@ class SistemaPuntuacion:
             if puntuacion >= puntos:
                 return mejora
 
-def dibujar_suelo():
+def dibujar_suelo(pantalla):
     pygame.draw.rect(pantalla, COLOR_BLANCO, (0, ALTO - 50, ANCHO, 50))
 
-def dibujar_hud(nave):
-    fuente = pygame.font.Font(None, 36)
-    
+def dibujar_campo(pantalla, posicion, rotulo, numero, color, sufijo=""):
+    """Rótulo y sufijo desde la caché de textos, número desde el atlas de glifos"""
+    x, y = posicion
+    superficie = texto(rotulo, TAMAÑO_HUD, color)
+    rect = pantalla.blit(superficie, (x, y))
+    rect.union_ip(ATLAS_HUD.dibujar(pantalla, numero, (rect.right, y), color))
+    if sufijo:
+        rect.union_ip(pantalla.blit(texto(sufijo, TAMAÑO_HUD, color), (rect.right, y)))
+    return rect
+
+def dibujar_hud(pantalla, nave):
     # Color basado en la velocidad (rojo si es peligrosa)
     color_vel_y = COLOR_ROJO if abs(nave.velocidad_y) > VELOCIDAD_MAXIMA_ATERRIZAJE else COLOR_BLANCO
     color_vel_x = COLOR_ROJO if abs(nave.velocidad_x) > VELOCIDAD_MAXIMA_ATERRIZAJE/2 else COLOR_BLANCO
     
-    texto_vel_y = fuente.render(f"Velocidad V: {abs(nave.velocidad_y):.1f}", True, color_vel_y)
-    texto_vel_x = fuente.render(f"Velocidad H: {abs(nave.velocidad_x):.1f}", True, color_vel_x)
-    
     # Color para combustible basado en la cantidad restante
     fuel_ratio = nave.fuel / FUEL_POR_NIVEL[nave.nivel]
     if fuel_ratio > 0.5:
@@ -744,11 +824,17 @@ def dibujar_hud(nave):
     else:
         color_fuel = COLOR_ROJO
     
-    texto_fuel = fuente.render(f"Fuel: {nave.fuel}", True, color_fuel)
+    # Nivel actual
+    rects = [pantalla.blit(texto(f"Nivel: {nave.nivel}", TAMAÑO_HUD, COLOR_AMARILLO), (ANCHO - 150, 50))]
+    
+    rects.append(dibujar_campo(pantalla, (10, 10), "Velocidad V: ", f"{abs(nave.velocidad_y):.1f}", color_vel_y))
+    rects.append(dibujar_campo(pantalla, (10, 50), "Velocidad H: ", f"{abs(nave.velocidad_x):.1f}", color_vel_x))
+    rects.append(dibujar_campo(pantalla, (10, 90), "Fuel: ", str(nave.fuel), color_fuel))
     
     # Texto para el viento
     if abs(nave.viento) < 0.005:
-        texto_viento = fuente.render(f"Viento: {nave.viento:.3f} (Calma)", True, COLOR_BLANCO)
+        rects.append(dibujar_campo(pantalla, (10, 130), "Viento: ", f"{nave.viento:.3f}",
+                                   COLOR_BLANCO, " (Calma)"))
     else:
         direccion = " ←" if nave.viento < 0 else " →"
         intensidad = abs(nave.viento) / nave.viento_max
@@ -762,37 +848,51 @@ def dibujar_hud(nave):
             texto_intensidad = "Suave"
             color_viento = COLOR_BLANCO
         
-        texto_viento = fuente.render(f"Viento: {abs(nave.viento):.3f} {texto_intensidad}{direccion}", True, color_viento)
-    
-    # Nivel actual
-    texto_nivel = fuente.render(f"Nivel: {nave.nivel}", True, COLOR_AMARILLO)
-    pantalla.blit(texto_nivel, (ANCHO - 150, 50))
-    
-    pantalla.blit(texto_vel_y, (10, 10))
-    pantalla.blit(texto_vel_x, (10, 50))
-    pantalla.blit(texto_fuel, (10, 90))
-    pantalla.blit(texto_viento, (10, 130))
-    
-    # Mostrar radar de trayectoria
-    if len(nave.historial_posiciones) > 1:
-        for i in range(1, len(nave.historial_posiciones)):
-            pos_ant = nave.historial_posiciones[i-1]
-            pos_act = nave.historial_posiciones[i]
-            # Color que se desvanece con el tiempo
-            alpha = int(255 * (i / len(nave.historial_posiciones)))
-            pygame.draw.line(pantalla, (100, 100, 255, alpha), pos_ant, pos_act, 1)
+        rects.append(dibujar_campo(pantalla, (10, 130), "Viento: ", f"{abs(nave.viento):.3f}",
+                                   color_viento, f" {texto_intensidad}{direccion}"))
     
     # Dibujar indicador de zona segura si está activado
     if INDICADOR_ATERRIZAJE and not nave.aterrizado and not nave.estrellado:
         # Usar la posición actual de la base
-        pygame.draw.rect(pantalla, COLOR_VERDE,
+        rects.append(pygame.draw.rect(pantalla, COLOR_VERDE,
                         (nave.base.x - BASE_ANCHO//2, ALTO - SUELO_ALTURA - BASE_ALTURA_SOBRE_SUELO - 5,
-                         BASE_ANCHO, 5), 1)
+                         BASE_ANCHO, 5), 1))
+
+    if INDICADOR_PREDICCION:
+        rects.extend(dibujar_prediccion(pantalla, nave))
+    return rects  # Zonas modificadas, para el modo de rectángulos sucios
 
-def mostrar_pantalla_inicio():
+def dibujar_prediccion(pantalla, nave):
+    """Marca el punto de contacto previsto con los controles actuales"""
+    prediccion = predecir_contacto(nave)
+    if prediccion is None:
+        return []
+
+    # Verde: aterrizaje seguro; amarillo: sobre la base pero demasiado rápido; rojo: fuera
+    if prediccion['seguro']:
+        color = COLOR_VERDE
+    elif prediccion['sobre_base']:
+        color = COLOR_AMARILLO
+    else:
+        color = COLOR_ROJO
+
+    x = int(prediccion['x'])
+    y = ALTO - SUELO_ALTURA - BASE_ALTURA_SOBRE_SUELO
+    rects = [
+        pygame.draw.line(pantalla, color, (x - nave.ancho//2, y), (x + nave.ancho//2, y), 2),
+        pygame.draw.polygon(pantalla, color, [(x, y - 2), (x - 6, y - 12), (x + 6, y - 12)])
+    ]
+    etiqueta = f"{prediccion['segundos']:.1f}s V:{abs(prediccion['velocidad_y']):.1f}"
+    rect_texto = pygame.Rect(0, 0, ATLAS_HUD.ancho(etiqueta), fuente(TAMAÑO_HUD).get_height())
+    rect_texto.midbottom = (x, y - 14)
+    rect_texto.clamp_ip(pantalla.get_rect())
+    rects.append(ATLAS_HUD.dibujar(pantalla, etiqueta, rect_texto.topleft, color))
+    return rects
+
+def mostrar_pantalla_inicio(inclinacion=False):
     pantalla.fill((0, 0, 0))  # Fondo negro
-    fuente_grande = pygame.font.Font(None, 74)
-    fuente_pequeña = pygame.font.Font(None, 36)
+    fuente_grande = fuente(74)
+    fuente_pequeña = fuente(36)
     
     # Título
     titulo = fuente_grande.render("ATERRIZAJE LUNAR", True, COLOR_BLANCO)
@@ -801,12 +901,12 @@ def mostrar_pantalla_inicio():
     # Instrucciones
     instrucciones = [
         "Presiona ESPACIO para usar el propulsor",
-        "← y → para mover lateralmente",
+        "← y → para inclinar la nave" if inclinacion else "← y → para mover lateralmente",
         "¡Cuidado con el viento!"
     ]
     
-    for i, texto in enumerate(instrucciones):
-        instr = fuente_pequeña.render(texto, True, COLOR_BLANCO)
+    for i, linea in enumerate(instrucciones):
+        instr = fuente_pequeña.render(linea, True, COLOR_BLANCO)
         rect_instr = instr.get_rect(center=(ANCHO//2, ALTO//2 + i*30))
         pantalla.blit(instr, rect_instr)
     
@@ -815,12 +915,12 @@ def mostrar_pantalla_inicio():
     
     pantalla.blit(titulo, rect_titulo)
     pantalla.blit(mensaje, rect_mensaje)
-    pygame.display.flip()
+    ventana.presentar()
 
 def mostrar_tabla_records(tablero):
     pantalla.fill((0, 0, 0))
-    fuente_grande = pygame.font.Font(None, 74)
-    fuente_pequeña = pygame.font.Font(None, 36)
+    fuente_grande = fuente(74)
+    fuente_pequeña = fuente(36)
     
     # Título
     titulo = fuente_grande.render("TOP 10 PUNTUACIONES", True, COLOR_AMARILLO)
@@ -841,13 +941,13 @@ def mostrar_tabla_records(tablero):
     rect_mensaje = mensaje.get_rect(center=(ANCHO//2, ALTO - 50))
     pantalla.blit(mensaje, rect_mensaje)
     
-    pygame.display.flip()
+    ventana.presentar()
 
-def mostrar_seleccion_nivel(sonidos):
+def mostrar_seleccion_nivel():
     pantalla.fill((0, 0, 0))
-    fuente_grande = pygame.font.Font(None, 60)
-    fuente_mediana = pygame.font.Font(None, 48)
-    fuente_pequeña = pygame.font.Font(None, 36)
+    fuente_grande = fuente(60)
+    fuente_mediana = fuente(48)
+    fuente_pequeña = fuente(36)
     
     titulo = fuente_grande.render("SELECCIÓN DE NIVEL", True, COLOR_AMARILLO)
     rect_titulo = titulo.get_rect(center=(ANCHO//2, 80))
@@ -883,64 +983,360 @@ def mostrar_seleccion_nivel(sonidos):
     rect_instr = instrucciones.get_rect(center=(ANCHO//2, ALTO - 50))
     pantalla.blit(instrucciones, rect_instr)
     
-    pygame.display.flip()
+    ventana.presentar()
+
+def dibujar_resultados(pantalla, nave, records, es_top10=False, posicion_top=0):
+    """Pantalla de resultados sobre el último frame; records son las mejores puntuaciones"""
+    fuente_grande = fuente(84)
+    fuente_normal = fuente(48)
+    fuente_pequeña = fuente(36)
     
-    nivel_seleccionado = 1
-    seleccionando = True
-    while seleccionando:
-        for evento in pygame.event.get():
-            if evento.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if evento.type == pygame.KEYDOWN:
-                if evento.key in [pygame.K_1, pygame.K_2, pygame.K_3]:
-                    nivel_seleccionado = int(pygame.key.name(evento.key))
-                    sonidos.reproducir_inicio()  # Reproducir sonido al seleccionar nivel
-                    seleccionando = False
-                elif evento.key == pygame.K_ESCAPE:
-                    pygame.quit()
-                    sys.exit()
+    # Crear superficie semitransparente para el fondo
+    # Un poco más oscuro para mejor contraste
+    pantalla.blit(compositor.velo(COLOR_NEGRO, 160), (0, 0))
+    
+    # Mensaje principal y puntuación
+    if nave.aterrizado:
+        mensaje = "¡ATERRIZAJE EXITOSO!"
+        mensaje_puntos = f"Puntuación Total: {nave.puntuacion}"
+        color_mensaje = COLOR_VERDE
+    else:
+        mensaje = "¡ESTRELLADO!"
+        mensaje_puntos = "Puntuación: 0"
+        color_mensaje = COLOR_ROJO
+    
+    # Dibujar mensaje principal
+    texto = fuente_grande.render(mensaje, True, color_mensaje)
+    rect_texto = texto.get_rect(center=(ANCHO//2, ALTO//5))  # Más arriba
+    pantalla.blit(texto, rect_texto)
+    
+    # Dibujar puntuación total
+    texto_puntos = fuente_normal.render(mensaje_puntos, True, COLOR_AMARILLO)
+    rect_puntos = texto_puntos.get_rect(center=(ANCHO//2, ALTO//5 + 70))  # Ajustado
+    pantalla.blit(texto_puntos, rect_puntos)
+    
+    # Mostrar mensaje si entró al top 10
+    if es_top10:
+        mensaje_top = fuente_normal.render(f"¡TOP 10! - Posición #{posicion_top}", True, COLOR_VERDE)
+        rect_top = mensaje_top.get_rect(center=(ANCHO//2, ALTO//5 + 140))  # Más separado
+        pantalla.blit(mensaje_top, rect_top)
+    
+    # Columna izquierda: Desglose de puntuación o mensaje de error
+    if nave.aterrizado:
+        x_desglose = ANCHO//4 - 50
+        y_desglose = ALTO//2
+        
+        titulo_desglose = fuente_pequeña.render("DESGLOSE", True, COLOR_AMARILLO)
+        rect_titulo = titulo_desglose.get_rect(center=(x_desglose, y_desglose))
+        pantalla.blit(titulo_desglose, rect_titulo)
+        
+        for i, (concepto, puntos) in enumerate(nave.desglose.items()):
+            texto = f"{concepto.capitalize()}: {puntos}"
+            linea = fuente_pequeña.render(texto, True, COLOR_BLANCO)
+            rect_linea = linea.get_rect(center=(x_desglose, y_desglose + 40 + i * 35))
+            pantalla.blit(linea, rect_linea)
+    else:
+        # Mejor posicionamiento para el mensaje de accidente
+        y_razon = ALTO//5 + 180  # Más espacio debajo del mensaje principal
+        
+        # Dividir razón de accidente en dos líneas si es necesario
+        if len(nave.razon_accidente) > 30:
+            mitad = nave.razon_accidente.find(" ", len(nave.razon_accidente)//2)
+            if mitad == -1:  # Si no hay espacios, dividir en mitad
+                mitad = len(nave.razon_accidente)//2
+            
+            texto_razon1 = fuente_normal.render(nave.razon_accidente[:mitad], True, COLOR_ROJO)
+            texto_razon2 = fuente_normal.render(nave.razon_accidente[mitad:], True, COLOR_ROJO)
+            
+            rect_razon1 = texto_razon1.get_rect(center=(ANCHO//2, y_razon))
+            rect_razon2 = texto_razon2.get_rect(center=(ANCHO//2, y_razon + 50))
+            
+            pantalla.blit(texto_razon1, rect_razon1)
+            pantalla.blit(texto_razon2, rect_razon2)
+        else:
+            texto_razon = fuente_normal.render(nave.razon_accidente, True, COLOR_ROJO)
+            rect_razon = texto_razon.get_rect(center=(ANCHO//2, y_razon))
+            pantalla.blit(texto_razon, rect_razon)
+        
+        # Información adicional sobre el accidente
+        if hasattr(nave, 'velocidad_final'):
+            y_info = y_razon + (100 if len(nave.razon_accidente) > 30 else 60)
+            
+            vel_total = fuente_pequeña.render(f"Velocidad final: {nave.velocidad_final:.1f}", True, COLOR_BLANCO)
+            vel_vert = fuente_pequeña.render(f"Velocidad vertical: {abs(nave.velocidad_y):.1f}", True, COLOR_BLANCO)
+            vel_horiz = fuente_pequeña.render(f"Velocidad horizontal: {abs(nave.velocidad_x):.1f}", True, COLOR_BLANCO)
+            
+            pantalla.blit(vel_total, vel_total.get_rect(center=(ANCHO//2, y_info)))
+            pantalla.blit(vel_vert, vel_vert.get_rect(center=(ANCHO//2, y_info + 35)))
+            pantalla.blit(vel_horiz, vel_horiz.get_rect(center=(ANCHO//2, y_info + 70)))
+    
+    # Columna derecha: TOP 10 (solo en caso de aterrizaje exitoso)
+    if nave.aterrizado:
+        x_records = ANCHO * 3//4 + 50  # Más a la derecha
+        y_records = ALTO//2
+        
+        titulo_top = fuente_pequeña.render("MEJORES PUNTUACIONES", True, COLOR_AMARILLO)
+        rect_top = titulo_top.get_rect(center=(x_records, y_records))
+        pantalla.blit(titulo_top, rect_top)
+        
+        # Limitamos a mostrar solo 8 puntuaciones para evitar sobreposiciones
+        for i, record in enumerate(records[:8], 1):
+            texto = f"{i}. {record['puntuacion']} pts"
+            
+            # Destacar la nueva puntuación
+            if es_top10 and i == posicion_top:
+                color = COLOR_VERDE
+                texto += " ← ¡NUEVO!"
+            else:
+                color = COLOR_AMARILLO if i == 1 else COLOR_BLANCO
+                
+            linea = fuente_pequeña.render(texto, True, color)
+            rect_linea = linea.get_rect(center=(x_records, y_records + 40 + i * 30))
+            pantalla.blit(linea, rect_linea)
     
-    return nivel_seleccionado
+    # Mensaje para continuar en la parte inferior
+    mensaje_continuar = fuente_pequeña.render("Presiona ESPACIO para continuar", True, COLOR_VERDE)
+    rect_continuar = mensaje_continuar.get_rect(center=(ANCHO//2, ALTO - 40))
+    pantalla.blit(mensaje_continuar, rect_continuar)
+
+class PilotoTeclado(Piloto):
+    """Convierte las teclas del jugador en la entrada de la nave"""
+    nombre = "teclado"
+
+    def __init__(self):
+        self.propulsor = False
+        self.izquierda = False
+        self.derecha = False
+
+    def reiniciar(self, rng):
+        self.propulsor = self.izquierda = self.derecha = False
 
-def main():
+    def procesar_evento(self, evento):
+        if evento.type in (pygame.KEYDOWN, pygame.KEYUP):
+            pulsada = evento.type == pygame.KEYDOWN
+            if evento.key == pygame.K_SPACE:
+                self.propulsor = pulsada
+            elif evento.key == pygame.K_LEFT:
+                self.izquierda = pulsada
+            elif evento.key == pygame.K_RIGHT:
+                self.derecha = pulsada
+
+    def decidir(self, nave):
+        return self.propulsor, self.izquierda, self.derecha
+
+def seleccionar_partida(sonidos, inclinacion=False):
+    """Pantalla de inicio y selección de nivel; devuelve el nivel elegido"""
+    def salir():
+        sonidos.detener_todos()
+        pygame.quit()
+        sys.exit()
+
+    def evento_inicio(evento):
+        if evento.type == pygame.QUIT:
+            salir()
+        if evento.type == pygame.KEYDOWN:
+            if evento.key == pygame.K_RETURN:
+                sonidos.reproducir_inicio()
+                return True
+            elif evento.key == pygame.K_ESCAPE:
+                salir()
+        return None
+
+    def evento_nivel(evento):
+        if evento.type == pygame.QUIT:
+            salir()
+        if evento.type == pygame.KEYDOWN:
+            if evento.key in [pygame.K_1, pygame.K_2, pygame.K_3]:
+                sonidos.reproducir_inicio()  # Reproducir sonido al seleccionar nivel
+                return int(pygame.key.name(evento.key))
+            elif evento.key == pygame.K_ESCAPE:
+                salir()
+        return None
+
+    # Pantallas estáticas: se espera a los eventos sin gastar CPU
+    ejecutar_pantalla("inicio", evento_inicio, lambda: mostrar_pantalla_inicio(inclinacion))
+    return ejecutar_pantalla("seleccion_nivel", evento_nivel, mostrar_seleccion_nivel)
+
+def iniciar_pantalla(escala=1.0, pantalla_completa=False, escalado='sdl'):
+    """Crea la ventana del juego; se dibuja siempre en la superficie lógica de ANCHO x ALTO"""
+    global pantalla, ventana
+    ventana = Ventana((ANCHO, ALTO), escala, pantalla_completa, escalado)
+    pantalla = ventana.abrir("Aterrizaje Lunar")
+    compositor.preparar()
+    cargar_fuentes()
+    return pantalla
+
+def dibujar_depuracion(pantalla, gobernador, nave, fuente, sucios=None):
+    """Panel de depuración (F3): nivel de calidad y tiempos de frame"""
+    lineas = [
+        f"Calidad: {gobernador.nivel['nombre']}" + ("" if gobernador.adaptativo else " (fija)"),
+        f"Frame: {gobernador.media_ms:.1f} / {gobernador.presupuesto_ms:.1f} ms",
+        f"FPS: {reloj.get_fps():.0f}",
+        f"Partículas: {len(nave.efectos.particulas)} + escape {len(nave.escape)}",
+    ]
+    if sucios is not None:
+        total = sucios.frames_parciales + sucios.frames_completos
+        lineas.append(f"Parciales: {sucios.frames_parciales / total if total else 0:.0%}")
+    rects = []
+    for i, linea in enumerate(lineas):
+        texto = fuente.render(linea, True, COLOR_AMARILLO)
+        rects.append(pantalla.blit(texto, (ANCHO - 220, 90 + i * 20)))
+    return rects
+
+class SuperposicionPerfil:
+    """Superposición del perfilador (F4): gráfica del tiempo de frame y desglose por fases"""
+    ANCHO_PANEL = 300
+    ALTO_GRAFICA = 70
+    FRAMES_GRAFICA = 150
+    ALTO_LINEA = 17
+    REFRESCO = 30  # Frames entre recálculos de las estadísticas
+    COLUMNAS = (('media', 130), ('p95', 190), ('p99', 250))
+
+    def __init__(self, perfilador, presupuesto_ms):
+        self.perfilador = perfilador
+        self.presupuesto_ms = presupuesto_ms
+        self.atlas = AtlasGlifos(20)
+        self.estadisticas = {}
+        self.frames = 0
+        alto = self.ALTO_GRAFICA + (len(perfilador.fases) + 2) * self.ALTO_LINEA + 10
+        self.panel = pygame.Surface((self.ANCHO_PANEL, alto))
+        self.panel.set_alpha(170)
+
+    def dibujar(self, pantalla, posicion=(10, 170)):
+        if self.frames % self.REFRESCO == 0:
+            self.estadisticas = self.perfilador.estadisticas()
+        self.frames += 1
+        x, y = posicion
+        rect = pantalla.blit(self.panel, posicion)
+
+        # Gráfica: tiempo de trabajo de cada frame; la línea del presupuesto a media altura
+        escala = self.ALTO_GRAFICA / (2 * self.presupuesto_ms)
+        fondo_grafica = y + self.ALTO_GRAFICA
+        pygame.draw.line(pantalla, COLOR_AMARILLO, (x, fondo_grafica - self.ALTO_GRAFICA // 2),
+                         (x + self.ANCHO_PANEL, fondo_grafica - self.ALTO_GRAFICA // 2))
+        recientes = self.perfilador.recientes(self.FRAMES_GRAFICA)
+        if len(recientes) > 1:
+            totales = recientes.sum(axis=1) - recientes[:, self.perfilador.indices['espera']]
+            alturas = np.minimum(totales * escala, self.ALTO_GRAFICA)
+            paso_x = self.ANCHO_PANEL / self.FRAMES_GRAFICA
+            puntos = [(x + i * paso_x, fondo_grafica - h) for i, h in enumerate(alturas.tolist())]
+            pygame.draw.lines(pantalla, COLOR_VERDE, False, puntos)
+
+        # Desglose: nombres desde la caché de textos, números desde el atlas
+        y_linea = fondo_grafica + 5
+        for nombre, columna in self.COLUMNAS:
+            pantalla.blit(texto(nombre, 20, COLOR_AMARILLO), (x + columna, y_linea))
+        for fase in self.perfilador.fases + ('total',):
+            y_linea += self.ALTO_LINEA
+            valores = self.estadisticas.get(fase)
+            color = COLOR_AMARILLO if fase == 'total' else COLOR_BLANCO
+            pantalla.blit(texto(fase, 20, color), (x + 5, y_linea))
+            if valores:
+                for nombre, columna in self.COLUMNAS:
+                    self.atlas.dibujar(pantalla, f"{valores[nombre]:.2f}", (x + columna, y_linea), color)
+        return [rect]
+
+def main(fps_render=FPS_RENDER, semilla=None, grabar=None, reproducir=None, piloto=None,
+         calidad=None, rectangulos_sucios=False, inclinacion=False, paso_angular=PASO_ANGULAR,
+         largo_estela=LARGO_ESTELA, intervalo_estela=INTERVALO_ESTELA,
+         escala=1.0, pantalla_completa=False, escalado='sdl', perfil=False):
+    repeticion = Grabacion.cargar(reproducir) if reproducir else None
+    if repeticion is not None:
+        inclinacion = repeticion.inclinacion  # El modo de control va en la grabación
+    if inclinacion and piloto is not None:
+        # Los pilotos corrigen con los propulsores laterales, que con inclinación giran la nave
+        raise ValueError("Los pilotos automáticos solo vuelan con el control clásico")
+    iniciar_pantalla(escala, pantalla_completa, escalado)
     sonidos = Sonidos()
     tablero_records = TableroRecords()
-    estrellas = Estrellas()
+    sprite_fantasma = SpriteFantasma()
+    # Estela: cada segmento tarda largo_estela muestras en desaparecer (con calidad alta)
+    capa_estela = CapaEstela((ANCHO, ALTO))
+    vida_estela = largo_estela * intervalo_estela
+    
+    # Calidad visual: fija si se indica, si no se adapta al tiempo de cada frame
+    presupuesto_ms = 1000 / (fps_render or FPS_RENDER)
+    if calidad is None:
+        gobernador = GobernadorCalidad(presupuesto_ms)
+    else:
+        gobernador = GobernadorCalidad(presupuesto_ms, nivel_por_nombre(calidad), adaptativo=False)
+    mostrar_depuracion = False
+    # Perfilador por fases: activo con perfil (todo el historial, volcado al salir) o
+    # mientras se ve la superposición (solo los últimos VENTANA_PERFIL frames)
+    perfilador = PERFILADOR
+    perfilador.activar(perfil, historial=perfil)
+    mostrar_perfil = False
+    superposicion_perfil = SuperposicionPerfil(perfilador, presupuesto_ms)
+    fuente_depuracion = fuente(24)
+    sucios = RectangulosSucios() if rectangulos_sucios else None
+    
+    # RNG de la sesión: reparte una semilla distinta a cada ronda
+    rng_sesion = random.Random(semilla)
+    # Sprites de la nave: con inclinación se rotan de antemano todos los ángulos posibles
+    sprites_nave.configurar(paso_angular)
+    if inclinacion:
+        sprites_nave.preparar(ANGULO_MAXIMO)
+    
+    # Quién controla la nave: una repetición, un piloto automático o el teclado
+    if repeticion is not None:
+        controlador = PilotoRepeticion(repeticion)
+    elif piloto is not None:
+        controlador = crear_piloto(piloto)
+    else:
+        controlador = PilotoTeclado()
+    
+    def evento_resultados(evento):
+        if evento.type == pygame.QUIT or (evento.type == pygame.KEYDOWN and evento.key == pygame.K_ESCAPE):
+            pygame.quit()
+            sys.exit()
+        if evento.type == pygame.KEYDOWN and evento.key == pygame.K_SPACE:
+            return True
+        return None
     
     while True:
-        # Pantalla de inicio
-        mostrar_pantalla_inicio()
-        esperando_inicio = True
-        while esperando_inicio:
-            for evento in pygame.event.get():
-                if evento.type == pygame.QUIT:
-                    sonidos.detener_todos()
-                    pygame.quit()
-                    sys.exit()
-                if evento.type == pygame.KEYDOWN:
-                    if evento.key == pygame.K_RETURN:
-                        esperando_inicio = False
-                        sonidos.reproducir_inicio()
-                    elif evento.key == pygame.K_ESCAPE:
-                        sonidos.detener_todos()
-                        pygame.quit()
-                        sys.exit()
-        
-        # Selección de nivel
-        nivel = mostrar_seleccion_nivel(sonidos)
+        if repeticion is not None:
+            # Reproducir una partida grabada: mismo nivel y semilla
+            nivel = repeticion.nivel
+            semilla_ronda = repeticion.semilla
+        else:
+            nivel = seleccionar_partida(sonidos, inclinacion)
+            semilla_ronda = rng_sesion.getrandbits(63)
         
         # Iniciar nueva partida
-        base = Base(nivel)  # Crear base primero
-        nave = Nave(nivel)
+        rng = crear_rng(semilla_ronda)
+        base = Base(nivel, rng)  # Crear base primero
+        # Se dibuja una vez por ronda; estrellas de la semilla para que las repeticiones
+        # (y video.py) muestren el mismo cielo
+        fondo = CapaFondo(Estrellas(random.Random(semilla_ronda + 3)), base)
+        if sucios is not None:
+            sucios.invalidar()
+        nave = Nave(nivel, rng, random.Random(semilla_ronda + 1), inclinacion)
         nave.sonidos = sonidos
         nave.base = base  # Asignar la base a la nave
+        nave.estela = EstelaTrayectoria(largo_estela, intervalo_estela)
+        capa_estela.reiniciar()
+        nave.base_x = base.x
+        nave.efectos.ajustar_calidad(gobernador.nivel)
+        controlador.reiniciar(random.Random(semilla_ronda + 2))
+        grabacion = Grabacion(semilla_ronda, nivel, inclinacion=inclinacion)
+        # Mejor vuelo del nivel (si lo hay) y registro de este por si lo supera.
+        # El fantasma no guarda el ángulo: solo se usa con el control clásico
+        fantasma = None if inclinacion else Fantasma.abrir(nivel)
+        grabador_fantasma = GrabadorFantasma(nivel)
+        grabador_fantasma.agregar(nave.x, nave.y)
+        paso_fantasma = 0
         jugando = True
         aterrizado_anterior = False
         estrellado_anterior = False
         
+        # Acumulador del paso fijo: el tiempo real se consume en pasos de física
+        acumulado = 0.0
+        reloj.tick()
+        
         while jugando:
-            tiempo_actual = pygame.time.get_ticks()
+            perfilador.inicio_frame()
+            acumulado += reloj.tick(fps_render)
+            perfilador.marcar('espera')
             
             for evento in pygame.event.get():
                 if evento.type == pygame.QUIT:
@@ -948,25 +1344,21 @@ def main():
                     pygame.quit()
                     sys.exit()
                 
-                if evento.type == pygame.KEYDOWN:
-                    if evento.key == pygame.K_SPACE:
-                        nave.propulsor_activo = True
-                    elif evento.key == pygame.K_LEFT:
-                        nave.propulsor_izquierda = True
-                    elif evento.key == pygame.K_RIGHT:
-                        nave.propulsor_derecha = True
-                    elif evento.key == pygame.K_ESCAPE:
-                        sonidos.detener_todos()
-                        pygame.quit()
-                        sys.exit()
+                if evento.type == pygame.KEYDOWN and evento.key == pygame.K_ESCAPE:
+                    sonidos.detener_todos()
+                    pygame.quit()
+                    sys.exit()
+                
+                if evento.type == pygame.KEYDOWN and evento.key == pygame.K_F3:
+                    mostrar_depuracion = not mostrar_depuracion
+                if evento.type == pygame.KEYDOWN and evento.key == pygame.K_F4:
+                    mostrar_perfil = not mostrar_perfil
+                    perfilador.activar(mostrar_perfil or perfil, historial=perfil)
                 
-                if evento.type == pygame.KEYUP:
-                    if evento.key == pygame.K_SPACE:
-                        nave.propulsor_activo = False
-                    elif evento.key == pygame.K_LEFT:
-                        nave.propulsor_izquierda = False
-                    elif evento.key == pygame.K_RIGHT:
-                        nave.propulsor_derecha = False
+                controlador.procesar_evento(evento)
+            
+            perfilador.marcar('eventos')
+            inicio_frame = time.perf_counter()
 
             # Actualizar sonidos basado en el estado de los propulsores
             if nave.propulsor_activo and nave.fuel > 0:
@@ -974,8 +1366,28 @@ def main():
             if (nave.propulsor_izquierda or nave.propulsor_derecha) and nave.fuel > 0:
                 sonidos.reproducir_propulsor_lateral()
             
-            # Actualizar
-            nave.actualizar()
+            # Actualizar con paso fijo, tantas veces como tiempo real haya pasado
+            pasos = 0
+            while acumulado >= PASO_SIMULACION and pasos < MAX_PASOS_POR_FRAME:
+                en_vuelo = not nave.terminado
+                if en_vuelo:
+                    entrada = controlador.decidir(nave)
+                    (nave.propulsor_activo, nave.propulsor_izquierda,
+                     nave.propulsor_derecha) = entrada
+                    grabacion.agregar(entrada)
+                nave.actualizar()
+                if en_vuelo:
+                    grabador_fantasma.agregar(nave.x, nave.y, codificar_entrada(*entrada))
+                perfilador.marcar('fisica')
+                nave.efectos.actualizar()
+                perfilador.marcar('efectos')
+                paso_fantasma += 1
+                acumulado -= PASO_SIMULACION
+                pasos += 1
+            if pasos == MAX_PASOS_POR_FRAME:
+                # Demasiado atraso: descartarlo en vez de acelerar la partida
+                acumulado = min(acumulado, PASO_SIMULACION)
+            alfa = acumulado / PASO_SIMULACION
             
             # Verificar si acaba de aterrizar o estrellarse
             if nave.aterrizado and not aterrizado_anterior:
@@ -985,14 +1397,38 @@ def main():
                 sonidos.reproducir_explosion()
                 estrellado_anterior = True
             
+            perfilador.marcar('fisica')
+            
             # Dibujar
-            pantalla.fill((0, 0, 0))
-            estrellas.dibujar()  # Dibujar estrellas antes que todo
-            dibujar_suelo()
-            base.dibujar(nave.viento)
-            nave.dibujar()
-            nave.efectos.actualizar_y_dibujar(pantalla)  # Dibujar efectos
-            dibujar_hud(nave)
+            nivel_calidad = gobernador.nivel
+            if sucios is None:
+                rects = [fondo.dibujar(pantalla, nave.viento, nivel_calidad)]
+            else:
+                rects = [sucios.dibujar_fondo(pantalla, fondo, nave.viento, nivel_calidad)]
+            perfilador.marcar('fondo')
+            if fantasma is not None:
+                rects.append(sprite_fantasma.dibujar(pantalla, fantasma, paso_fantasma, alfa))
+                perfilador.marcar('fantasma')
+            rects.append(nave.escape.dibujar(pantalla))  # El escape queda detrás de la nave
+            perfilador.marcar('escape')
+            rects.append(nave.dibujar(pantalla, alfa))
+            perfilador.marcar('nave')
+            rects.extend(nave.efectos.dibujar(pantalla))  # Dibujar efectos
+            perfilador.marcar('efectos')
+            rects.append(capa_estela.dibujar(pantalla, nave.estela, pasos,
+                                             int(vida_estela * nivel_calidad['estela'])))
+            perfilador.marcar('estela')
+            rects.extend(dibujar_hud(pantalla, nave))
+            perfilador.marcar('hud')
+            if mostrar_depuracion:
+                rects.extend(dibujar_depuracion(pantalla, gobernador, nave, fuente_depuracion, sucios))
+            if mostrar_perfil:
+                rects.extend(superposicion_perfil.dibujar(pantalla))
+            perfilador.marcar('superposicion')
+            
+            # Tiempo de actualización y dibujo (sin la espera del reloj ni el flip)
+            if gobernador.registrar((time.perf_counter() - inicio_frame) * 1000):
+                nave.efectos.ajustar_calidad(gobernador.nivel)
 
             # Si ha terminado la partida
             if nave.aterrizado or nave.estrellado:
@@ -1001,18 +1437,21 @@ def main():
                     tiempo_actual = pygame.time.get_ticks()
                     if tiempo_actual < nave.tiempo_espera_puntuacion:
                         # Seguir actualizando la pantalla mientras esperamos
-                        pygame.display.flip()
-                        reloj.tick(FPS)
+                        presentar_frame(pantalla, sucios, rects)
+                        perfilador.marcar('presentar')
+                        perfilador.fin_frame()
                         continue  # Continuar el bucle sin mostrar pantalla de puntuación
                 
                 # Ahora sí calcular puntuación y mostrar resultados
                 nave.calcular_puntuacion()
+                if grabar and repeticion is None:
+                    grabacion.guardar(grabar)
                 
                 # Determinar si la puntuación está en el top 10 y en qué posición
                 es_top10 = False
                 posicion_top = 0
                 
-                if nave.aterrizado:
+                if nave.aterrizado and isinstance(controlador, PilotoTeclado):
                     # Comprobar posición en el top 10
                     puntuaciones_actuales = tablero_records.obtener_top_10()
                     for i, record in enumerate(puntuaciones_actuales, 1):
@@ -1026,148 +1465,117 @@ def main():
                         posicion_top = len(puntuaciones_actuales) + 1
                         es_top10 = True
                     
-                    # Guardar puntuación
-                    fecha = datetime.datetime.now().strftime("%d/%m/%Y %H:%M")
-                    tablero_records.agregar_puntuacion({
-                        'puntuacion': nave.puntuacion,
-                        'fecha': fecha
-                    })
-                
-                fuente_grande = pygame.font.Font(None, 84)
-                fuente_normal = pygame.font.Font(None, 48)
-                fuente_pequeña = pygame.font.Font(None, 36)
-                
-                # Crear superficie semitransparente para el fondo
-                overlay = pygame.Surface((ANCHO, ALTO))
-                overlay.fill((0, 0, 0))
-                overlay.set_alpha(160)  # Un poco más oscuro para mejor contraste
-                pantalla.blit(overlay, (0, 0))
-                
-                # Mensaje principal y puntuación
-                if nave.aterrizado:
-                    mensaje = "¡ATERRIZAJE EXITOSO!"
-                    mensaje_puntos = f"Puntuación Total: {nave.puntuacion}"
-                    color_mensaje = COLOR_VERDE
-                else:
-                    mensaje = "¡ESTRELLADO!"
-                    mensaje_puntos = "Puntuación: 0"
-                    color_mensaje = COLOR_ROJO
-                
-                # Dibujar mensaje principal
-                texto = fuente_grande.render(mensaje, True, color_mensaje)
-                rect_texto = texto.get_rect(center=(ANCHO//2, ALTO//5))  # Más arriba
-                pantalla.blit(texto, rect_texto)
-                
-                # Dibujar puntuación total
-                texto_puntos = fuente_normal.render(mensaje_puntos, True, COLOR_AMARILLO)
-                rect_puntos = texto_puntos.get_rect(center=(ANCHO//2, ALTO//5 + 70))  # Ajustado
-                pantalla.blit(texto_puntos, rect_puntos)
-                
-                # Mostrar mensaje si entró al top 10
-                if es_top10:
-                    mensaje_top = fuente_normal.render(f"¡TOP 10! - Posición #{posicion_top}", True, COLOR_VERDE)
-                    rect_top = mensaje_top.get_rect(center=(ANCHO//2, ALTO//5 + 140))  # Más separado
-                    pantalla.blit(mensaje_top, rect_top)
-                
-                # Columna izquierda: Desglose de puntuación o mensaje de error
-                if nave.aterrizado:
-                    x_desglose = ANCHO//4 - 50
-                    y_desglose = ALTO//2
-                    
-                    titulo_desglose = fuente_pequeña.render("DESGLOSE", True, COLOR_AMARILLO)
-                    rect_titulo = titulo_desglose.get_rect(center=(x_desglose, y_desglose))
-                    pantalla.blit(titulo_desglose, rect_titulo)
-                    
-                    for i, (concepto, puntos) in enumerate(nave.desglose.items()):
-                        texto = f"{concepto.capitalize()}: {puntos}"
-                        linea = fuente_pequeña.render(texto, True, COLOR_BLANCO)
-                        rect_linea = linea.get_rect(center=(x_desglose, y_desglose + 40 + i * 35))
-                        pantalla.blit(linea, rect_linea)
-                else:
-                    # Mejor posicionamiento para el mensaje de accidente
-                    y_razon = ALTO//5 + 180  # Más espacio debajo del mensaje principal
-                    
-                    # Dividir razón de accidente en dos líneas si es necesario
-                    if len(nave.razon_accidente) > 30:
-                        mitad = nave.razon_accidente.find(" ", len(nave.razon_accidente)//2)
-                        if mitad == -1:  # Si no hay espacios, dividir en mitad
-                            mitad = len(nave.razon_accidente)//2
-                        
-                        texto_razon1 = fuente_normal.render(nave.razon_accidente[:mitad], True, COLOR_ROJO)
-                        texto_razon2 = fuente_normal.render(nave.razon_accidente[mitad:], True, COLOR_ROJO)
-                        
-                        rect_razon1 = texto_razon1.get_rect(center=(ANCHO//2, y_razon))
-                        rect_razon2 = texto_razon2.get_rect(center=(ANCHO//2, y_razon + 50))
-                        
-                        pantalla.blit(texto_razon1, rect_razon1)
-                        pantalla.blit(texto_razon2, rect_razon2)
-                    else:
-                        texto_razon = fuente_normal.render(nave.razon_accidente, True, COLOR_ROJO)
-                        rect_razon = texto_razon.get_rect(center=(ANCHO//2, y_razon))
-                        pantalla.blit(texto_razon, rect_razon)
-                    
-                    # Información adicional sobre el accidente
-                    if hasattr(nave, 'velocidad_final'):
-                        y_info = y_razon + (100 if len(nave.razon_accidente) > 30 else 60)
-                        
-                        vel_total = fuente_pequeña.render(f"Velocidad final: {nave.velocidad_final:.1f}", True, COLOR_BLANCO)
-                        vel_vert = fuente_pequeña.render(f"Velocidad vertical: {abs(nave.velocidad_y):.1f}", True, COLOR_BLANCO)
-                        vel_horiz = fuente_pequeña.render(f"Velocidad horizontal: {abs(nave.velocidad_x):.1f}", True, COLOR_BLANCO)
-                        
-                        pantalla.blit(vel_total, vel_total.get_rect(center=(ANCHO//2, y_info)))
-                        pantalla.blit(vel_vert, vel_vert.get_rect(center=(ANCHO//2, y_info + 35)))
-                        pantalla.blit(vel_horiz, vel_horiz.get_rect(center=(ANCHO//2, y_info + 70)))
-                
-                # Columna derecha: TOP 10 (solo en caso de aterrizaje exitoso)
-                if nave.aterrizado:
-                    x_records = ANCHO * 3//4 + 50  # Más a la derecha
-                    y_records = ALTO//2
-                    
-                    titulo_top = fuente_pequeña.render("MEJORES PUNTUACIONES", True, COLOR_AMARILLO)
-                    rect_top = titulo_top.get_rect(center=(x_records, y_records))
-                    pantalla.blit(titulo_top, rect_top)
+                    # Nuevo récord: este vuelo pasa a ser el fantasma del nivel
+                    if es_top10 and posicion_top == 1 and not inclinacion:
+                        if fantasma is not None:
+                            fantasma.cerrar()  # Soltar el mmap antes de reemplazar el archivo
+                            fantasma = None
+                        grabador_fantasma.guardar(nave.puntuacion)
                     
-                    # Limitamos a mostrar solo 8 puntuaciones para evitar sobreposiciones
-                    for i, record in enumerate(tablero_records.obtener_top_10()[:8], 1):
-                        texto = f"{i}. {record['puntuacion']} pts"
-                        
-                        # Destacar la nueva puntuación
-                        if es_top10 and i == posicion_top:
-                            color = COLOR_VERDE
-                            texto += " ← ¡NUEVO!"
-                        else:
-                            color = COLOR_AMARILLO if i == 1 else COLOR_BLANCO
-                            
-                        linea = fuente_pequeña.render(texto, True, color)
-                        rect_linea = linea.get_rect(center=(x_records, y_records + 40 + i * 30))
-                        pantalla.blit(linea, rect_linea)
+                    # Guardar puntuación, con su grabación para poder renderizarla (video.py)
+                    ahora = datetime.datetime.now()
+                    fecha = ahora.strftime("%d/%m/%Y %H:%M")
+                    record = {'puntuacion': nave.puntuacion, 'fecha': fecha}
+                    if es_top10:
+                        os.makedirs(DIRECTORIO_REPETICIONES, exist_ok=True)
+                        record['repeticion'] = os.path.join(DIRECTORIO_REPETICIONES,
+                                                            ahora.strftime("%Y%m%d_%H%M%S_%f.rep"))
+                        grabacion.guardar(record['repeticion'])
+                    tablero_records.agregar_puntuacion(record)
                 
-                # Mensaje para continuar en la parte inferior
-                mensaje_continuar = fuente_pequeña.render("Presiona ESPACIO para continuar", True, COLOR_VERDE)
-                rect_continuar = mensaje_continuar.get_rect(center=(ANCHO//2, ALTO - 40))
-                pantalla.blit(mensaje_continuar, rect_continuar)
+                # Los resultados van sobre el último frame: se guarda para poder repintar
+                ultimo_frame = pantalla.copy()
+                records = tablero_records.obtener_top_10()
                 
-                pygame.display.flip()
+                def mostrar_resultados():
+                    pantalla.blit(ultimo_frame, (0, 0))
+                    dibujar_resultados(pantalla, nave, records, es_top10, posicion_top)
+                    ventana.presentar()
                 
                 # Esperar input para continuar
-                esperando_continuar = True
-                while esperando_continuar:
-                    for evento in pygame.event.get():
-                        if evento.type == pygame.QUIT:
-                            pygame.quit()
-                            sys.exit()
-                        if evento.type == pygame.KEYDOWN:
-                            if evento.key == pygame.K_SPACE:
-                                esperando_continuar = False
-                                jugando = False
-                            elif evento.key == pygame.K_ESCAPE:
-                                pygame.quit()
-                                sys.exit()
+                ejecutar_pantalla("resultados", evento_resultados, mostrar_resultados)
+                jugando = False
             
             # Actualizar pantalla si el juego sigue en curso
             else:
-                pygame.display.flip()
-                reloj.tick(FPS)
+                presentar_frame(pantalla, sucios, rects)
+                perfilador.marcar('presentar')
+                perfilador.fin_frame()
+        
+        if fantasma is not None:
+            fantasma.cerrar()
+        if repeticion is not None:
+            return
+
+def _entero_positivo(texto):
+    valor = int(texto)
+    if valor <= 0:
+        raise argparse.ArgumentTypeError(f"debe ser mayor que 0: {texto}")
+    return valor
+
+def _entero_no_negativo(texto):
+    valor = int(texto)
+    if valor < 0:
+        raise argparse.ArgumentTypeError(f"no puede ser negativo: {texto}")
+    return valor
+
+def _real_positivo(texto):
+    valor = float(texto)
+    if not valor > 0:  # También rechaza nan
+        raise argparse.ArgumentTypeError(f"debe ser mayor que 0: {texto}")
+    return valor
+
+def _parsear_argumentos():
+    parser = argparse.ArgumentParser(description="Aterrizaje Lunar")
+    parser.add_argument("--fps-render", type=_entero_no_negativo, default=FPS_RENDER,
+                        help="Límite de frames dibujados por segundo (0 = sin límite)")
+    parser.add_argument("--semilla", type=int, default=None,
+                        help="Semilla de la sesión para partidas reproducibles")
+    parser.add_argument("--grabar", metavar="ARCHIVO",
+                        help="Guardar la última partida jugada en ARCHIVO")
+    parser.add_argument("--reproducir", metavar="ARCHIVO",
+                        help="Reproducir en pantalla una partida grabada")
+    parser.add_argument("--piloto", metavar="NOMBRE",
+                        help="Piloto automático (modo demostración), p. ej. perfil")
+    parser.add_argument("--calidad", choices=[n['nombre'] for n in NIVELES_CALIDAD],
+                        help="Calidad visual fija (por defecto se adapta al rendimiento)")
+    parser.add_argument("--rectangulos-sucios", action="store_true",
+                        help="Enviar a la pantalla solo las zonas que cambian (SDL por software)")
+    parser.add_argument("--inclinacion", action="store_true",
+                        help="Control por inclinación: ← y → giran la nave y el propulsor empuja hacia el morro")
+    parser.add_argument("--escala", type=_real_positivo, default=1.0,
+                        help="Tamaño de la ventana respecto a la resolución lógica de 800x600")
+    parser.add_argument("--pantalla-completa", action="store_true",
+                        help="Pantalla completa a la resolución del escritorio")
+    parser.add_argument("--escalado", choices=ESCALADOS, default='sdl',
+                        help="Cómo escalar la imagen: con el renderizador de SDL o con "
+                             "pygame.transform.scale")
+    parser.add_argument("--perfil", metavar="ARCHIVO",
+                        help="Medir cada fase del frame y volcar las muestras al salir "
+                             "(CSV si ARCHIVO acaba en .csv, si no binario)")
+    parser.add_argument("--estela", type=_entero_no_negativo, default=LARGO_ESTELA, metavar="MUESTRAS",
+                        help="Largo de la estela de la trayectoria, en muestras (0 = sin estela)")
+    parser.add_argument("--intervalo-estela", type=_entero_positivo, default=INTERVALO_ESTELA, metavar="PASOS",
+                        help="Pasos de simulación entre muestras de la estela")
+    parser.add_argument("--paso-angular", type=_real_positivo, default=PASO_ANGULAR,
+                        help="Grados entre los sprites pre-rotados de la nave")
+    args = parser.parse_args()
+    if args.piloto and args.inclinacion:
+        parser.error("--piloto no se puede usar con --inclinacion (los pilotos solo vuelan con el control clásico)")
+    return args
 
 if __name__ == "__main__":
-    main()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s: %(message)s")
+    args = _parsear_argumentos()
+    try:
+        main(fps_render=args.fps_render, semilla=args.semilla, grabar=args.grabar,
+             reproducir=args.reproducir, piloto=args.piloto, calidad=args.calidad,
+             rectangulos_sucios=args.rectangulos_sucios, inclinacion=args.inclinacion,
+             paso_angular=args.paso_angular, largo_estela=args.estela,
+             intervalo_estela=args.intervalo_estela, escala=args.escala,
+             pantalla_completa=args.pantalla_completa, escalado=args.escalado,
+             perfil=args.perfil is not None)
+    finally:
+        CPU_PANTALLAS.informar()  # Uso de CPU de los menús y pantallas de espera
+        if args.perfil:
+            PERFILADOR.volcar(args.perfil)
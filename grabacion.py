@@ -0,0 +1,157 @@
+"""Grabación compacta de partidas y reproducción determinista.
+
+Una grabación guarda la semilla de la ronda, el nivel, el modo de control
+(clásico o por inclinación, desde la versión 2 del formato) y la entrada de cada paso
+de simulación (propulsor, izquierda, derecha) como bits, comprimidos por
+tramos (run-length). Con la misma semilla el reparto de la base y el viento se
+repiten exactamente, así que reproducir las entradas reproduce el vuelo.
+
+Uso sin pantalla (avance rápido):
+    python grabacion.py partida.rep
+"""
+import argparse
+import random
+import struct
+import sys
+import time
+
+from pilotos import Piloto
+from simulacion import FPS, EstadoNave, posicion_base
+
+MAGIA = b"ALRP"
+VERSION_FORMATO = 2
+CABECERAS = {
+    1: struct.Struct("<4sBQBI"),  # magia, versión, semilla, nivel, tramos
+    2: struct.Struct("<4sBQBIB"),  # ... y modo de inclinación (0/1)
+}
+CABECERA = CABECERAS[VERSION_FORMATO]
+TRAMO = struct.Struct("<BH")  # bits de entrada, repeticiones
+MAX_TRAMO = 0xFFFF
+
+# Bits de entrada por paso
+BIT_PROPULSOR = 1
+BIT_IZQUIERDA = 2
+BIT_DERECHA = 4
+
+
+def codificar_entrada(propulsor, izquierda, derecha):
+    return ((BIT_PROPULSOR if propulsor else 0) |
+            (BIT_IZQUIERDA if izquierda else 0) |
+            (BIT_DERECHA if derecha else 0))
+
+
+def decodificar_entrada(bits):
+    return (bool(bits & BIT_PROPULSOR),
+            bool(bits & BIT_IZQUIERDA),
+            bool(bits & BIT_DERECHA))
+
+
+class Grabacion:
+    def __init__(self, semilla, nivel, version=VERSION_FORMATO, inclinacion=False):
+        self.semilla = semilla
+        self.nivel = nivel
+        self.version = version
+        self.inclinacion = inclinacion
+        self.tramos = []  # [bits, repeticiones]
+
+    def agregar(self, entrada):
+        """Añade la entrada de un paso de simulación"""
+        bits = codificar_entrada(*entrada)
+        if self.tramos and self.tramos[-1][0] == bits and self.tramos[-1][1] < MAX_TRAMO:
+            self.tramos[-1][1] += 1
+        else:
+            self.tramos.append([bits, 1])
+
+    def entradas(self):
+        """Itera las entradas paso a paso"""
+        for bits, repeticiones in self.tramos:
+            entrada = decodificar_entrada(bits)
+            for _ in range(repeticiones):
+                yield entrada
+
+    def __len__(self):
+        return sum(repeticiones for _, repeticiones in self.tramos)
+
+    def a_bytes(self):
+        datos = [CABECERA.pack(MAGIA, VERSION_FORMATO, self.semilla, self.nivel, len(self.tramos),
+                               self.inclinacion)]
+        datos.extend(TRAMO.pack(bits, repeticiones) for bits, repeticiones in self.tramos)
+        return b"".join(datos)
+
+    @classmethod
+    def desde_bytes(cls, datos):
+        magia, version = struct.unpack_from("<4sB", datos, 0)
+        if magia != MAGIA:
+            raise ValueError("No es un archivo de grabación")
+        if version not in CABECERAS:
+            raise ValueError(f"Versión de grabación no soportada: {version}")
+        cabecera = CABECERAS[version]
+        _, _, semilla, nivel, n_tramos, *modo = cabecera.unpack_from(datos, 0)
+        grabacion = cls(semilla, nivel, version, inclinacion=bool(modo and modo[0]))
+        grabacion.tramos = [list(t) for t in TRAMO.iter_unpack(
+            datos[cabecera.size:cabecera.size + n_tramos * TRAMO.size])]
+        return grabacion
+
+    def guardar(self, archivo):
+        with open(archivo, 'wb') as f:
+            f.write(self.a_bytes())
+
+    @classmethod
+    def cargar(cls, archivo):
+        with open(archivo, 'rb') as f:
+            return cls.desde_bytes(f.read())
+
+
+class PilotoRepeticion(Piloto):
+    """Piloto que repite las entradas de una grabación"""
+    nombre = "repeticion"
+
+    def __init__(self, grabacion):
+        self.grabacion = grabacion
+        self.entradas = grabacion.entradas()
+
+    def reiniciar(self, rng):
+        self.entradas = self.grabacion.entradas()
+
+    def decidir(self, nave):
+        return next(self.entradas, (False, False, False))
+
+
+def crear_rng(semilla):
+    """RNG de física de una ronda: coloca la base y mueve el viento"""
+    return random.Random(semilla)
+
+
+def reproducir_rapido(grabacion):
+    """Reproduce una grabación sin dibujar y devuelve el EstadoNave final"""
+    rng = crear_rng(grabacion.semilla)
+    nave = EstadoNave(grabacion.nivel, base_x=posicion_base(grabacion.nivel, rng),
+                      inclinacion=grabacion.inclinacion)
+    for entrada in grabacion.entradas():
+        if nave.terminado:
+            break
+        nave.avanzar(entrada, rng)
+    nave.calcular_puntuacion()
+    return nave
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reproduce grabaciones sin pantalla")
+    parser.add_argument("archivos", nargs="+", help="Archivos .rep")
+    args = parser.parse_args()
+
+    for archivo in args.archivos:
+        grabacion = Grabacion.cargar(archivo)
+        inicio = time.perf_counter()
+        nave = reproducir_rapido(grabacion)
+        duracion = time.perf_counter() - inicio
+        resultado = "ATERRIZADO" if nave.aterrizado else nave.razon_accidente or "EN VUELO"
+        velocidad = (nave.pasos / FPS) / duracion if duracion > 0 else float("inf")
+        print(f"{archivo}: nivel {grabacion.nivel} semilla {grabacion.semilla} "
+              f"pasos {nave.pasos} -> {resultado} puntuación {nave.puntuacion} "
+              f"({velocidad:.0f}x tiempo real)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
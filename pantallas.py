@@ -0,0 +1,91 @@
+"""Bucle común de las pantallas de espera (menús y resultados).
+
+Una pantalla sin animación se dibuja una vez y se queda bloqueada en
+pygame.event.wait hasta que llega un evento (o vence ESPERA_INACTIVA_MS, para
+no quedarse colgada si el sistema de eventos se atasca), así que no consume
+CPU mientras el jugador no toca nada. Solo las pantallas animadas se redibujan
+a FPS_ANIMACION. CPU_PANTALLAS acumula el tiempo de CPU y el tiempo real de
+cada pantalla para comprobar que las inactivas se quedan cerca del 0%.
+"""
+import logging
+import time
+from contextlib import contextmanager
+
+import pygame
+
+logger = logging.getLogger(__name__)
+
+ESPERA_INACTIVA_MS = 1000  # Tope de cada espera bloqueante
+FPS_ANIMACION = 60
+EVENTOS_REDIBUJAR = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED)
+
+
+class ContadorCPU:
+    """Tiempo de CPU y tiempo real acumulados por nombre de pantalla"""
+
+    def __init__(self):
+        self.pantallas = {}
+
+    @contextmanager
+    def medir(self, nombre):
+        cpu = time.process_time()
+        real = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(nombre, time.process_time() - cpu, time.perf_counter() - real)
+
+    def registrar(self, nombre, cpu, real):
+        registro = self.pantallas.setdefault(nombre, {'cpu': 0.0, 'real': 0.0, 'veces': 0})
+        registro['cpu'] += cpu
+        registro['real'] += real
+        registro['veces'] += 1
+        logger.debug("Pantalla %s: %.3f s de CPU en %.1f s", nombre, cpu, real)
+
+    def uso(self, nombre):
+        """Fracción de un núcleo usada por la pantalla (0-1)"""
+        registro = self.pantallas.get(nombre)
+        if not registro or registro['real'] <= 0:
+            return 0.0
+        return registro['cpu'] / registro['real']
+
+    def informe(self):
+        return [f"{nombre}: {self.uso(nombre):.1%} CPU "
+                f"({r['cpu']:.2f} s en {r['real']:.1f} s, {r['veces']} veces)"
+                for nombre, r in self.pantallas.items()]
+
+    def informar(self):
+        for linea in self.informe():
+            logger.info("Pantalla %s", linea)
+
+
+# Contador compartido por todas las pantallas
+CPU_PANTALLAS = ContadorCPU()
+
+
+def ejecutar_pantalla(nombre, manejar_evento, dibujar=None, animada=False,
+                      fps=FPS_ANIMACION, reloj=None):
+    """Atiende eventos hasta que manejar_evento devuelva algo distinto de None.
+
+    dibujar (opcional) pinta la pantalla y hace el flip: se llama al entrar y,
+    si la pantalla es animada, en cada frame; si no, solo cuando el sistema
+    pide repintar la ventana. Devuelve lo que devolvió manejar_evento.
+    """
+    reloj = reloj or pygame.time.Clock()
+    with CPU_PANTALLAS.medir(nombre):
+        if dibujar is not None:
+            dibujar()
+        while True:
+            if animada:
+                reloj.tick(fps)
+                eventos = pygame.event.get()
+            else:
+                evento = pygame.event.wait(ESPERA_INACTIVA_MS)
+                eventos = [] if evento.type == pygame.NOEVENT else [evento]
+                eventos += pygame.event.get()
+            for evento in eventos:
+                resultado = manejar_evento(evento)
+                if resultado is not None:
+                    return resultado
+            if dibujar is not None and (animada or any(e.type in EVENTOS_REDIBUJAR for e in eventos)):
+                dibujar()
@@ -0,0 +1,222 @@
+"""Sistema de partículas sobre arrays de NumPy.
+
+Todas las partículas vivas están en un bloque float32 preasignado con una fila
+por campo (posición, velocidad, vida, tamaño, color, gravedad y rozamiento), de
+forma que avanzar un paso son unas pocas operaciones vectoriales sobre las
+primeras n columnas. Las muertas se compactan al principio del bloque sin
+reservar memoria nueva; las nuevas se añaden al final hasta la capacidad.
+"""
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+
+# Filas del bloque de datos
+X, Y, VX, VY, VIDA, VIDA_INICIAL, TAMAÑO, COLOR, GRAVEDAD, ARRASTRE = range(10)
+N_CAMPOS = 10
+
+GRAVEDAD_PARTICULAS = 0.1  # Se suma a la velocidad vertical en cada paso
+MAX_PARTICULAS = 20000
+MAX_SPRITES = 1024  # Sprites en caché antes de descartar los menos usados
+NIVELES_ALFA = 16  # La transparencia se redondea a tantos niveles
+
+
+class CacheSprites:
+    """Círculos translúcidos pre-dibujados por (color, tamaño, alfa cuantizado).
+
+    La memoria está acotada: al pasar de capacidad se descarta el sprite usado
+    hace más tiempo (LRU). aciertos y fallos sirven para dimensionarla.
+    """
+
+    def __init__(self, capacidad=MAX_SPRITES, niveles_alfa=NIVELES_ALFA):
+        self.capacidad = capacidad
+        self.niveles_alfa = niveles_alfa
+        self.sprites = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def __len__(self):
+        return len(self.sprites)
+
+    def obtener(self, color, tamaño, nivel):
+        clave = (color, tamaño, nivel)
+        sprite = self.sprites.get(clave)
+        if sprite is not None:
+            self.aciertos += 1
+            self.sprites.move_to_end(clave)
+            return sprite
+        self.fallos += 1
+        alpha = nivel * 255 // (self.niveles_alfa - 1)
+        sprite = pygame.Surface((tamaño * 2, tamaño * 2), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, (*color, alpha), (tamaño, tamaño), tamaño)
+        self.sprites[clave] = sprite
+        if len(self.sprites) > self.capacidad:
+            self.sprites.popitem(last=False)
+        return sprite
+
+    def estadisticas(self):
+        total = self.aciertos + self.fallos
+        return {
+            'sprites': len(self.sprites),
+            'capacidad': self.capacidad,
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'tasa_aciertos': self.aciertos / total if total else 0.0,
+        }
+
+
+# Caché compartida por todos los sistemas de partículas
+CACHE_SPRITES = CacheSprites()
+
+
+class SistemaParticulas:
+    def __init__(self, capacidad=MAX_PARTICULAS):
+        self.capacidad = capacidad
+        self.datos = np.zeros((N_CAMPOS, capacidad), dtype=np.float32)
+        self._auxiliar = np.empty_like(self.datos)  # Destino de la compactación
+        self._vivas = np.empty(capacidad, dtype=bool)
+        self.n = 0
+        # Colores usados, indexados por la fila COLOR
+        self.paleta = []
+        self._indices_color = {}
+
+    def __len__(self):
+        return self.n
+
+    def vaciar(self):
+        self.n = 0
+
+    def recortar(self, maximo):
+        """Se queda con las primeras partículas (las más antiguas) hasta maximo"""
+        self.n = min(self.n, max(0, maximo))
+
+    def indice_color(self, color):
+        """Índice del color en la paleta (se añade la primera vez)"""
+        color = tuple(color)
+        if color not in self._indices_color:
+            self._indices_color[color] = len(self.paleta)
+            self.paleta.append(color)
+        return self._indices_color[color]
+
+    def emitir(self, x, y, velocidad_x, velocidad_y, vida, tamaño, color,
+               gravedad=GRAVEDAD_PARTICULAS, arrastre=1.0):
+        """Añade partículas; cada argumento es un escalar o un array.
+
+        color es un índice de la paleta (ver indice_color). Si no caben todas,
+        se descartan las que sobran y se devuelve cuántas se añadieron.
+        """
+        cantidad = max(np.size(v) for v in (x, y, velocidad_x, velocidad_y, vida, tamaño,
+                                             color, gravedad, arrastre))
+        columnas, cantidad = self._reservar(cantidad)
+        if cantidad <= 0:
+            return 0
+        for fila, valor in ((X, x), (Y, y), (VX, velocidad_x), (VY, velocidad_y),
+                            (VIDA, vida), (VIDA_INICIAL, vida), (TAMAÑO, tamaño),
+                            (COLOR, color), (GRAVEDAD, gravedad), (ARRASTRE, arrastre)):
+            valor = np.asarray(valor)
+            self.datos[fila, columnas] = valor[:cantidad] if valor.ndim else valor
+        return cantidad
+
+    def _reservar(self, cantidad):
+        """Columnas donde escribir las nuevas partículas y cuántas caben"""
+        cantidad = min(cantidad, self.capacidad - self.n)
+        inicio = self.n
+        self.n += max(0, cantidad)
+        return slice(inicio, self.n), cantidad
+
+    def actualizar(self):
+        """Un paso: mover, envejecer, aplicar rozamiento y gravedad, compactar"""
+        n = self.n
+        if n == 0:
+            return
+        d = self.datos[:, :n]
+        d[X] += d[VX]
+        d[Y] += d[VY]
+        d[VIDA] -= 1
+        d[VX] *= d[ARRASTRE]
+        d[VY] *= d[ARRASTRE]
+        d[VY] += d[GRAVEDAD]
+
+        vivas = self._vivas[:n]
+        np.greater(d[VIDA], 0, out=vivas)
+        quedan = int(np.count_nonzero(vivas))
+        if quedan < n:
+            # Compactación estable: se conserva el orden de dibujo
+            np.compress(vivas, d, axis=1, out=self._auxiliar[:, :quedan])
+            self.datos[:, :quedan] = self._auxiliar[:, :quedan]
+            self.n = quedan
+
+    def dibujar(self, pantalla, cache=None):
+        """Dibuja las partículas; devuelve el rectángulo que las contiene (o None)"""
+        if self.n:
+            return dibujar_bloque(pantalla, self.datos[:, :self.n], self.paleta, cache)
+        return None
+
+
+class EmisorEscape(SistemaParticulas):
+    """Variante en anillo para el escape de los propulsores.
+
+    La capacidad es fija: cada partícula nueva ocupa el hueco siguiente y, con
+    el anillo lleno, sustituye a la más antigua. Cada paso actualiza el anillo
+    entero, así que memoria y coste por frame son constantes aunque se empuje
+    sin parar.
+    """
+
+    def __init__(self, capacidad):
+        super().__init__(capacidad)
+        self.siguiente = 0
+        self._posiciones = np.arange(capacidad)
+
+    def __len__(self):
+        return int(np.count_nonzero(self.datos[VIDA] > 0))
+
+    def vaciar(self):
+        self.datos[VIDA] = 0
+
+    def _reservar(self, cantidad):
+        cantidad = min(cantidad, self.capacidad)
+        columnas = (self.siguiente + self._posiciones[:cantidad]) % self.capacidad
+        self.siguiente = (self.siguiente + cantidad) % self.capacidad
+        return columnas, cantidad
+
+    def actualizar(self):
+        d = self.datos
+        d[X] += d[VX]
+        d[Y] += d[VY]
+        d[VIDA] -= 1
+        d[VX] *= d[ARRASTRE]
+        d[VY] *= d[ARRASTRE]
+        d[VY] += d[GRAVEDAD]
+
+    def dibujar(self, pantalla, cache=None):
+        vivas = np.greater(self.datos[VIDA], 0, out=self._vivas)
+        n = int(np.count_nonzero(vivas))
+        if n:
+            np.compress(vivas, self.datos, axis=1, out=self._auxiliar[:, :n])
+            return dibujar_bloque(pantalla, self._auxiliar[:, :n], self.paleta, cache)
+        return None
+
+
+def dibujar_bloque(pantalla, d, paleta, cache=None):
+    """Un sprite de la caché por columna de d, todos en una sola llamada a blits.
+
+    Devuelve el rectángulo que contiene todos los sprites.
+    """
+    if cache is None:
+        cache = CACHE_SPRITES
+    niveles = np.rint(d[VIDA] / d[VIDA_INICIAL] * (cache.niveles_alfa - 1)).astype(np.int32)
+    tamaños = d[TAMAÑO].astype(np.int32)
+    esquinas_x = (d[X] - tamaños).astype(np.int32)
+    esquinas_y = (d[Y] - tamaños).astype(np.int32)
+    rect = pygame.Rect(int(esquinas_x.min()), int(esquinas_y.min()), 0, 0)
+    rect.w = int((esquinas_x + 2 * tamaños).max()) - rect.x
+    rect.h = int((esquinas_y + 2 * tamaños).max()) - rect.y
+    esquinas_x = esquinas_x.tolist()
+    esquinas_y = esquinas_y.tolist()
+    obtener = cache.obtener
+    pantalla.blits([(obtener(paleta[color], tamaño, nivel), (x, y))
+                    for color, tamaño, nivel, x, y in zip(d[COLOR].astype(np.int32).tolist(),
+                                                         tamaños.tolist(), niveles.tolist(),
+                                                         esquinas_x, esquinas_y)],
+                   doreturn=False)
+    return rect
@@ -0,0 +1,164 @@
+"""Perfilador de frames por fases del bucle principal.
+
+El bucle llama a inicio_frame() al empezar cada frame y a marcar(fase) al
+terminar cada fase: el tiempo desde la marca anterior se suma a esa fase, así
+que marcar varias veces la misma fase (p. ej. en cada paso de física) acumula.
+fin_frame() guarda la fila del frame. Un frame que no se cierra (p. ej. el que
+abre la pantalla de resultados) se descarta en el siguiente inicio_frame().
+
+Desactivado, cada llamada vuelve nada más entrar y no se guarda nada. Activado
+con historial, guarda todas las muestras de la sesión (ms en float32) para
+volcarlas a CSV o a un binario compacto; sin historial (solo para la
+superposición) guarda los últimos VENTANA_PERFIL frames en un anillo fijo. Las
+estadísticas (mín., media, p95, p99) se calculan sobre los últimos
+VENTANA_PERFIL frames.
+
+Resumen de un volcado:
+    python perfilador.py perfil.bin
+"""
+import argparse
+import struct
+import sys
+import time
+
+import numpy as np
+
+FASES = ('espera', 'eventos', 'fisica', 'efectos', 'fondo', 'fantasma', 'escape',
+         'nave', 'estela', 'hud', 'superposicion', 'presentar')
+VENTANA_PERFIL = 600  # Frames de las estadísticas móviles (10 s a 60 FPS)
+CAPACIDAD_INICIAL = 4096  # Filas reservadas al activar con historial; se duplica al llenarse
+
+MAGIA = b"ALPF"
+VERSION_FORMATO = 1
+CABECERA = struct.Struct("<4sBHIH")  # magia, versión, fases, frames, bytes de los nombres
+
+
+class Perfilador:
+    def __init__(self, fases=FASES):
+        self.fases = tuple(fases)
+        self.indices = {fase: i for i, fase in enumerate(self.fases)}
+        self.activo = False
+        self.historial = False
+        self.datos = np.zeros((0, len(self.fases)), dtype=np.float32)
+        self.n = 0
+        self._fila = np.zeros(len(self.fases))
+        self._ultimo = 0.0
+
+    def activar(self, activo=True, historial=False):
+        """historial: guardar todos los frames (para volcar) en vez de solo los últimos"""
+        if activo and (len(self.datos) == 0 or historial != self.historial):
+            filas = CAPACIDAD_INICIAL if historial else VENTANA_PERFIL
+            self.datos = np.zeros((filas, len(self.fases)), dtype=np.float32)
+            self.n = 0
+            self.historial = historial
+        if activo and not self.activo:
+            # Si se activa a mitad de frame, ese frame solo cuenta desde aquí
+            self._fila[:] = 0
+            self._ultimo = time.perf_counter()
+        self.activo = activo
+
+    def inicio_frame(self):
+        if not self.activo:
+            return
+        self._fila[:] = 0
+        self._ultimo = time.perf_counter()
+
+    def marcar(self, fase):
+        """Suma a fase el tiempo transcurrido desde la marca anterior"""
+        if not self.activo:
+            return
+        ahora = time.perf_counter()
+        self._fila[self.indices[fase]] += ahora - self._ultimo
+        self._ultimo = ahora
+
+    def fin_frame(self):
+        if not self.activo:
+            return
+        if self.historial and self.n == len(self.datos):
+            self.datos = np.concatenate([self.datos, np.zeros_like(self.datos)])
+        self.datos[self.n % len(self.datos)] = self._fila * 1000
+        self.n += 1
+
+    def filas(self):
+        """Todas las filas guardadas, de la más antigua a la más nueva"""
+        if self.n <= len(self.datos):
+            return self.datos[:self.n]
+        inicio = self.n % len(self.datos)  # Anillo lleno: la más antigua va tras la última escrita
+        return np.concatenate([self.datos[inicio:], self.datos[:inicio]])
+
+    def recientes(self, frames=VENTANA_PERFIL):
+        """Últimas filas (frames x fases, en ms)"""
+        filas = self.filas()
+        return filas[max(0, len(filas) - frames):]
+
+    def estadisticas(self, frames=VENTANA_PERFIL):
+        """{fase: {'min', 'media', 'p95', 'p99'}} en ms; 'total' es el frame sin la espera"""
+        return resumir(self.fases, self.recientes(frames))
+
+    def volcar(self, archivo):
+        """Escribe las muestras guardadas: CSV si archivo acaba en .csv, si no binario"""
+        datos = self.filas()
+        if archivo.endswith(".csv"):
+            np.savetxt(archivo, datos, fmt="%.4f", delimiter=",",
+                       header=",".join(self.fases), comments="")
+            return
+        nombres = ",".join(self.fases).encode()
+        with open(archivo, 'wb') as f:
+            f.write(CABECERA.pack(MAGIA, VERSION_FORMATO, len(self.fases), len(datos), len(nombres)))
+            f.write(nombres)
+            f.write(datos.astype('<f4').tobytes())
+
+
+def resumir(fases, datos):
+    if len(datos) == 0:
+        return {}
+    total = datos.sum(axis=1)
+    if 'espera' in fases:
+        total = total - datos[:, fases.index('espera')]
+    columnas = list(zip(fases, datos.T)) + [('total', total)]
+    return {fase: {'min': float(valores.min()), 'media': float(valores.mean()),
+                   'p95': float(np.percentile(valores, 95)),
+                   'p99': float(np.percentile(valores, 99))}
+            for fase, valores in columnas}
+
+
+def leer_volcado(archivo):
+    """(fases, datos) de un volcado binario o CSV"""
+    if archivo.endswith(".csv"):
+        with open(archivo) as f:
+            fases = tuple(f.readline().strip().split(","))
+        datos = np.loadtxt(archivo, delimiter=",", skiprows=1, dtype=np.float32, ndmin=2)
+        return fases, datos
+    with open(archivo, 'rb') as f:
+        contenido = f.read()
+    magia, version, n_fases, n_frames, largo_nombres = CABECERA.unpack_from(contenido, 0)
+    if magia != MAGIA:
+        raise ValueError("No es un volcado del perfilador")
+    if version != VERSION_FORMATO:
+        raise ValueError(f"Versión de volcado no soportada: {version}")
+    inicio = CABECERA.size + largo_nombres
+    fases = tuple(contenido[CABECERA.size:inicio].decode().split(","))
+    datos = np.frombuffer(contenido, dtype='<f4', count=n_frames * n_fases, offset=inicio)
+    return fases, datos.reshape(n_frames, n_fases)
+
+
+# Compartido por el bucle del juego y la superposición
+PERFILADOR = Perfilador()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resumen de un volcado del perfilador")
+    parser.add_argument("archivo", help="Volcado .bin o .csv")
+    args = parser.parse_args()
+
+    fases, datos = leer_volcado(args.archivo)
+    print(f"{args.archivo}: {len(datos)} frames")
+    print(f"{'fase':<14}{'mín':>8}{'media':>8}{'p95':>8}{'p99':>8}")
+    for fase, valores in resumir(fases, datos).items():
+        print(f"{fase:<14}{valores['min']:8.3f}{valores['media']:8.3f}"
+              f"{valores['p95']:8.3f}{valores['p99']:8.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""Pilotos de referencia para la simulación sin pantalla.
+
+Un piloto recibe el estado de la nave en cada paso y devuelve la entrada
+(propulsor, izquierda, derecha), igual que el teclado en el juego. Sirven
+para calibrar la dificultad de los niveles sin jugar partidas a mano. Solo
+vuelan con el control clásico: con inclinación los laterales giran la nave.
+"""
+import hashlib
+import inspect
+import random
+from collections import deque
+
+from simulacion import (
+    ALTO, SUELO_ALTURA, BASE_ALTURA_SOBRE_SUELO, ALTURA_PATAS, GRAVEDAD,
+    EMPUJE, EMPUJE_LATERAL, VELOCIDAD_MAXIMA_ATERRIZAJE
+)
+
+ALTURA_BASE = ALTO - SUELO_ALTURA - BASE_ALTURA_SOBRE_SUELO
+
+
+def altura_sobre_base(nave):
+    """Distancia vertical entre las patas y la plataforma"""
+    return ALTURA_BASE - (nave.y + nave.alto + ALTURA_PATAS)
+
+
+def dirigir_hacia_base(nave, ganancia=0.02, velocidad_max=1.0, margen=0.05):
+    """(izquierda, derecha) para llevar la velocidad horizontal a la deseada"""
+    # La zona segura de EstadoNave está centrada medio ancho de nave a la izquierda
+    objetivo = nave.base_x - nave.ancho / 2
+    deseada = max(-velocidad_max, min(velocidad_max, (objetivo - nave.x) * ganancia))
+    error = deseada - nave.velocidad_x
+    if error > margen + EMPUJE_LATERAL / 2:
+        return False, True  # Empujar hacia la derecha
+    if error < -(margen + EMPUJE_LATERAL / 2):
+        return True, False  # Empujar hacia la izquierda
+    return False, False
+
+
+class Piloto:
+    """Interfaz de piloto: decidir(nave) -> (propulsor, izquierda, derecha)"""
+    nombre = "inactivo"
+
+    def reiniciar(self, rng):
+        """Se llama antes de cada vuelo con un rng propio del piloto"""
+
+    def procesar_evento(self, evento):
+        """Eventos de entrada del juego; los pilotos automáticos los ignoran"""
+
+    def decidir(self, nave):
+        return False, False, False
+
+    def __call__(self, nave):
+        return self.decidir(nave)
+
+    def parametros(self):
+        """Parámetros simples que definen el comportamiento del piloto"""
+        return {clave: valor for clave, valor in vars(self).items()
+                if isinstance(valor, (bool, int, float, str))}
+
+    def huella(self):
+        """Hash del código y los parámetros: cambia si cambia el piloto.
+
+        Se usa el código entero de los módulos de la clase y de sus bases, no
+        solo el de la clase: así también cuentan las funciones auxiliares
+        (dirigir_hacia_base, altura_sobre_base) y las constantes.
+        """
+        modulos = {inspect.getmodule(clase) for clase in type(self).__mro__ if clase is not object}
+        fuentes = sorted(inspect.getsource(modulo) for modulo in modulos)
+        datos = [type(self).__qualname__, *fuentes, repr(sorted(self.parametros().items()))]
+        return hashlib.sha1("\n".join(datos).encode()).hexdigest()[:16]
+
+
+class PilotoPerfil(Piloto):
+    """Perfil de descenso fijo: velocidad vertical objetivo según la altura"""
+    nombre = "perfil"
+
+    def __init__(self, pendiente=1 / 60, velocidad_final=1.0):
+        self.pendiente = pendiente
+        self.velocidad_final = velocidad_final
+
+    def decidir(self, nave):
+        objetivo = max(self.velocidad_final, altura_sobre_base(nave) * self.pendiente)
+        propulsor = nave.velocidad_y > objetivo
+        izquierda, derecha = dirigir_hacia_base(nave)
+        return propulsor, izquierda, derecha
+
+
+class PilotoFrenadoFinal(Piloto):
+    """Caída libre y frenado en el último momento posible"""
+    nombre = "frenado_final"
+
+    def __init__(self, margen=20, velocidad_contacto=1.5):
+        self.margen = margen
+        self.velocidad_contacto = velocidad_contacto
+
+    def decidir(self, nave):
+        deceleracion = EMPUJE - GRAVEDAD
+        exceso = max(0.0, nave.velocidad_y - self.velocidad_contacto)
+        distancia_frenado = exceso ** 2 / (2 * deceleracion)
+        propulsor = (distancia_frenado >= altura_sobre_base(nave) - self.margen or
+                     nave.velocidad_y > VELOCIDAD_MAXIMA_ATERRIZAJE * 0.9 and
+                     altura_sobre_base(nave) < self.margen)
+        izquierda, derecha = dirigir_hacia_base(nave)
+        return propulsor, izquierda, derecha
+
+
+class PilotoHumano(Piloto):
+    """Envuelve otro piloto con retraso de reacción, ruido y despistes"""
+
+    def __init__(self, piloto, reaccion=10, ruido=0.1, despiste=0.02):
+        self.piloto = piloto
+        self.reaccion = reaccion  # pasos de retraso
+        self.ruido = ruido  # probabilidad de invertir cada decisión
+        self.despiste = despiste  # probabilidad de soltar todos los controles
+        self.nombre = f"humano_{piloto.nombre}"
+        self.rng = random.Random()
+        self.pendientes = deque()
+
+    def huella(self):
+        datos = super().huella() + self.piloto.huella()
+        return hashlib.sha1(datos.encode()).hexdigest()[:16]
+
+    def reiniciar(self, rng):
+        self.rng = rng
+        self.piloto.reiniciar(rng)
+        self.pendientes = deque([(False, False, False)] * self.reaccion)
+
+    def decidir(self, nave):
+        decision = self.piloto.decidir(nave)
+        if self.rng.random() < self.ruido:
+            indice = self.rng.randrange(3)
+            decision = tuple(not d if i == indice else d for i, d in enumerate(decision))
+        self.pendientes.append(decision)
+        entrada = self.pendientes.popleft()
+        if self.rng.random() < self.despiste:
+            return False, False, False
+        return entrada
+
+
+# Pilotos de referencia disponibles por nombre
+PILOTOS = {
+    "perfil": PilotoPerfil,
+    "frenado_final": PilotoFrenadoFinal,
+    "humano_perfil": lambda **kwargs: PilotoHumano(PilotoPerfil(), **kwargs),
+    "humano_frenado_final": lambda **kwargs: PilotoHumano(PilotoFrenadoFinal(margen=60), **kwargs),
+}
+
+
+def crear_piloto(especificacion):
+    """Crea un piloto a partir de 'nombre' o 'nombre:clave=valor,clave=valor'"""
+    nombre, _, texto = especificacion.partition(":")
+    if nombre not in PILOTOS:
+        raise ValueError(f"Piloto desconocido: {nombre}")
+    kwargs = {}
+    for par in filter(None, texto.split(",")):
+        clave, valor = par.split("=")
+        kwargs[clave] = int(valor) if valor.lstrip("-").isdigit() else float(valor)
+    return PILOTOS[nombre](**kwargs)
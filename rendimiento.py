@@ -0,0 +1,358 @@
+"""Banco de pruebas de rendimiento reproducible.
+
+Ejecuta escenarios sin pantalla (driver "dummy" de SDL) con el código real del
+juego y una semilla fija. Cada frame es un paso de física más el dibujo
+completo (fondo, escape, nave, efectos, estela y HUD), como en el bucle
+principal pero sin la espera del reloj ni el flip:
+
+- descenso: la nave cae sin tocar los mandos.
+- propulsor: propulsor principal encendido todo el rato, con su escape.
+- explosion: el pico de EfectosVisuales.crear_explosion (destello, onda y
+  partículas).
+- exito: EfectosVisuales.crear_efecto_exito.
+- resultados: el frame más dibujar_resultados encima.
+
+De cada escenario se guardan los FPS, los percentiles del tiempo de frame y
+las asignaciones por frame. Estas se miden en una pasada aparte con
+tracemalloc, para no inflar los tiempos: pico de memoria asignada dentro del
+frame y bloques que quedan vivos al acabarlo. Además se mide el ritmo de
+Nave.actualizar en pasos por segundo y el arranque de Sonidos, en frío
+(generando los WAV) y con los WAV ya en disco.
+
+Los resultados van a un JSON y se comparan entre commits:
+
+    python rendimiento.py ejecutar --salida antes.json
+    python rendimiento.py ejecutar --salida despues.json
+    python rendimiento.py comparar antes.json despues.json --umbral 10
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import datetime
+import gc
+import json
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pygame
+
+import game
+from calidad import NIVELES_CALIDAD
+from estela import CapaEstela, LARGO_ESTELA, INTERVALO_ESTELA
+from grabacion import crear_rng
+from pilotos import crear_piloto
+from simulacion import ANCHO, ALTO, EMPUJE, GRAVEDAD
+
+VERSION_FORMATO = 1
+SEMILLA_RENDIMIENTO = 20240601
+NIVEL_RENDIMIENTO = 1
+FRAMES_ESCENARIO = 150  # Por ronda: a la nave sin mandos le da tiempo a caer sin tocar el suelo
+RONDAS_ESCENARIO = 4
+FRAMES_CALENTAMIENTO = 30  # Primera ronda: cachés de sprites, textos y fondo
+PASOS_ACTUALIZAR = 20000
+REPETICIONES_SONIDOS = 5
+DIRECTORIO_JUEGO = os.path.dirname(os.path.abspath(__file__))
+UMBRAL_REGRESION = 10.0  # % de empeoramiento a partir del cual se marca una métrica
+
+# Métricas que se comparan y si mejoran al subir (True) o al bajar (False).
+# bloques_frame no: es un saldo cercano a 0 y su % de cambio no dice nada
+METRICAS = {
+    'fps': True,
+    'ms_p50': False,
+    'ms_p95': False,
+    'ms_p99': False,
+    'kb_frame': False,
+    'pasos_por_segundo': True,
+    'arranque_frio_ms': False,
+    'arranque_ms': False,
+}
+
+
+class Ronda:
+    """Base, fondo, nave y estela de una ronda, como los prepara game.main"""
+
+    def __init__(self, semilla, nivel=NIVEL_RENDIMIENTO, calidad=NIVELES_CALIDAD[0]):
+        rng = crear_rng(semilla)
+        self.calidad = calidad
+        self.base = game.Base(nivel, rng)
+        self.fondo = game.CapaFondo(game.Estrellas(random.Random(semilla + 3)), self.base)
+        self.nave = game.Nave(nivel, rng, random.Random(semilla + 1))
+        self.nave.base = self.base
+        self.nave.base_x = self.base.x
+        self.nave.efectos.ajustar_calidad(calidad)
+        self.capa_estela = CapaEstela((ANCHO, ALTO))
+        self.vida_estela = int(LARGO_ESTELA * INTERVALO_ESTELA * calidad['estela'])
+
+    def paso(self, entrada):
+        nave = self.nave
+        if not nave.terminado:
+            nave.propulsor_activo, nave.propulsor_izquierda, nave.propulsor_derecha = entrada
+        nave.actualizar()
+        nave.efectos.actualizar()
+
+    def dibujar(self, pantalla):
+        nave = self.nave
+        self.fondo.dibujar(pantalla, nave.viento, self.calidad)
+        nave.escape.dibujar(pantalla)
+        nave.dibujar(pantalla, 1.0)
+        nave.efectos.dibujar(pantalla)
+        self.capa_estela.dibujar(pantalla, nave.estela, 1, self.vida_estela)
+        game.dibujar_hud(pantalla, nave)
+
+
+def _ronda_sin_mandos(semilla):
+    ronda = Ronda(semilla)
+    return ronda, (False, False, False), None
+
+
+def _ronda_propulsor(semilla):
+    ronda = Ronda(semilla)
+    # Empieza cayendo lo justo para que el empuje la frene y la devuelva a la
+    # altura inicial al final de la ronda: toda la ronda queda dentro de la pantalla
+    ronda.nave.velocidad_y = FRAMES_ESCENARIO * (EMPUJE - GRAVEDAD) / 2
+    return ronda, (True, False, False), None
+
+
+def _ronda_explosion(semilla):
+    ronda = Ronda(semilla)
+    ronda.nave.efectos.crear_explosion(ronda.nave.x, ronda.nave.y + ronda.nave.alto)
+    return ronda, (False, False, False), None
+
+
+def _ronda_exito(semilla):
+    ronda = Ronda(semilla)
+    ronda.nave.efectos.crear_efecto_exito(ronda.nave.x, ronda.nave.y + ronda.nave.alto)
+    return ronda, (False, False, False), None
+
+
+def _ronda_resultados(semilla):
+    """Vuelo completo con un piloto automático y la pantalla de resultados encima"""
+    ronda = Ronda(semilla)
+    piloto = crear_piloto("perfil")
+    piloto.reiniciar(random.Random(semilla + 2))
+    while not ronda.nave.terminado:
+        ronda.paso(piloto.decidir(ronda.nave))
+    ronda.nave.calcular_puntuacion()
+    records = [{'puntuacion': 3000 - 150 * i, 'fecha': ""} for i in range(10)]
+
+    def superponer(pantalla):
+        game.dibujar_resultados(pantalla, ronda.nave, records, True, 3)
+    return ronda, (False, False, False), superponer
+
+
+ESCENARIOS = {
+    'descenso': _ronda_sin_mandos,
+    'propulsor': _ronda_propulsor,
+    'explosion': _ronda_explosion,
+    'exito': _ronda_exito,
+    'resultados': _ronda_resultados,
+}
+
+
+def _frame(pantalla, ronda, entrada, superponer):
+    ronda.paso(entrada)
+    ronda.dibujar(pantalla)
+    if superponer is not None:
+        superponer(pantalla)
+
+
+def medir_escenario(nombre, pantalla, semilla=SEMILLA_RENDIMIENTO,
+                    frames=FRAMES_ESCENARIO, rondas=RONDAS_ESCENARIO):
+    """Tiempos de frame (ms) y asignaciones por frame de un escenario"""
+    crear_ronda = ESCENARIOS[nombre]
+
+    # Calentamiento: la primera vez se construyen sprites, textos y fondo
+    ronda, entrada, superponer = crear_ronda(semilla)
+    for _ in range(FRAMES_CALENTAMIENTO):
+        _frame(pantalla, ronda, entrada, superponer)
+
+    tiempos = []
+    for i in range(rondas):
+        ronda, entrada, superponer = crear_ronda(semilla + 10 * i)
+        gc.collect()
+        for _ in range(frames):
+            inicio = time.perf_counter()
+            _frame(pantalla, ronda, entrada, superponer)
+            tiempos.append(time.perf_counter() - inicio)
+    tiempos = np.array(tiempos) * 1000
+
+    # Asignaciones, en una pasada aparte: tracemalloc ralentiza mucho cada asignación
+    ronda, entrada, superponer = crear_ronda(semilla)
+    picos = []
+    bloques = []
+    tracemalloc.start()
+    try:
+        for _ in range(frames):
+            antes = tracemalloc.get_traced_memory()[0]
+            bloques_antes = sys.getallocatedblocks()
+            tracemalloc.reset_peak()
+            _frame(pantalla, ronda, entrada, superponer)
+            picos.append(tracemalloc.get_traced_memory()[1] - antes)
+            bloques.append(sys.getallocatedblocks() - bloques_antes)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'frames': len(tiempos),
+        'fps': float(len(tiempos) / (tiempos.sum() / 1000)),
+        'ms_media': float(tiempos.mean()),
+        'ms_p50': float(np.percentile(tiempos, 50)),
+        'ms_p95': float(np.percentile(tiempos, 95)),
+        'ms_p99': float(np.percentile(tiempos, 99)),
+        'ms_max': float(tiempos.max()),
+        'kb_frame': float(np.mean(picos) / 1024),
+        'bloques_frame': float(np.mean(bloques)),
+    }
+
+
+def medir_actualizar(pasos=PASOS_ACTUALIZAR, semilla=SEMILLA_RENDIMIENTO):
+    """Pasos por segundo de Nave.actualizar (física, escape y estela) con un piloto"""
+    piloto = crear_piloto("perfil")
+    total = 0
+    duracion = 0.0
+    ronda_indice = 0
+    while total < pasos:
+        ronda = Ronda(semilla + ronda_indice)
+        piloto.reiniciar(random.Random(semilla + ronda_indice + 2))
+        nave = ronda.nave
+        ronda_indice += 1
+        inicio = time.perf_counter()
+        while not nave.terminado and total < pasos:
+            nave.propulsor_activo, nave.propulsor_izquierda, nave.propulsor_derecha = piloto.decidir(nave)
+            nave.actualizar()
+            total += 1
+        duracion += time.perf_counter() - inicio
+    return {'pasos': total, 'pasos_por_segundo': total / duracion}
+
+
+def medir_sonidos(repeticiones=REPETICIONES_SONIDOS):
+    """Arranque de Sonidos en ms: en frío (genera los WAV) y con los WAV ya guardados"""
+    from sonidos import Sonidos
+
+    frio = []
+    caliente = []
+    directorio_actual = os.getcwd()
+    try:
+        for _ in range(repeticiones):
+            with tempfile.TemporaryDirectory() as directorio:
+                os.chdir(directorio)  # Sonidos usa la carpeta sounds/ del directorio actual
+                inicio = time.perf_counter()
+                Sonidos()
+                frio.append(time.perf_counter() - inicio)
+                inicio = time.perf_counter()
+                Sonidos()
+                caliente.append(time.perf_counter() - inicio)
+                os.chdir(directorio_actual)
+    finally:
+        os.chdir(directorio_actual)
+    return {'arranque_frio_ms': 1000 * min(frio), 'arranque_ms': 1000 * min(caliente)}
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, cwd=DIRECTORIO_JUEGO,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def ejecutar(escenarios=tuple(ESCENARIOS), semilla=SEMILLA_RENDIMIENTO):
+    pantalla = game.iniciar_pantalla()
+    resultados = {
+        'version': VERSION_FORMATO,
+        'fecha': datetime.datetime.now().isoformat(timespec="seconds"),
+        'commit': _commit(),
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'plataforma': platform.platform(),
+        'semilla': semilla,
+        'escenarios': {},
+    }
+    for nombre in escenarios:
+        resultados['escenarios'][nombre] = medir_escenario(nombre, pantalla, semilla)
+        _imprimir(nombre, resultados['escenarios'][nombre])
+    resultados['actualizar'] = medir_actualizar(semilla=semilla)
+    _imprimir('actualizar', resultados['actualizar'])
+    resultados['sonidos'] = medir_sonidos()
+    _imprimir('sonidos', resultados['sonidos'])
+    return resultados
+
+
+def _imprimir(nombre, metricas):
+    print(f"{nombre:<12}" + "  ".join(f"{clave} {valor:.3f}" if isinstance(valor, float) else
+                                     f"{clave} {valor}" for clave, valor in metricas.items()))
+
+
+def _metricas(resultados):
+    """{(grupo, métrica): valor} de las métricas comparables"""
+    grupos = dict(resultados['escenarios'])
+    grupos['actualizar'] = resultados.get('actualizar', {})
+    grupos['sonidos'] = resultados.get('sonidos', {})
+    return {(grupo, metrica): valor
+            for grupo, valores in grupos.items()
+            for metrica, valor in valores.items() if metrica in METRICAS}
+
+
+def comparar(anterior, nuevo, umbral=UMBRAL_REGRESION):
+    """[(grupo, métrica, antes, después, % de cambio, regresión)] de las métricas comunes"""
+    antes = _metricas(anterior)
+    despues = _metricas(nuevo)
+    filas = []
+    for clave in antes:
+        if clave not in despues:
+            continue
+        a, d = antes[clave], despues[clave]
+        cambio = 100 * (d - a) / abs(a) if a else (0.0 if d == a else float("inf") * np.sign(d - a))
+        empeora = -cambio if METRICAS[clave[1]] else cambio
+        filas.append((*clave, a, d, cambio, empeora > umbral))
+    return filas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Banco de pruebas de rendimiento sin pantalla")
+    ordenes = parser.add_subparsers(dest="orden", required=True)
+    orden_ejecutar = ordenes.add_parser("ejecutar", help="Ejecutar los escenarios")
+    orden_ejecutar.add_argument("--salida", default="rendimiento.json", help="JSON de resultados")
+    orden_ejecutar.add_argument("--escenarios", nargs="+", choices=list(ESCENARIOS),
+                                default=list(ESCENARIOS))
+    orden_ejecutar.add_argument("--semilla", type=int, default=SEMILLA_RENDIMIENTO)
+    orden_comparar = ordenes.add_parser("comparar", help="Comparar dos JSON de resultados")
+    orden_comparar.add_argument("anterior")
+    orden_comparar.add_argument("nuevo")
+    orden_comparar.add_argument("--umbral", type=float, default=UMBRAL_REGRESION,
+                                help="%% de empeoramiento que cuenta como regresión")
+    args = parser.parse_args()
+
+    if args.orden == "ejecutar":
+        resultados = ejecutar(args.escenarios, args.semilla)
+        with open(args.salida, 'w') as f:
+            json.dump(resultados, f, indent=2)
+        print(f"Resultados en {args.salida}")
+        return 0
+
+    with open(args.anterior) as f:
+        anterior = json.load(f)
+    with open(args.nuevo) as f:
+        nuevo = json.load(f)
+    print(f"{anterior.get('commit')} -> {nuevo.get('commit')} (umbral {args.umbral:.0f}%)")
+    regresiones = 0
+    for grupo, metrica, antes, despues, cambio, regresion in comparar(anterior, nuevo, args.umbral):
+        marca = "  REGRESIÓN" if regresion else ""
+        regresiones += regresion
+        print(f"{grupo:<12}{metrica:<20}{antes:12.3f}{despues:12.3f}{cambio:+9.1f}%{marca}")
+    print(f"{regresiones} regresiones")
+    return 1 if regresiones else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,8 @@
 import json
 import os
 
+DIRECTORIO_REPETICIONES = "repeticiones"  # Grabaciones de las partidas del top 10
+
 class TableroRecords:
     def __init__(self):
         self.archivo = "high_scores.json"
@@ -22,6 +24,13 @@ class TableroRecords:
     def agregar_puntuacion(self, puntuacion):
         self.puntuaciones.append(puntuacion)
         self.puntuaciones.sort(key=lambda x: x['puntuacion'], reverse=True)
+        # Las repeticiones de las puntuaciones que salen del top 10 ya no se usan
+        for descartada in self.puntuaciones[10:]:
+            if descartada.get('repeticion'):
+                try:
+                    os.remove(descartada['repeticion'])
+                except OSError:
+                    pass
         self.puntuaciones = self.puntuaciones[:10]  # Mantener solo los 10 mejores
         self.guardar_puntuaciones()
 
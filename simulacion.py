@@ -0,0 +1,445 @@
+"""Núcleo de simulación del aterrizaje lunar, sin pantalla ni sonido.
+
+Este módulo no importa pygame: contiene las constantes físicas, la colocación
+de la base, las reglas de aterrizaje/accidente y el cálculo de puntuación que
+usa el juego interactivo. El tiempo es simulado (pasos de 1/FPS segundos), de
+forma que se pueden ejecutar miles de vuelos sin ventana.
+"""
+import math
+import random
+
+# Constantes de pantalla y física (por paso de simulación)
+ANCHO = 800
+ALTO = 600
+FPS = 60
+GRAVEDAD = 0.03  # Gravedad lunar constante para todos los niveles
+EMPUJE = 0.1
+EMPUJE_LATERAL = 0.08
+VIENTO_MAX = 0.025     # Reducido de 0.03 a 0.02
+CAMBIO_VIENTO = 0.02   # Reducido de 0.2 a 0.02 (10 veces menos frecuente)
+VIENTO_INCREMENTO = 0.001  # Nueva constante para cambio gradual
+FUEL_INICIAL = 400
+BASE_ANCHO = 60  # Ancho de la base de aterrizaje
+BASE_X = ANCHO // 2  # Posición X de la base (centro)
+VELOCIDAD_MAXIMA_ATERRIZAJE = 3.0  # Nueva constante para velocidad máxima de aterrizaje
+BASE_ALTURA_SOBRE_SUELO = 30  # Altura de la base sobre la superficie lunar
+SUELO_ALTURA = 50  # Altura del suelo lunar (ya existente como valor fijo, ahora como constante)
+BASE_MARGEN = 100  # Margen mínimo desde los bordes para colocar la base
+ALTURA_PATAS = 10  # Longitud de las patas de aterrizaje
+ESPERA_PUNTUACION = 1500  # ms entre el aterrizaje y el cálculo de la puntuación
+VELOCIDAD_GIRO = 2.0  # Grados por paso al girar en el modo de inclinación
+ANGULO_MAXIMO = 90  # Inclinación máxima a cada lado (grados)
+ANGULO_MAXIMO_ATERRIZAJE = 10  # Inclinación máxima para aterrizar sin romper las patas
+
+FUEL_POR_NIVEL = {  # Combustible según el nivel
+    1: 500,    # Nivel fácil: mucho combustible
+    2: 300,    # Nivel medio: combustible moderado
+    3: 150     # Nivel difícil: poco combustible
+}
+
+VIENTO_POR_NIVEL = {  # Intensidad del viento según el nivel
+    1: 0.01,   # Nivel fácil: viento muy suave
+    2: 0.03,   # Nivel medio: viento moderado
+    3: 0.05    # Nivel difícil: viento fuerte
+}
+
+DESPLAZAMIENTO_BASE_POR_NIVEL = {  # Fracción del espacio disponible para colocar la base
+    1: 0.2,    # Nivel fácil: Base cerca del centro (±20%)
+    2: 0.4,    # Nivel medio: Base más alejada (±40%)
+    3: 0.7     # Nivel difícil: Base casi en cualquier lugar (±70%)
+}
+
+RAZON_FUERA_ZONA = "¡Fuera de la zona de aterrizaje!"
+RAZON_FUERA_BASE = "¡Aterrizaje fuera de la base!"
+RAZON_INCLINACION = "¡Inclinación excesiva!"
+
+
+def posicion_base(nivel=1, rng=random, fraccion=None):
+    """Devuelve la posición X de la base para un nivel, igual que Base(nivel)"""
+    margen = BASE_MARGEN
+    if fraccion is None:
+        fraccion = DESPLAZAMIENTO_BASE_POR_NIVEL.get(nivel, 0.7)
+    desplazamiento_max = (ANCHO - 2*margen) * fraccion
+
+    # Posición aleatoria dentro del rango permitido
+    desplazamiento = rng.uniform(-desplazamiento_max, desplazamiento_max)
+    x = ANCHO//2 + desplazamiento
+
+    # Asegurar que la base no quede muy cerca de los bordes
+    return max(margen + BASE_ANCHO//2, min(ANCHO - margen - BASE_ANCHO//2, x))
+
+
+def calcular_puntuacion(estrellado, velocidad_final, fuel, fuel_inicial,
+                        tiempo_transcurrido, distancia_centro=None):
+    """Devuelve (puntuacion, desglose) con las reglas del juego"""
+    if estrellado:
+        return 0, {
+            'base': 0,
+            'velocidad': 0,
+            'fuel': 0,
+            'tiempo': 0,
+            'precisión': 0  # Añadir esto para evitar KeyError
+        }
+
+    # Puntuación base
+    puntos_base = 500
+
+    # Bonus por velocidad
+    if velocidad_final < 0.5:
+        bonus_velocidad = 1000
+    elif velocidad_final < 1.0:
+        bonus_velocidad = 800
+    elif velocidad_final < 1.5:
+        bonus_velocidad = 500
+    else:
+        bonus_velocidad = 200
+
+    # Bonus por combustible
+    porcentaje_fuel = (fuel / fuel_inicial)
+    bonus_fuel = int(1000 * (porcentaje_fuel ** 2))
+
+    # Bonus por tiempo
+    if tiempo_transcurrido < 20:
+        bonus_tiempo = 500
+    elif tiempo_transcurrido < 30:
+        bonus_tiempo = 300
+    elif tiempo_transcurrido < 40:
+        bonus_tiempo = 100
+    else:
+        bonus_tiempo = max(0, int(500 - (tiempo_transcurrido - 20) * 10))
+
+    # Bonus por precisión
+    if distancia_centro is not None:
+        precision = 1 - min(1.0, (distancia_centro / (BASE_ANCHO//2)))
+        bonus_precision = int(1000 * (precision ** 2))
+    else:
+        # Si no tenemos información de distancia, asumimos precisión media
+        bonus_precision = 500
+
+    puntuacion = puntos_base + bonus_velocidad + bonus_fuel + bonus_tiempo + bonus_precision
+    return puntuacion, {
+        'base': puntos_base,
+        'velocidad': bonus_velocidad,
+        'fuel': bonus_fuel,
+        'tiempo': bonus_tiempo,
+        'precisión': bonus_precision
+    }
+
+
+def _primer_paso_contacto(y, velocidad, aceleracion, y_contacto, limite=None):
+    """Primer paso n >= 1 con y + n*v + a*n*(n+1)/2 >= y_contacto, o None.
+
+    Es la posición exacta tras n pasos de avanzar() con aceleración constante
+    (la velocidad se actualiza antes que la posición).
+    """
+    a = aceleracion / 2
+    b = velocidad + aceleracion / 2
+    c = y - y_contacto
+    if limite == 0:
+        return None
+    if c >= 0:
+        return 1
+    if a == 0:
+        if b <= 0:
+            return None
+        n = math.ceil(-c / b)
+    else:
+        discriminante = b * b - 4 * a * c
+        if discriminante < 0:
+            return None
+        raiz = math.sqrt(discriminante)
+        r1, r2 = sorted(((-b - raiz) / (2 * a), (-b + raiz) / (2 * a)))
+        if a > 0:
+            n = math.ceil(r2)
+        else:
+            # Empuje neto hacia arriba: solo toca si el primer cruce es real
+            n = math.ceil(r1)
+            if n > r2:
+                return None
+        n = max(1, n)
+    # Corregir errores de redondeo del ceil
+    if n > 1 and y + (n - 1) * velocidad + aceleracion * (n - 1) * n / 2 >= y_contacto:
+        n -= 1
+    if limite is not None and n > limite:
+        return None
+    return n
+
+
+def _avanzar_tramos(posicion, velocidad, aceleracion, pasos_tramo, aceleracion_final, n):
+    """Posición y velocidad tras n pasos: aceleración durante pasos_tramo, luego aceleracion_final"""
+    k = min(n, pasos_tramo)
+    posicion += k * velocidad + aceleracion * k * (k + 1) / 2
+    velocidad += k * aceleracion
+    m = n - k
+    return (posicion + m * velocidad + aceleracion_final * m * (m + 1) / 2,
+            velocidad + m * aceleracion_final)
+
+
+def _pasos_con_fuel(fuel, consumo, reserva=0):
+    """Pasos seguidos en que fuel - reserva > 0 gastando consumo por paso"""
+    if fuel <= reserva:
+        return 0
+    return math.ceil((fuel - reserva) / consumo)
+
+
+def predecir_contacto(nave):
+    """Predicción en forma cerrada del contacto con la altura de la base.
+
+    Supone aceleración constante a trozos: primero con los propulsores
+    actuales mientras quede combustible y después solo gravedad, con el
+    viento actual en todo el vuelo. Cuesta O(1) sin importar lo lejos que
+    esté el contacto. No tiene en cuenta los límites laterales de la pantalla
+    ni los cambios futuros del viento. Devuelve None si ya ha terminado.
+    """
+    if nave.aterrizado or nave.estrellado:
+        return None
+
+    y_contacto = ALTO - SUELO_ALTURA - BASE_ALTURA_SOBRE_SUELO - nave.alto - ALTURA_PATAS
+
+    # Pasos con cada propulsor: el lateral solo empuja si el principal deja combustible
+    lateral = nave.propulsor_izquierda or nave.propulsor_derecha
+    if nave.propulsor_activo:
+        consumo = 1.5 if lateral else 1
+        pasos_principal = _pasos_con_fuel(nave.fuel, consumo)
+        pasos_lateral = _pasos_con_fuel(nave.fuel, consumo, reserva=1) if lateral else 0
+    else:
+        pasos_principal = 0
+        pasos_lateral = _pasos_con_fuel(nave.fuel, 0.5) if lateral else 0
+    if nave.inclinacion:
+        # Los laterales solo giran la nave; se supone que mantiene el ángulo actual
+        empuje_x, empuje_y = empuje_inclinado(nave.angulo)
+        pasos_x, empuje_lateral = pasos_principal, empuje_x
+    else:
+        empuje_y = -EMPUJE
+        pasos_x = pasos_lateral
+        empuje_lateral = -EMPUJE_LATERAL if nave.propulsor_izquierda else EMPUJE_LATERAL
+
+    # Tramo con el propulsor principal y, si no toca antes, caída libre
+    gravedad = nave.gravedad
+    n = _primer_paso_contacto(nave.y, nave.velocidad_y, gravedad + empuje_y, y_contacto,
+                              pasos_principal)
+    if n is None:
+        y, velocidad_y = _avanzar_tramos(nave.y, nave.velocidad_y, gravedad + empuje_y,
+                                         pasos_principal, gravedad, pasos_principal)
+        n = pasos_principal + _primer_paso_contacto(y, velocidad_y, gravedad, y_contacto)
+    _, velocidad_y = _avanzar_tramos(nave.y, nave.velocidad_y, gravedad + empuje_y,
+                                     pasos_principal, gravedad, n)
+    x, velocidad_x = _avanzar_tramos(nave.x, nave.velocidad_x, nave.viento + empuje_lateral,
+                                     pasos_x, nave.viento, n)
+
+    x = max(nave.ancho / 2, min(ANCHO - nave.ancho / 2, x))
+    sobre_base = (x + nave.ancho > nave.base_x - nave.base_ancho//2 and
+                  x < nave.base_x + nave.base_ancho//2)
+    seguro = (sobre_base and abs(velocidad_y) <= VELOCIDAD_MAXIMA_ATERRIZAJE and
+              abs(velocidad_x) <= VELOCIDAD_MAXIMA_ATERRIZAJE / 2 and
+              abs(nave.angulo) <= ANGULO_MAXIMO_ATERRIZAJE)
+    return {
+        'pasos': n,
+        'segundos': n / FPS,
+        'x': x,
+        'velocidad_x': velocidad_x,
+        'velocidad_y': velocidad_y,
+        'sobre_base': sobre_base,
+        'seguro': seguro
+    }
+
+
+def empuje_inclinado(angulo):
+    """Aceleración (x, y) del propulsor principal con la nave inclinada angulo grados.
+
+    El ángulo es positivo en sentido antihorario (morro hacia la izquierda),
+    como en pygame.transform.rotate; con 0 es (0, -EMPUJE).
+    """
+    radianes = math.radians(angulo)
+    return -EMPUJE * math.sin(radianes), -EMPUJE * math.cos(radianes)
+
+
+class EstadoNave:
+    """Estado físico de la nave; avanzar() aplica un paso de simulación.
+
+    Con inclinacion=True las teclas laterales giran la nave en lugar de
+    empujarla de lado, y el propulsor principal empuja en la dirección del
+    morro.
+    """
+
+    def __init__(self, nivel=1, base_x=BASE_X, fuel=None, viento_max=None, inclinacion=False):
+        self.x = ANCHO // 2
+        self.y = 100
+        self.ancho = 40
+        self.alto = 60
+        self.velocidad_x = 0
+        self.velocidad_y = 0
+        self.angulo = 0.0  # Grados, positivo hacia la izquierda
+        self.inclinacion = inclinacion
+
+        # Ajustar valores según el nivel
+        self.nivel = nivel
+        self.fuel_inicial = FUEL_POR_NIVEL.get(nivel, 400) if fuel is None else fuel
+        self.fuel = self.fuel_inicial
+        self.gravedad = GRAVEDAD  # Usar la gravedad constante
+        self.viento_max = VIENTO_POR_NIVEL.get(nivel, 0.02) if viento_max is None else viento_max
+
+        self.propulsor_activo = False
+        self.propulsor_izquierda = False
+        self.propulsor_derecha = False
+        # Propulsores que realmente empujaron en el último paso (con combustible)
+        self.empuje_principal = False
+        self.empuje_lateral = False
+
+        self.viento = 0
+        self.direccion_viento = 1
+
+        self.base_x = base_x
+        self.base_ancho = BASE_ANCHO
+
+        self.aterrizado = False
+        self.estrellado = False
+        self.razon_accidente = ""
+        self.velocidad_final = 0
+        self.distancia_centro = None
+        self.puntuacion = 0
+        self.desglose = {}
+
+        self.pasos = 0  # Tiempo simulado en pasos de 1/FPS segundos
+
+    def avanzar(self, entrada=None, rng=random):
+        """Aplica un paso de física; entrada = (propulsor, izquierda, derecha)"""
+        if self.aterrizado or self.estrellado:
+            return
+
+        if entrada is not None:
+            self.propulsor_activo, self.propulsor_izquierda, self.propulsor_derecha = entrada
+
+        self.pasos += 1
+        self.empuje_principal = False
+        self.empuje_lateral = False
+
+        # Actualizar viento
+        if rng.random() < CAMBIO_VIENTO:
+            if abs(self.viento) >= self.viento_max:
+                self.direccion_viento *= -1
+            self.viento += VIENTO_INCREMENTO * self.direccion_viento
+
+        # Limitar el viento
+        self.viento = max(-self.viento_max, min(self.viento_max, self.viento))
+
+        # Aplicar gravedad
+        self.velocidad_y += self.gravedad
+
+        # Aplicar viento a la velocidad horizontal
+        self.velocidad_x += self.viento
+
+        # Controles de la nave
+        if self.propulsor_activo and self.fuel > 0:
+            if self.inclinacion:
+                empuje_x, empuje_y = empuje_inclinado(self.angulo)
+                self.velocidad_x += empuje_x
+                self.velocidad_y += empuje_y
+            else:
+                self.velocidad_y -= EMPUJE
+            self.fuel = max(0, self.fuel - 1)
+            self.empuje_principal = True
+
+        # Propulsores laterales (en el modo de inclinación giran la nave)
+        if self.inclinacion:
+            giro = VELOCIDAD_GIRO if self.propulsor_izquierda else -VELOCIDAD_GIRO
+            if (self.propulsor_izquierda or self.propulsor_derecha) and self.fuel > 0:
+                self.angulo = max(-ANGULO_MAXIMO, min(ANGULO_MAXIMO, self.angulo + giro))
+                self.fuel = max(0, self.fuel - 0.5)
+                self.empuje_lateral = True
+        elif self.propulsor_izquierda and self.fuel > 0:
+            self.velocidad_x -= EMPUJE_LATERAL
+            self.fuel = max(0, self.fuel - 0.5)
+            self.empuje_lateral = True
+        elif self.propulsor_derecha and self.fuel > 0:
+            self.velocidad_x += EMPUJE_LATERAL
+            self.fuel = max(0, self.fuel - 0.5)
+            self.empuje_lateral = True
+
+        # Actualizar posición
+        self.x += self.velocidad_x
+        self.y += self.velocidad_y
+
+        # Mantener la nave dentro de los límites horizontales
+        if self.x < self.ancho / 2:
+            self.x = self.ancho / 2
+            self.velocidad_x = 0
+        elif self.x > ANCHO - self.ancho / 2:
+            self.x = ANCHO - self.ancho / 2
+            self.velocidad_x = 0
+
+        # Verificar aterrizaje
+        altura_base = ALTO - SUELO_ALTURA - BASE_ALTURA_SOBRE_SUELO
+
+        # Verificar si está sobre la base usando la posición actual de la base
+        sobre_base = (self.x + self.ancho > self.base_x - self.base_ancho//2 and
+                      self.x < self.base_x + self.base_ancho//2)
+
+        if self.y + self.alto + ALTURA_PATAS >= altura_base:
+            velocidad_vertical = abs(self.velocidad_y)
+            velocidad_horizontal = abs(self.velocidad_x)
+
+            if sobre_base:
+                # Ajustar la posición de la nave para que las patas toquen la base
+                self.y = altura_base - self.alto - ALTURA_PATAS
+
+                if velocidad_vertical > VELOCIDAD_MAXIMA_ATERRIZAJE or velocidad_horizontal > VELOCIDAD_MAXIMA_ATERRIZAJE / 2:
+                    self.estrellado = True
+                    self.razon_accidente = f"¡Velocidad excesiva! V: {velocidad_vertical:.1f} H: {velocidad_horizontal:.1f}"
+                elif abs(self.angulo) > ANGULO_MAXIMO_ATERRIZAJE:
+                    self.estrellado = True
+                    self.razon_accidente = RAZON_INCLINACION
+                else:
+                    self.aterrizado = True
+                    self.velocidad_x = 0
+                    self.velocidad_y = 0
+            else:
+                self.estrellado = True
+                self.razon_accidente = RAZON_FUERA_ZONA
+
+        # Luego verificar colisión con el suelo
+        elif self.y + self.alto + ALTURA_PATAS >= ALTO - SUELO_ALTURA:
+            self.estrellado = True
+            self.velocidad_final = (self.velocidad_x ** 2 + self.velocidad_y ** 2) ** 0.5
+
+            # Asignar una distancia_centro predeterminada (fuera de la base)
+            self.distancia_centro = ANCHO
+
+            self.razon_accidente = RAZON_FUERA_BASE
+
+            self.velocidad_x = 0
+            self.velocidad_y = 0
+
+    @property
+    def terminado(self):
+        return self.aterrizado or self.estrellado
+
+    def tiempo_transcurrido(self):
+        """Segundos desde el inicio hasta que se calcula la puntuación"""
+        espera = ESPERA_PUNTUACION / 1000 if self.aterrizado else 0
+        return self.pasos / FPS + espera
+
+    def calcular_puntuacion(self):
+        self.puntuacion, self.desglose = calcular_puntuacion(
+            self.estrellado,
+            self.velocidad_final,
+            self.fuel,
+            self.fuel_inicial,
+            self.tiempo_transcurrido(),
+            self.distancia_centro
+        )
+
+
+def simular_vuelo(piloto, nivel=1, rng=random, max_pasos=FPS * 120,
+                  fraccion_base=None, **kwargs):
+    """Simula un vuelo completo sin pantalla.
+
+    piloto es un callable que recibe el EstadoNave y devuelve la entrada
+    (propulsor, izquierda, derecha). La base se coloca con el mismo rng antes
+    del primer paso, en el mismo orden que el juego interactivo.
+    """
+    nave = EstadoNave(nivel, base_x=posicion_base(nivel, rng, fraccion_base), **kwargs)
+    while not nave.terminado and nave.pasos < max_pasos:
+        nave.avanzar(piloto(nave), rng)
+    nave.calcular_puntuacion()
+    return nave
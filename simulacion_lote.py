@@ -0,0 +1,260 @@
+"""Simulación por lotes: N naves avanzando a la vez con arrays de NumPy.
+
+Aplica exactamente las reglas de EstadoNave.avanzar (gravedad, empuje,
+consumo de combustible, viento aleatorio, límites laterales y contacto con la
+base o el suelo) sobre arrays, de forma que cada paso cuesta unas pocas
+operaciones vectoriales sin importar cuántas naves haya. Cada nave tiene su
+propia base, nivel y entrada por paso. Solo cubre el control clásico (sin
+el modo de inclinación de EstadoNave).
+"""
+import numpy as np
+
+from simulacion import (
+    ANCHO, ALTO, FPS, GRAVEDAD, EMPUJE, EMPUJE_LATERAL, CAMBIO_VIENTO,
+    VIENTO_INCREMENTO, BASE_ANCHO, BASE_MARGEN, VELOCIDAD_MAXIMA_ATERRIZAJE,
+    BASE_ALTURA_SOBRE_SUELO, SUELO_ALTURA, ALTURA_PATAS, ESPERA_PUNTUACION,
+    FUEL_POR_NIVEL, VIENTO_POR_NIVEL, DESPLAZAMIENTO_BASE_POR_NIVEL,
+    RAZON_FUERA_ZONA, RAZON_FUERA_BASE
+)
+
+# Resultado de cada nave
+EN_VUELO = 0
+ATERRIZADO = 1
+ESTRELLADO = 2
+
+# Códigos de razón del accidente
+RAZON_NINGUNA = 0
+RAZON_VELOCIDAD = 1   # "¡Velocidad excesiva!" sobre la base
+RAZON_ZONA = 2        # RAZON_FUERA_ZONA
+RAZON_SUELO = 3       # RAZON_FUERA_BASE
+
+NAVE_ANCHO = 40
+NAVE_ALTO = 60
+
+
+def _por_nivel(tabla, niveles, defecto):
+    """Convierte una tabla {nivel: valor} en un array alineado con niveles"""
+    return np.array([tabla.get(int(n), defecto) for n in niveles], dtype=np.float64)
+
+
+def posiciones_base(niveles, rng, fracciones=None):
+    """Versión vectorizada de posicion_base para un array de niveles"""
+    niveles = np.asarray(niveles)
+    if fracciones is None:
+        fracciones = _por_nivel(DESPLAZAMIENTO_BASE_POR_NIVEL, niveles, 0.7)
+    desplazamiento_max = (ANCHO - 2*BASE_MARGEN) * np.asarray(fracciones, dtype=np.float64)
+    x = ANCHO//2 + rng.uniform(-desplazamiento_max, desplazamiento_max)
+    return np.clip(x, BASE_MARGEN + BASE_ANCHO//2, ANCHO - BASE_MARGEN - BASE_ANCHO//2)
+
+
+class SimulacionLote:
+    """Estado de N naves como estructura de arrays"""
+
+    def __init__(self, niveles, base_x=None, rng=None, fuel=None, viento_max=None):
+        self.rng = np.random.default_rng() if rng is None else rng
+        self.nivel = np.asarray(niveles, dtype=np.int64)
+        n = self.n = len(self.nivel)
+
+        if base_x is None:
+            base_x = posiciones_base(self.nivel, self.rng)
+        self.base_x = np.broadcast_to(np.asarray(base_x, dtype=np.float64), (n,)).copy()
+
+        if fuel is None:
+            fuel = _por_nivel(FUEL_POR_NIVEL, self.nivel, 400)
+        if viento_max is None:
+            viento_max = _por_nivel(VIENTO_POR_NIVEL, self.nivel, 0.02)
+        self.fuel_inicial = np.broadcast_to(np.asarray(fuel, dtype=np.float64), (n,)).copy()
+        self.viento_max = np.broadcast_to(np.asarray(viento_max, dtype=np.float64), (n,)).copy()
+
+        self.x = np.empty(n)
+        self.y = np.empty(n)
+        self.velocidad_x = np.empty(n)
+        self.velocidad_y = np.empty(n)
+        self.fuel = np.empty(n)
+        self.viento = np.empty(n)
+        self.direccion_viento = np.empty(n)
+
+        self.resultado = np.empty(n, dtype=np.int8)
+        self.razon = np.empty(n, dtype=np.int8)
+        # Velocidades en el momento del contacto (para el mensaje de accidente)
+        self.impacto_vertical = np.empty(n)
+        self.impacto_horizontal = np.empty(n)
+        self.velocidad_final = np.empty(n)
+        self.distancia_centro = np.empty(n)
+        self.pasos = np.empty(n, dtype=np.int64)
+        self.reiniciar(np.ones(n, dtype=bool), base_x=self.base_x)
+
+    def reiniciar(self, mascara, base_x=None):
+        """Vuelve al estado inicial las naves de la máscara, con base nueva"""
+        if base_x is None:
+            self.base_x[mascara] = posiciones_base(self.nivel[mascara], self.rng)
+        else:
+            self.base_x[mascara] = base_x[mascara]
+        self.x[mascara] = ANCHO // 2
+        self.y[mascara] = 100
+        self.velocidad_x[mascara] = 0
+        self.velocidad_y[mascara] = 0
+        self.fuel[mascara] = self.fuel_inicial[mascara]
+        self.viento[mascara] = 0
+        self.direccion_viento[mascara] = 1
+        self.resultado[mascara] = EN_VUELO
+        self.razon[mascara] = RAZON_NINGUNA
+        self.impacto_vertical[mascara] = 0
+        self.impacto_horizontal[mascara] = 0
+        self.velocidad_final[mascara] = 0
+        self.distancia_centro[mascara] = np.nan  # nan = sin información
+        self.pasos[mascara] = 0
+
+    @property
+    def activas(self):
+        return self.resultado == EN_VUELO
+
+    @property
+    def terminado(self):
+        return not self.activas.any()
+
+    def avanzar(self, propulsor=False, izquierda=False, derecha=False):
+        """Aplica un paso de física a todas las naves en vuelo.
+
+        Las entradas pueden ser escalares o arrays booleanos de tamaño N.
+        """
+        n = self.n
+        act = self.activas
+        propulsor = np.broadcast_to(propulsor, (n,))
+        izquierda = np.broadcast_to(izquierda, (n,))
+        derecha = np.broadcast_to(derecha, (n,))
+
+        self.pasos += act
+
+        # Actualizar viento (paseo aleatorio acotado)
+        cambio = act & (self.rng.random(n) < CAMBIO_VIENTO)
+        invertir = cambio & (np.abs(self.viento) >= self.viento_max)
+        self.direccion_viento[invertir] *= -1
+        self.viento[cambio] += VIENTO_INCREMENTO * self.direccion_viento[cambio]
+        np.clip(self.viento, -self.viento_max, self.viento_max, out=self.viento)
+
+        # Gravedad y viento
+        self.velocidad_y[act] += GRAVEDAD
+        self.velocidad_x[act] += self.viento[act]
+
+        # Propulsor principal
+        principal = act & propulsor & (self.fuel > 0)
+        self.velocidad_y[principal] -= EMPUJE
+        self.fuel[principal] = np.maximum(0, self.fuel[principal] - 1)
+
+        # Propulsores laterales (la izquierda tiene prioridad, como en el juego)
+        con_fuel = act & (self.fuel > 0)
+        izq = con_fuel & izquierda
+        der = con_fuel & ~izquierda & derecha
+        lateral = izq | der
+        self.velocidad_x[izq] -= EMPUJE_LATERAL
+        self.velocidad_x[der] += EMPUJE_LATERAL
+        self.fuel[lateral] = np.maximum(0, self.fuel[lateral] - 0.5)
+
+        # Actualizar posición
+        self.x[act] += self.velocidad_x[act]
+        self.y[act] += self.velocidad_y[act]
+
+        # Mantener las naves dentro de los límites horizontales
+        borde_izq = act & (self.x < NAVE_ANCHO / 2)
+        borde_der = act & (self.x > ANCHO - NAVE_ANCHO / 2)
+        self.x[borde_izq] = NAVE_ANCHO / 2
+        self.x[borde_der] = ANCHO - NAVE_ANCHO / 2
+        self.velocidad_x[borde_izq | borde_der] = 0
+
+        # Contacto con la altura de la base
+        altura_base = ALTO - SUELO_ALTURA - BASE_ALTURA_SOBRE_SUELO
+        fondo = self.y + NAVE_ALTO + ALTURA_PATAS
+        sobre_base = ((self.x + NAVE_ANCHO > self.base_x - BASE_ANCHO//2) &
+                      (self.x < self.base_x + BASE_ANCHO//2))
+        contacto = act & (fondo >= altura_base)
+        en_base = contacto & sobre_base
+
+        self.y[en_base] = altura_base - NAVE_ALTO - ALTURA_PATAS
+        vertical = np.abs(self.velocidad_y)
+        horizontal = np.abs(self.velocidad_x)
+        suave = ((vertical <= VELOCIDAD_MAXIMA_ATERRIZAJE) &
+                 (horizontal <= VELOCIDAD_MAXIMA_ATERRIZAJE / 2))
+
+        aterriza = en_base & suave
+        rapido = en_base & ~suave
+        fuera = contacto & ~sobre_base
+        self.impacto_vertical[contacto] = vertical[contacto]
+        self.impacto_horizontal[contacto] = horizontal[contacto]
+
+        self.resultado[aterriza] = ATERRIZADO
+        self.velocidad_x[aterriza] = 0
+        self.velocidad_y[aterriza] = 0
+        self.resultado[rapido] = ESTRELLADO
+        self.razon[rapido] = RAZON_VELOCIDAD
+        self.resultado[fuera] = ESTRELLADO
+        self.razon[fuera] = RAZON_ZONA
+
+        # Colisión con el suelo (misma comprobación que EstadoNave)
+        suelo = act & ~contacto & (fondo >= ALTO - SUELO_ALTURA)
+        if suelo.any():
+            self.resultado[suelo] = ESTRELLADO
+            self.razon[suelo] = RAZON_SUELO
+            self.velocidad_final[suelo] = np.hypot(self.velocidad_x[suelo], self.velocidad_y[suelo])
+            self.distancia_centro[suelo] = ANCHO
+            self.velocidad_x[suelo] = 0
+            self.velocidad_y[suelo] = 0
+
+    def ejecutar(self, piloto, max_pasos=FPS * 120):
+        """Avanza hasta que todas las naves terminen.
+
+        piloto recibe el lote y devuelve (propulsor, izquierda, derecha) como
+        escalares o arrays.
+        """
+        paso = 0
+        while not self.terminado and paso < max_pasos:
+            self.avanzar(*piloto(self))
+            paso += 1
+        return self
+
+    def tiempo_transcurrido(self):
+        """Segundos simulados hasta el cálculo de la puntuación, por nave"""
+        espera = np.where(self.resultado == ATERRIZADO, ESPERA_PUNTUACION / 1000, 0)
+        return self.pasos / FPS + espera
+
+    def calcular_puntuacion(self):
+        """Desglose de calcular_puntuacion como diccionario de arrays"""
+        aterrizado = self.resultado == ATERRIZADO
+        tiempo = self.tiempo_transcurrido()
+
+        puntos_base = np.full(self.n, 500)
+        bonus_velocidad = np.select(
+            [self.velocidad_final < 0.5, self.velocidad_final < 1.0, self.velocidad_final < 1.5],
+            [1000, 800, 500], 200)
+        bonus_fuel = (1000 * (self.fuel / self.fuel_inicial) ** 2).astype(np.int64)
+        bonus_tiempo = np.select(
+            [tiempo < 20, tiempo < 30, tiempo < 40],
+            [500, 300, 100],
+            np.maximum(0, (500 - (tiempo - 20) * 10).astype(np.int64)))
+        precision = 1 - np.minimum(1.0, self.distancia_centro / (BASE_ANCHO//2))
+        bonus_precision = np.where(np.isnan(self.distancia_centro), 500,
+                                   (1000 * np.nan_to_num(precision) ** 2).astype(np.int64))
+
+        desglose = {
+            'base': puntos_base,
+            'velocidad': bonus_velocidad,
+            'fuel': bonus_fuel,
+            'tiempo': bonus_tiempo,
+            'precisión': bonus_precision
+        }
+        for concepto in desglose:
+            desglose[concepto] = np.where(aterrizado, desglose[concepto], 0)
+        desglose['puntuacion'] = sum(desglose[c] for c in ('base', 'velocidad', 'fuel', 'tiempo', 'precisión'))
+        return desglose
+
+    def razon_accidente(self, i):
+        """Texto de la razón del accidente de la nave i, igual que EstadoNave"""
+        codigo = self.razon[i]
+        if codigo == RAZON_VELOCIDAD:
+            return (f"¡Velocidad excesiva! V: {self.impacto_vertical[i]:.1f} "
+                    f"H: {self.impacto_horizontal[i]:.1f}")
+        if codigo == RAZON_ZONA:
+            return RAZON_FUERA_ZONA
+        if codigo == RAZON_SUELO:
+            return RAZON_FUERA_BASE
+        return ""
@@ -0,0 +1,124 @@
+"""Síntesis de sonidos con NumPy.
+
+Cada generador devuelve la señal entera de una vez como array float64 en
+[-1, 1], sin bucles por muestra, así que un segundo de audio cuesta unas pocas
+operaciones vectoriales. El ruido sale del generador con semilla del
+Sintetizador: con la misma semilla y la misma clave, el sonido es idéntico
+byte a byte.
+
+Los bloques se combinan para recetas más elaboradas: envolventes
+(decaimiento, adsr), ruido filtrado por bandas (filtrar, por FFT), capas
+mezcladas (mezclar) y conversión final a int16 (a_int16).
+"""
+import zlib
+
+import numpy as np
+
+FRECUENCIA_MUESTREO = 44100
+AMPLITUD_MAXIMA = 32767
+
+
+class Sintetizador:
+    def __init__(self, semilla=None, frecuencia_muestreo=FRECUENCIA_MUESTREO):
+        self.semilla = semilla
+        self.frecuencia_muestreo = frecuencia_muestreo
+        self.rng = np.random.default_rng(semilla)
+
+    def reiniciar(self, clave):
+        """Generador propio para clave (p. ej. el nombre del sonido), derivado de la semilla.
+
+        Así cada sonido es reproducible por sí mismo, se generen o no los demás.
+        """
+        if self.semilla is None:
+            self.rng = np.random.default_rng()
+        else:
+            self.rng = np.random.default_rng([self.semilla, zlib.crc32(clave.encode())])
+
+    def muestras(self, duracion):
+        return int(self.frecuencia_muestreo * duracion)
+
+    def tiempo(self, duracion):
+        """Instante de cada muestra, en segundos"""
+        return np.arange(self.muestras(duracion)) / self.frecuencia_muestreo
+
+    # Fuentes
+
+    def ruido(self, duracion):
+        """Ruido blanco uniforme"""
+        return self.rng.uniform(-1.0, 1.0, self.muestras(duracion))
+
+    def tono(self, duracion, frecuencia, forma='seno'):
+        """Tono de frecuencia fija: 'seno' o 'cuadrada'"""
+        onda = np.sin(2 * np.pi * frecuencia * self.tiempo(duracion))
+        return np.sign(onda) if forma == 'cuadrada' else onda
+
+    def barrido(self, duracion, frecuencia_inicial, frecuencia_final):
+        """Seno cuya frecuencia pasa linealmente de una a otra (fase integrada)"""
+        t = self.tiempo(duracion)
+        pendiente = (frecuencia_final - frecuencia_inicial) / duracion
+        return np.sin(2 * np.pi * (frecuencia_inicial * t + pendiente * t * t / 2))
+
+    def melodia(self, duracion, frecuencias):
+        """Notas seguidas de igual duración, cada una con envolvente de medio seno"""
+        n_nota = self.muestras(duracion) // len(frecuencias)
+        t_nota = np.arange(n_nota) / self.frecuencia_muestreo
+        duracion_nota = duracion / len(frecuencias)
+        # Una fila por nota: todas las notas se calculan a la vez
+        notas = np.sin(2 * np.pi * np.outer(frecuencias, t_nota))
+        notas *= np.sin(np.pi * t_nota / duracion_nota)
+        senal = np.zeros(self.muestras(duracion))
+        senal[:notas.size] = notas.ravel()
+        return senal
+
+    def acorde(self, duracion, frecuencias, ganancias=None, forma='seno'):
+        """Varios tonos superpuestos (normalizado a pico 1)"""
+        ganancias = np.ones(len(frecuencias)) if ganancias is None else np.asarray(ganancias, float)
+        t = self.tiempo(duracion)
+        ondas = np.sin(2 * np.pi * np.outer(frecuencias, t))
+        if forma == 'cuadrada':
+            ondas = np.sign(ondas)
+        return normalizar(ganancias @ ondas)
+
+    # Envolventes
+
+    def decaimiento(self, duracion, constante=3.0):
+        """exp(-constante · t / duracion)"""
+        return np.exp(-constante * np.arange(self.muestras(duracion)) / self.muestras(duracion))
+
+    def adsr(self, duracion, ataque, caida, sostenido, relajacion):
+        """Ataque, caída y relajación en segundos; sostenido es el nivel (0-1)"""
+        fin_sostenido = max(ataque + caida, duracion - relajacion)
+        return np.interp(self.tiempo(duracion),
+                         [0.0, ataque, ataque + caida, fin_sostenido, duracion],
+                         [0.0, 1.0, sostenido, sostenido, 0.0])
+
+    # Procesado
+
+    def filtrar(self, senal, corte_bajo=None, corte_alto=None):
+        """Deja pasar solo las frecuencias entre corte_bajo y corte_alto (Hz), por FFT"""
+        espectro = np.fft.rfft(senal)
+        frecuencias = np.fft.rfftfreq(len(senal), 1 / self.frecuencia_muestreo)
+        if corte_bajo is not None:
+            espectro[frecuencias < corte_bajo] = 0
+        if corte_alto is not None:
+            espectro[frecuencias > corte_alto] = 0
+        return np.fft.irfft(espectro, len(senal))
+
+
+def normalizar(senal):
+    """Escala la señal a pico 1 (una señal nula se deja igual)"""
+    pico = np.abs(senal).max(initial=0.0)
+    return senal / pico if pico > 0 else senal
+
+
+def mezclar(*capas):
+    """Suma capas (señal, ganancia) de distinta longitud; el resultado dura lo que la más larga"""
+    senal = np.zeros(max(len(capa) for capa, _ in capas))
+    for capa, ganancia in capas:
+        senal[:len(capa)] += capa * ganancia
+    return senal
+
+
+def a_int16(senal, volumen=1.0):
+    """Muestras de 16 bits para WAV, recortando lo que pase de [-1, 1]"""
+    return (np.clip(senal * volumen, -1.0, 1.0) * AMPLITUD_MAXIMA).astype(np.int16)
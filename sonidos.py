@@ -1,18 +1,18 @@
 import sys
 import os
 import time
-import math
-import struct
 import wave
-import numpy as np
 import pygame
-import random
 import subprocess
+from sintesis import Sintetizador, a_int16, mezclar, normalizar
+
+SEMILLA_SONIDOS = 0  # Los sonidos generados son siempre los mismos (None = aleatorios)
 
 class Sonidos:
-    def __init__(self):
+    def __init__(self, semilla=SEMILLA_SONIDOS):
         """Inicializa el sistema de sonido"""
         self.sonido_activo = True
+        self.sintetizador = Sintetizador(semilla)
         self.procesos_activos = []
         self.ultimo_sonido = 0  # Para control de frecuencia
         
@@ -41,67 +41,55 @@ class Sonidos:
             self.sonido_activo = False
     
     def _generar_sonidos(self):
-        """Genera todos los archivos de sonido necesarios"""
+        """Genera los archivos de sonido que falten"""
         sonidos = {
             "propulsor": (0.1, self._generar_ruido, {"volumen": 0.4}),
             "propulsor_lateral": (0.05, self._generar_ruido, {"volumen": 0.2}),
             "explosion": (1.0, self._generar_ruido, {"volumen": 0.7, "decay": True}),
             "exito": (1.0, self._generar_melodia, {"frecuencia": 440}),
-            "inicio": (0.5, self._generar_barrido, {"frecuencia": 330})
+            "inicio": (0.5, self._generar_barrido, {"frecuencia": 330}),
+            "precision": (0.5, self._generar_campana, {"frecuencia": 660}),
         }
         
         for nombre, (duracion, generador, params) in sonidos.items():
             archivo = f"sounds/{nombre}.wav"
             if not os.path.exists(archivo):
+                self.sintetizador.reiniciar(nombre)  # Mismo sonido con la misma semilla
                 buffer = generador(duracion, **params)
                 self._guardar_wav(buffer, archivo)
     
-    def _generar_ruido(self, duracion, volumen=1.0, decay=False):
-        """Genera ruido blanco con volumen y decay opcionales"""
-        samples = int(44100 * duracion)
-        buffer = np.zeros(samples, dtype=np.int16)
-        
-        for i in range(samples):
-            factor = math.exp(-3.0 * i / samples) if decay else 1.0
-            valor = int(random.uniform(-32767, 32767) * volumen * factor)
-            buffer[i] = valor
-        
-        return buffer
+    def _generar_ruido(self, duracion, volumen=1.0, decay=False, corte_bajo=None, corte_alto=None):
+        """Genera ruido blanco (o filtrado por bandas) con volumen y decay opcionales"""
+        s = self.sintetizador
+        ruido = s.ruido(duracion)
+        if corte_bajo is not None or corte_alto is not None:
+            ruido = normalizar(s.filtrar(ruido, corte_bajo, corte_alto))
+        if decay:
+            ruido *= s.decaimiento(duracion)
+        return a_int16(ruido, volumen)
     
     def _generar_tono(self, duracion, frecuencia):
         """Genera un tono simple"""
-        samples = int(44100 * duracion)
-        t = np.linspace(0, duracion, samples)
-        buffer = (np.sin(2 * np.pi * frecuencia * t) * 32767).astype(np.int16)
-        return buffer
+        return a_int16(self.sintetizador.tono(duracion, frecuencia))
     
     def _generar_melodia(self, duracion, frecuencia):
         """Genera una melodía ascendente de éxito"""
-        samples = int(44100 * duracion)
-        t = np.linspace(0, duracion, samples)
-        buffer = np.zeros(samples, dtype=np.int16)
-        
         # Secuencia de notas más alegre
         notas = [frecuencia, frecuencia * 1.25, frecuencia * 1.5, frecuencia * 2]
-        duracion_nota = samples // len(notas)
-        
-        for i, freq in enumerate(notas):
-            inicio = i * duracion_nota
-            fin = (i + 1) * duracion_nota
-            t_nota = np.linspace(0, duracion/len(notas), duracion_nota)
-            # Envolvente para suavizar transiciones
-            env = np.sin(np.pi * t_nota / (duracion/len(notas)))
-            buffer[inicio:fin] = (np.sin(2 * np.pi * freq * t_nota) * 32767 * env).astype(np.int16)
-        
-        return buffer
+        return a_int16(self.sintetizador.melodia(duracion, notas))
     
     def _generar_barrido(self, duracion, frecuencia):
         """Genera un barrido de frecuencia"""
-        samples = int(44100 * duracion)
-        t = np.linspace(0, duracion, samples)
-        freq_mod = frecuencia * (1 + t)
-        buffer = (np.sin(2 * np.pi * freq_mod * t) * 32767).astype(np.int16)
-        return buffer
+        # De frecuencia a frecuencia·(1 + 2·duracion), como sin(2π·f·(1 + t)·t)
+        return a_int16(self.sintetizador.barrido(duracion, frecuencia, frecuencia * (1 + 2 * duracion)))
+    
+    def _generar_campana(self, duracion, frecuencia):
+        """Campanada: fundamental y armónicos con envolvente ADSR y un golpe de ruido agudo"""
+        s = self.sintetizador
+        tonos = s.acorde(duracion, [frecuencia, 2 * frecuencia, 3 * frecuencia], [1.0, 0.5, 0.25])
+        tonos *= s.adsr(duracion, 0.005, 0.1, 0.6, 0.3)
+        golpe = s.filtrar(s.ruido(0.03), corte_bajo=2000) * s.decaimiento(0.03, 5.0)
+        return a_int16(normalizar(mezclar((tonos, 1.0), (golpe, 0.3))), 0.9)
     
     def _guardar_wav(self, buffer, archivo):
         """Guarda un buffer de audio como archivo WAV"""
@@ -128,7 +116,32 @@ class Sonidos:
             return True
         except:
             return False
-    
+
+    def _reproducir_linux(self, archivo):
+        """Reproduce un sonido en Linux (aplay, de ALSA)"""
+        try:
+            self.procesos_activos = [p for p in self.procesos_activos if p.poll() is None]
+            if not os.path.exists(archivo):
+                return False
+            proceso = subprocess.Popen(['aplay', '-q', archivo],
+                                     stdout=subprocess.DEVNULL,
+                                     stderr=subprocess.DEVNULL)
+            self.procesos_activos.append(proceso)
+            return True
+        except:
+            return False
+
+    def _reproducir_windows(self, archivo):
+        """Reproduce un sonido en Windows (asíncrono, sin proceso aparte)"""
+        try:
+            import winsound
+            if not os.path.exists(archivo):
+                return False
+            winsound.PlaySound(archivo, winsound.SND_FILENAME | winsound.SND_ASYNC)
+            return True
+        except:
+            return False
+
     def reproducir_sonido(self, nombre, intervalo=0):
         """Reproduce un sonido con control de frecuencia opcional"""
         if not self.sonido_activo:
@@ -0,0 +1,9 @@
+import os
+import sys
+
+# Los módulos del juego están en la raíz del repositorio, sin paquete
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# game.py inicia pygame al importarse: sin ventana ni audio en las pruebas
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
@@ -0,0 +1,84 @@
+import random
+
+import pytest
+
+from grabacion import (
+    CABECERAS, MAGIA, MAX_TRAMO, TRAMO, Grabacion, crear_rng, reproducir_rapido
+)
+from pilotos import PilotoHumano, PilotoPerfil
+from simulacion import simular_vuelo
+
+
+def entradas_aleatorias(rng, pasos):
+    return [(rng.random() < 0.5, rng.random() < 0.2, rng.random() < 0.2) for _ in range(pasos)]
+
+
+@pytest.mark.parametrize("inclinacion", [False, True])
+def test_ida_y_vuelta_version_2(tmp_path, inclinacion):
+    grabacion = Grabacion(2**63 - 1, 3, inclinacion=inclinacion)
+    entradas = entradas_aleatorias(random.Random(1), 500)
+    entradas += [(True, False, False)] * (MAX_TRAMO + 10)  # Tramo partido en dos
+    for entrada in entradas:
+        grabacion.agregar(entrada)
+
+    archivo = tmp_path / "vuelo.rep"
+    grabacion.guardar(str(archivo))
+    cargada = Grabacion.cargar(str(archivo))
+
+    assert (cargada.semilla, cargada.nivel, cargada.version, cargada.inclinacion) == \
+        (2**63 - 1, 3, 2, inclinacion)
+    assert cargada.tramos == grabacion.tramos
+    assert list(cargada.entradas()) == entradas
+    assert len(cargada) == len(entradas)
+
+
+def test_ida_y_vuelta_version_1():
+    # Las grabaciones v1 no guardan el modo de control: son siempre clásicas
+    tramos = [[1, 30], [0, 5], [3, 200], [4, MAX_TRAMO]]
+    datos = (CABECERAS[1].pack(MAGIA, 1, 12345, 2, len(tramos)) +
+             b"".join(TRAMO.pack(*tramo) for tramo in tramos))
+
+    grabacion = Grabacion.desde_bytes(datos)
+    assert (grabacion.semilla, grabacion.nivel, grabacion.version, grabacion.inclinacion) == \
+        (12345, 2, 1, False)
+    assert grabacion.tramos == tramos
+
+    # Al guardarla de nuevo pasa a la versión actual sin perder nada
+    de_nuevo = Grabacion.desde_bytes(grabacion.a_bytes())
+    assert (de_nuevo.semilla, de_nuevo.nivel, de_nuevo.inclinacion) == (12345, 2, False)
+    assert de_nuevo.tramos == tramos
+
+
+def test_rechaza_archivos_ajenos():
+    with pytest.raises(ValueError):
+        Grabacion.desde_bytes(b"XXXX" + bytes(20))
+    with pytest.raises(ValueError):
+        Grabacion.desde_bytes(CABECERAS[1].pack(MAGIA, 99, 0, 1, 0))
+
+
+@pytest.mark.parametrize("nivel", [1, 2, 3])
+@pytest.mark.parametrize("inclinacion", [False, True])
+def test_reproducir_rapido_repite_el_vuelo(nivel, inclinacion):
+    semilla = 4242 + nivel
+    grabacion = Grabacion(semilla, nivel, inclinacion=inclinacion)
+    if inclinacion:
+        # Los pilotos solo vuelan con el control clásico: entradas al azar
+        entradas = iter(entradas_aleatorias(random.Random(semilla), 10000))
+        piloto = lambda nave: next(entradas)
+    else:
+        piloto = PilotoHumano(PilotoPerfil())
+        piloto.reiniciar(random.Random(semilla))
+
+    def grabar(nave):
+        entrada = piloto(nave)
+        grabacion.agregar(entrada)
+        return entrada
+
+    original = simular_vuelo(grabar, nivel, crear_rng(semilla), inclinacion=inclinacion)
+    assert original.terminado
+
+    nave = reproducir_rapido(Grabacion.desde_bytes(grabacion.a_bytes()))
+    assert (nave.pasos, nave.x, nave.y, nave.fuel, nave.angulo) == \
+        (original.pasos, original.x, original.y, original.fuel, original.angulo)
+    assert (nave.aterrizado, nave.razon_accidente) == (original.aterrizado, original.razon_accidente)
+    assert (nave.puntuacion, nave.desglose) == (original.puntuacion, original.desglose)
@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+import game
+from pilotos import Piloto, PilotoHumano, PilotoPerfil, PilotoFrenadoFinal
+from simulacion import FPS, EstadoNave, predecir_contacto, simular_vuelo
+
+
+def estado(nave):
+    return (nave.pasos, nave.x, nave.y, nave.velocidad_x, nave.velocidad_y,
+            nave.fuel, nave.viento, nave.aterrizado, nave.estrellado)
+
+
+def crear_piloto(nombre, semilla):
+    piloto = {
+        "inactivo": Piloto,  # Caída libre hasta estrellarse
+        "perfil": PilotoPerfil,
+        "frenado_final": PilotoFrenadoFinal,
+        "humano_perfil": lambda: PilotoHumano(PilotoPerfil()),
+        "torpe": lambda: PilotoHumano(PilotoPerfil(), ruido=0.5, despiste=0.2),
+    }[nombre]()
+    piloto.reiniciar(random.Random(semilla))
+    return piloto
+
+
+@pytest.mark.parametrize("nivel", [1, 2, 3])
+@pytest.mark.parametrize("nombre_piloto", ["inactivo", "perfil", "frenado_final",
+                                           "humano_perfil", "torpe"])
+def test_simular_vuelo_igual_que_nave_del_juego(nivel, nombre_piloto):
+    semilla = 1000 + nivel
+
+    # Vuelo sin pantalla, guardando el estado antes de cada paso
+    piloto = crear_piloto(nombre_piloto, semilla + 2)
+    esperado = []
+
+    def registrar(nave):
+        esperado.append(estado(nave))
+        return piloto(nave)
+
+    final = simular_vuelo(registrar, nivel, random.Random(semilla))
+
+    # El mismo vuelo con la Nave del juego, preparada como en game.main
+    piloto = crear_piloto(nombre_piloto, semilla + 2)
+    rng = random.Random(semilla)
+    base = game.Base(nivel, rng)
+    nave = game.Nave(nivel, rng, random.Random(semilla + 1))
+    nave.base = base
+    nave.base_x = base.x
+    obtenido = []
+    while not nave.terminado and nave.pasos < FPS * 120:
+        obtenido.append(estado(nave))
+        nave.propulsor_activo, nave.propulsor_izquierda, nave.propulsor_derecha = piloto(nave)
+        nave.actualizar()
+    nave.calcular_puntuacion()
+
+    assert obtenido == esperado
+    assert estado(nave) == estado(final)
+    assert nave.razon_accidente == final.razon_accidente
+    assert (nave.puntuacion, nave.desglose) == (final.puntuacion, final.desglose)
+
+
+
+@pytest.mark.parametrize("entrada, fuel, y, velocidad_y", [
+    ((False, False, False), 500, 100, 0),    # Caída libre: demasiado rápido
+    ((False, False, False), 500, 380, 0),    # Caída libre corta: aterriza
+    ((True, False, False), 500, 100, 0),     # Sube hasta agotar el combustible y vuelve a caer
+    ((True, False, False), 60, 100, 2.5),    # Frena y se queda sin combustible a mitad de bajada
+    ((True, False, True), 15, 100, 2.0),     # Principal y lateral hasta agotar el combustible
+    ((False, False, True), 7.5, 100, 0.5),   # Solo lateral, con combustible para unos pocos pasos
+    ((True, False, False), 0, 100, 1.0),     # Sin combustible desde el principio
+])
+def test_predecir_contacto_igual_que_avanzar(entrada, fuel, y, velocidad_y):
+    nave = EstadoNave(1, base_x=430, fuel=fuel, viento_max=0)
+    nave.y = y
+    nave.velocidad_y = velocidad_y
+    nave.propulsor_activo, nave.propulsor_izquierda, nave.propulsor_derecha = entrada
+    prediccion = predecir_contacto(nave)
+
+    rng = random.Random(0)  # Sin viento el rng no cambia nada
+    while not nave.terminado:
+        nave.avanzar(entrada, rng)
+
+    assert prediccion['pasos'] == nave.pasos
+    assert prediccion['x'] == pytest.approx(nave.x, abs=1e-9)
+    assert prediccion['seguro'] == nave.aterrizado
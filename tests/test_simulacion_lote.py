@@ -0,0 +1,61 @@
+import random
+
+import numpy as np
+
+from pilotos import Piloto, PilotoHumano, PilotoPerfil, PilotoFrenadoFinal
+from simulacion import FPS, EstadoNave
+from simulacion_lote import ATERRIZADO, ESTRELLADO, EN_VUELO, SimulacionLote
+
+MAX_PASOS = FPS * 120
+
+
+def vuelo_individual(nivel, base_x, fuel, piloto):
+    """EstadoNave sin viento y las entradas que usó en cada paso"""
+    nave = EstadoNave(nivel, base_x=base_x, fuel=fuel, viento_max=0)
+    rng = random.Random(0)  # Sin viento el rng no cambia nada
+    entradas = []
+    while not nave.terminado and nave.pasos < MAX_PASOS:
+        entrada = piloto(nave)
+        entradas.append(entrada)
+        nave.avanzar(entrada, rng)
+    nave.calcular_puntuacion()
+    return nave, entradas
+
+
+def test_lote_igual_que_estado_nave():
+    # Naves variadas: aterrizajes, caída libre, ruido en los mandos y poco combustible
+    rng = random.Random(7)
+    carriles = []
+    for i in range(24):
+        nivel = 1 + i % 3
+        base_x = rng.uniform(130, 670)
+        fuel = [None, 40, 15.5, 5][i % 4]
+        piloto = [Piloto(), PilotoPerfil(), PilotoFrenadoFinal(),
+                  PilotoHumano(PilotoPerfil(), ruido=0.3)][i // 6]
+        piloto.reiniciar(random.Random(i))
+        carriles.append((nivel, base_x, fuel, piloto))
+
+    naves, entradas = zip(*(vuelo_individual(*carril) for carril in carriles))
+    resultados = {nave.aterrizado for nave in naves}
+    assert resultados == {True, False}  # Hay aterrizajes y accidentes
+
+    niveles = [nivel for nivel, *_ in carriles]
+    lote = SimulacionLote(niveles, base_x=[base_x for _, base_x, _, _ in carriles],
+                          rng=np.random.default_rng(0),
+                          fuel=[nave.fuel_inicial for nave in naves], viento_max=0)
+    pasos = max(len(e) for e in entradas)
+    sin_entrada = (False, False, False)
+    matriz = np.array([[e[paso] if paso < len(e) else sin_entrada for e in entradas]
+                       for paso in range(pasos)])
+    for paso in range(pasos):
+        lote.avanzar(*matriz[paso].T)
+    desglose = lote.calcular_puntuacion()
+
+    for i, nave in enumerate(naves):
+        resultado = ATERRIZADO if nave.aterrizado else ESTRELLADO if nave.estrellado else EN_VUELO
+        assert lote.resultado[i] == resultado, i
+        assert lote.razon_accidente(i) == nave.razon_accidente, i
+        assert (lote.x[i], lote.y[i], lote.fuel[i]) == (nave.x, nave.y, nave.fuel), i
+        assert lote.pasos[i] == nave.pasos, i
+        assert {concepto: int(desglose[concepto][i]) for concepto in nave.desglose} == nave.desglose, i
+        assert desglose['puntuacion'][i] == nave.puntuacion, i
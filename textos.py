@@ -0,0 +1,104 @@
+"""Fuentes y textos pre-renderizados.
+
+Las fuentes se cargan una sola vez (cargar_fuentes al iniciar la pantalla) y
+los textos renderizados se guardan en una caché acotada por (texto, tamaño,
+color): los rótulos fijos del HUD y de los menús se renderizan una vez. Para
+los números que cambian en cada frame (velocidades, fuel, viento) no sirve la
+caché, así que se componen con un atlas de glifos pre-renderizados y una sola
+llamada a blits.
+"""
+from collections import OrderedDict
+
+import pygame
+
+TAMAÑOS_FUENTE = (20, 24, 36, 48, 60, 74, 84)  # Los que usan el juego y los menús
+MAX_TEXTOS = 256  # Superficies en caché antes de descartar las menos usadas
+GLIFOS = "0123456789.-"
+
+_fuentes = {}
+
+
+def cargar_fuentes(tamaños=TAMAÑOS_FUENTE):
+    """Carga la fuente por defecto en cada tamaño (requiere pygame.init)"""
+    for tamaño in tamaños:
+        fuente(tamaño)
+
+
+def fuente(tamaño):
+    """Fuente por defecto del tamaño pedido; se carga la primera vez"""
+    if tamaño not in _fuentes:
+        _fuentes[tamaño] = pygame.font.Font(None, tamaño)
+    return _fuentes[tamaño]
+
+
+class CacheTextos:
+    """Superficies de texto por (texto, tamaño, color), con descarte LRU"""
+
+    def __init__(self, capacidad=MAX_TEXTOS):
+        self.capacidad = capacidad
+        self.textos = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def __len__(self):
+        return len(self.textos)
+
+    def obtener(self, texto, tamaño, color):
+        clave = (texto, tamaño, tuple(color))
+        superficie = self.textos.get(clave)
+        if superficie is not None:
+            self.aciertos += 1
+            self.textos.move_to_end(clave)
+            return superficie
+        self.fallos += 1
+        superficie = fuente(tamaño).render(texto, True, color)
+        self.textos[clave] = superficie
+        if len(self.textos) > self.capacidad:
+            self.textos.popitem(last=False)
+        return superficie
+
+
+class AtlasGlifos:
+    """Glifos sueltos (dígitos, punto y signo) renderizados una vez por color"""
+
+    def __init__(self, tamaño, glifos=GLIFOS):
+        self.tamaño = tamaño
+        self.glifos = glifos
+        self.colores = {}
+        self._anchos = None
+
+    def _glifos(self, color):
+        color = tuple(color)
+        glifos = self.colores.get(color)
+        if glifos is None:
+            f = fuente(self.tamaño)
+            glifos = {c: f.render(c, True, color) for c in self.glifos}
+            self.colores[color] = glifos
+        return glifos
+
+    def ancho(self, texto):
+        if self._anchos is None:
+            f = fuente(self.tamaño)
+            self._anchos = {c: f.size(c)[0] for c in self.glifos}
+        return sum(self._anchos[c] for c in texto)
+
+    def dibujar(self, pantalla, texto, posicion, color):
+        """Dibuja texto (solo con caracteres del atlas); devuelve su rectángulo"""
+        glifos = self._glifos(color)
+        x, y = posicion
+        lote = []
+        for c in texto:
+            glifo = glifos[c]
+            lote.append((glifo, (x, y)))
+            x += glifo.get_width()
+        pantalla.blits(lote, doreturn=False)
+        return pygame.Rect(posicion[0], y, x - posicion[0], fuente(self.tamaño).get_height())
+
+
+# Instancias compartidas
+CACHE_TEXTOS = CacheTextos()
+
+
+def texto(cadena, tamaño, color):
+    """Superficie del texto, desde la caché compartida"""
+    return CACHE_TEXTOS.obtener(cadena, tamaño, color)
@@ -0,0 +1,77 @@
+"""Superficie lógica del juego y su presentación en la ventana real.
+
+Todo se dibuja en una superficie del tamaño lógico (ANCHO x ALTO), que es el
+sistema de coordenadas de todo el juego. Si la ventana tiene ese mismo tamaño,
+la superficie lógica es la propia pantalla y presentar es un flip. Si no
+(escala distinta de 1 o pantalla completa) se escala una sola vez por frame,
+de una de estas dos formas:
+
+- 'sdl': pygame.SCALED. SDL escala la superficie lógica con su renderizador
+  (normalmente por GPU) al tamaño de la ventana, con bandas negras si la
+  proporción no coincide. En ventana, la ventana se abre a escala veces el
+  tamaño lógico y se puede redimensionar.
+- 'software': la superficie lógica es una Surface aparte que se escala con
+  pygame.transform.scale sobre la ventana, centrada y con la misma proporción.
+"""
+import pygame
+
+ESCALADOS = ('sdl', 'software')
+
+
+class Ventana:
+    def __init__(self, tamaño_logico, escala=1.0, pantalla_completa=False, escalado='sdl'):
+        if escalado not in ESCALADOS:
+            raise ValueError(f"Escalado desconocido: {escalado}")
+        self.tamaño_logico = tamaño_logico
+        self.escala = escala
+        self.pantalla_completa = pantalla_completa
+        self.escalado = escalado
+        self.logica = None  # Donde se dibuja
+        self.pantalla = None  # Superficie de la ventana
+        self.destino = None  # Zona de la ventana que ocupa la imagen escalada (software)
+        self._zona_destino = None
+
+    @property
+    def escalada(self):
+        return self.pantalla_completa or self.escala != 1
+
+    def abrir(self, titulo):
+        """Crea la ventana; devuelve la superficie lógica en la que dibujar"""
+        ancho, alto = self.tamaño_logico
+        if not self.escalada:
+            self.pantalla = self.logica = pygame.display.set_mode(self.tamaño_logico)
+        elif self.escalado == 'sdl':
+            flags = pygame.SCALED | (pygame.FULLSCREEN if self.pantalla_completa else pygame.RESIZABLE)
+            self.pantalla = self.logica = pygame.display.set_mode(self.tamaño_logico, flags)
+            if not self.pantalla_completa:
+                # SCALED abre la ventana al tamaño que elige SDL: se ajusta a la escala pedida
+                from pygame._sdl2.video import Window
+                Window.from_display_module().size = (round(ancho * self.escala),
+                                                     round(alto * self.escala))
+        else:
+            if self.pantalla_completa:
+                self.pantalla = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+            else:
+                self.pantalla = pygame.display.set_mode((round(ancho * self.escala),
+                                                         round(alto * self.escala)))
+            self.logica = pygame.Surface(self.tamaño_logico).convert(self.pantalla)
+            # Mayor tamaño con la proporción lógica que cabe en la ventana, centrado
+            limites = self.pantalla.get_rect()
+            factor = min(limites.w / ancho, limites.h / alto)
+            self.destino = pygame.Rect(0, 0, round(ancho * factor), round(alto * factor))
+            self.destino.center = limites.center
+            self._zona_destino = self.pantalla.subsurface(self.destino)
+        pygame.display.set_caption(titulo)
+        return self.logica
+
+    def presentar(self, rects=None):
+        """Muestra el frame; rects (coordenadas lógicas) limita lo que se envía"""
+        if self.logica is self.pantalla:
+            if rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(rects)
+            return
+        # En software se escala la imagen entera: escalar trozos deja costuras
+        pygame.transform.scale(self.logica, self.destino.size, self._zona_destino)
+        pygame.display.update(self.destino)
@@ -0,0 +1,262 @@
+"""Render de grabaciones a vídeo, sin pantalla y en paralelo.
+
+Cada grabación se reproduce con la física del juego y se dibuja con las mismas
+rutinas que el bucle principal (CapaFondo y Base, Nave.dibujar,
+EfectosVisuales, la estela y dibujar_hud) sobre la superficie lógica de
+ANCHO x ALTO, con el driver de vídeo "dummy" de SDL. La salida es una
+secuencia de PNG por grabación o un flujo RGB crudo (rgb24) por grabación:
+
+    ffmpeg -f rawvideo -pix_fmt rgb24 -s 800x600 -r 60 -i vuelo.rgb vuelo.mp4
+
+Las grabaciones se reparten entre un pool de procesos. Dentro de cada proceso
+el hilo de render solo copia los píxeles de cada frame; la codificación PNG
+(zlib, que suelta el GIL) y la escritura a disco van en un hilo aparte, con una
+cola acotada entre los dos.
+
+Uso:
+    python video.py vuelo1.rep vuelo2.rep --salida videos
+    python video.py --records 5 --formato rgb
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import multiprocessing
+import queue
+import random
+import struct
+import sys
+import threading
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pygame
+
+import game
+from calidad import NIVELES_CALIDAD, nivel_por_nombre
+from estela import CapaEstela, LARGO_ESTELA, INTERVALO_ESTELA
+from grabacion import Grabacion, PilotoRepeticion, crear_rng
+from scores import TableroRecords
+from simulacion import ANCHO, ALTO, ANGULO_MAXIMO, FPS
+
+FORMATOS = ('png', 'rgb')
+FPS_VIDEO = FPS
+COLA_PASOS = FPS * 2  # Pasos que se siguen dibujando tras el final (explosión o celebración)
+FRAMES_EN_COLA = 16  # Frames pendientes de escribir antes de frenar el render
+NIVEL_ZLIB = 1  # Los frames son casi todo negro: comprimir más apenas reduce y tarda el doble
+
+FIRMA_PNG = b"\x89PNG\r\n\x1a\n"
+
+
+def _trozo_png(tipo, contenido):
+    return (struct.pack(">I", len(contenido)) + tipo + contenido +
+            struct.pack(">I", zlib.crc32(tipo + contenido)))
+
+
+def codificar_png(datos, ancho, alto, nivel=NIVEL_ZLIB):
+    """PNG RGB de 8 bits a partir de los bytes rgb24 de un frame"""
+    filas = np.frombuffer(datos, dtype=np.uint8).reshape(alto, ancho * 3)
+    crudo = np.zeros((alto, ancho * 3 + 1), dtype=np.uint8)  # Byte de filtro 0 por fila
+    crudo[:, 1:] = filas
+    return (FIRMA_PNG +
+            _trozo_png(b"IHDR", struct.pack(">IIBBBBB", ancho, alto, 8, 2, 0, 0, 0)) +
+            _trozo_png(b"IDAT", zlib.compress(crudo.tobytes(), nivel)) +
+            _trozo_png(b"IEND", b""))
+
+
+class EscritorFrames:
+    """Codifica y escribe frames en un hilo aparte.
+
+    escribir() deja los bytes rgb24 de un frame en una cola acotada (y se
+    bloquea si el disco va por detrás); cerrar() espera a que se vacíe y
+    relanza el error del hilo, si lo hubo.
+    """
+
+    def __init__(self, destino, formato, tamaño=(ANCHO, ALTO)):
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato desconocido: {formato}")
+        self.destino = destino
+        self.formato = formato
+        self.tamaño = tamaño
+        self.frames = 0
+        self.error = None
+        self.cola = queue.Queue(FRAMES_EN_COLA)
+        if formato == 'png':
+            os.makedirs(destino, exist_ok=True)
+            self.archivo = None
+        else:
+            os.makedirs(os.path.dirname(destino) or ".", exist_ok=True)
+            self.archivo = open(destino, 'wb')
+        self.hilo = threading.Thread(target=self._escribir_cola, daemon=True)
+        self.hilo.start()
+
+    def escribir(self, datos):
+        if self.error is not None:
+            raise self.error
+        self.cola.put((self.frames, datos))
+        self.frames += 1
+
+    def _escribir_cola(self):
+        while True:
+            elemento = self.cola.get()
+            if elemento is None:
+                return
+            if self.error is not None:
+                continue  # Vaciar la cola para no bloquear al render
+            indice, datos = elemento
+            try:
+                if self.archivo is not None:
+                    self.archivo.write(datos)
+                else:
+                    with open(os.path.join(self.destino, f"{indice:05d}.png"), 'wb') as f:
+                        f.write(codificar_png(datos, *self.tamaño))
+            except Exception as error:
+                self.error = error
+
+    def cerrar(self):
+        self.cola.put(None)
+        self.hilo.join()
+        if self.archivo is not None:
+            self.archivo.close()
+        if self.error is not None:
+            raise self.error
+
+
+def iniciar_proceso(paso_angular=game.PASO_ANGULAR):
+    """Pantalla (dummy), fuentes y sprites de un proceso de render"""
+    game.iniciar_pantalla()
+    game.sprites_nave.configurar(paso_angular)
+
+
+def renderizar(archivo, destino, formato='png', fps=FPS_VIDEO, calidad=0):
+    """Reproduce y dibuja una grabación; devuelve (frames, resultado, segundos)"""
+    assert fps > 0, fps  # Con fps <= 0 la simulación no avanzaría y se escribirían frames sin fin
+    inicio = time.perf_counter()
+    pantalla = game.pantalla
+    grabacion = Grabacion.cargar(archivo)
+    nivel_calidad = NIVELES_CALIDAD[calidad]
+    if grabacion.inclinacion:
+        game.sprites_nave.preparar(ANGULO_MAXIMO)
+
+    # Misma preparación de la ronda que game.main, con todo derivado de la semilla
+    rng = crear_rng(grabacion.semilla)
+    base = game.Base(grabacion.nivel, rng)
+    fondo = game.CapaFondo(game.Estrellas(random.Random(grabacion.semilla + 3)), base)
+    nave = game.Nave(grabacion.nivel, rng, random.Random(grabacion.semilla + 1), grabacion.inclinacion)
+    nave.base = base
+    nave.base_x = base.x
+    nave.efectos.ajustar_calidad(nivel_calidad)
+    capa_estela = CapaEstela((ANCHO, ALTO))
+    vida_estela = int(LARGO_ESTELA * INTERVALO_ESTELA * nivel_calidad['estela'])
+    piloto = PilotoRepeticion(grabacion)
+
+    escritor = EscritorFrames(destino, formato)
+    try:
+        pasos_frame = FPS / fps
+        max_pasos = len(grabacion) + COLA_PASOS
+        pasos_totales = 0
+        cola = 0  # Pasos simulados desde que terminó el vuelo
+        acumulado = 0.0
+        while pasos_totales < max_pasos and cola < COLA_PASOS:
+            acumulado += pasos_frame
+            pasos = 0
+            while acumulado >= 1 and pasos_totales < max_pasos:
+                if nave.terminado:
+                    cola += 1
+                else:
+                    (nave.propulsor_activo, nave.propulsor_izquierda,
+                     nave.propulsor_derecha) = piloto.decidir(nave)
+                nave.actualizar()
+                nave.efectos.actualizar()
+                acumulado -= 1
+                pasos += 1
+                pasos_totales += 1
+            alfa = min(acumulado, 1.0)
+
+            fondo.dibujar(pantalla, nave.viento, nivel_calidad)
+            nave.escape.dibujar(pantalla)
+            nave.dibujar(pantalla, alfa)
+            nave.efectos.dibujar(pantalla)
+            capa_estela.dibujar(pantalla, nave.estela, pasos, vida_estela)
+            game.dibujar_hud(pantalla, nave)
+            escritor.escribir(pygame.image.tobytes(pantalla, "RGB"))
+    finally:
+        escritor.cerrar()
+
+    nave.calcular_puntuacion()
+    resultado = "ATERRIZADO" if nave.aterrizado else nave.razon_accidente or "EN VUELO"
+    return escritor.frames, resultado, time.perf_counter() - inicio
+
+
+def destino_video(salida, nombre, formato):
+    return os.path.join(salida, nombre if formato == 'png' else f"{nombre}.rgb")
+
+
+def repeticiones_records(cantidad):
+    """(nombre, archivo) de las cantidad mejores puntuaciones con repetición guardada"""
+    trabajos = []
+    for posicion, record in enumerate(TableroRecords().obtener_top_10()[:cantidad], 1):
+        archivo = record.get('repeticion')
+        if archivo and os.path.exists(archivo):
+            trabajos.append((f"record_{posicion:02d}_{record['puntuacion']}", archivo))
+    return trabajos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Renderiza grabaciones a PNG o RGB crudo sin pantalla")
+    parser.add_argument("archivos", nargs="*", help="Archivos .rep")
+    parser.add_argument("--records", type=int, metavar="N",
+                        help="Añadir las repeticiones de las N mejores puntuaciones")
+    parser.add_argument("--salida", default="videos", help="Directorio de salida")
+    parser.add_argument("--formato", choices=FORMATOS, default='png',
+                        help="Secuencia de PNG o flujo rgb24 crudo por grabación")
+    parser.add_argument("--fps", type=game._entero_positivo, default=FPS_VIDEO, help="Frames por segundo del vídeo")
+    parser.add_argument("--calidad", choices=[n['nombre'] for n in NIVELES_CALIDAD], default='alta',
+                        help="Calidad visual del render")
+    parser.add_argument("--procesos", type=int, default=os.cpu_count(),
+                        help="Grabaciones renderizadas a la vez (1 = en este proceso)")
+    parser.add_argument("--paso-angular", type=game._real_positivo, default=game.PASO_ANGULAR,
+                        help="Grados entre los sprites pre-rotados de la nave")
+    args = parser.parse_args()
+
+    trabajos = [(os.path.splitext(os.path.basename(a))[0], a) for a in args.archivos]
+    if args.records:
+        trabajos += repeticiones_records(args.records)
+    if not trabajos:
+        parser.error("no hay grabaciones que renderizar")
+    calidad = nivel_por_nombre(args.calidad)
+
+    def informar(nombre, destino, frames, resultado, segundos):
+        print(f"{nombre}: {frames} frames -> {destino} ({resultado}, "
+              f"{frames / segundos:.0f} frames/s)")
+
+    inicio = time.perf_counter()
+    procesos = max(1, min(args.procesos, len(trabajos)))
+    if procesos == 1:
+        iniciar_proceso(args.paso_angular)
+        for nombre, archivo in trabajos:
+            destino = destino_video(args.salida, nombre, args.formato)
+            informar(nombre, destino, *renderizar(archivo, destino, args.formato, args.fps, calidad))
+    else:
+        # spawn: cada proceso arranca su propio SDL en vez de heredar el del padre
+        with ProcessPoolExecutor(procesos, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=iniciar_proceso,
+                                 initargs=(args.paso_angular,)) as pool:
+            futuros = {}
+            for nombre, archivo in trabajos:
+                destino = destino_video(args.salida, nombre, args.formato)
+                futuro = pool.submit(renderizar, archivo, destino, args.formato, args.fps, calidad)
+                futuros[futuro] = (nombre, destino)
+            for futuro in as_completed(futuros):
+                informar(*futuros[futuro], *futuro.result())
+    print(f"{len(trabajos)} grabaciones en {time.perf_counter() - inicio:.1f} s "
+          f"con {procesos} proceso(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())